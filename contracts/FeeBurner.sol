@@ -5,6 +5,17 @@ import {IERC20, SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeE
 import {EnumerableSet} from "@openzeppelin/contracts/utils/structs/EnumerableSet.sol";
 import {Ownable2Step} from "@openzeppelin/contracts/access/Ownable2Step.sol";
 
+interface ISwapAdapter {
+    /// @dev `amountIn` of `tokenIn` is transferred to the adapter before the call.
+    function swap(
+        address tokenIn,
+        address tokenOut,
+        uint256 amountIn,
+        uint256 minOut,
+        address receiver
+    ) external returns (uint256 amountOut);
+}
+
 /**
     @title Yearn Curve Fee Burner
     @author Yearn Finance
@@ -14,17 +25,48 @@ contract FeeBurner is Ownable2Step {
     using SafeERC20 for IERC20;
     using EnumerableSet for EnumerableSet.AddressSet;
 
+    ///@notice Token every fee token is converted into
+    IERC20 public constant CRVUSD =
+        IERC20(0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E);
+
     ///@notice Check if an address is an approved guardian of this contract
     address public guardian;
 
+    ///@notice Check if an address is an approved swap adapter for convertTokens
+    mapping(address => bool) public isSwapAdapter;
+
     ///@notice Check if an address is approved to spend tokens from this contract
     mapping(address => bool) public isTokenSpender;
 
     // spender => tokens they have been approved to spend. to view this use getApprovals(spender)
     mapping(address => EnumerableSet.AddressSet) internal spenderApprovals;
 
+    // token => spenders approved to spend it. to view this use getSpenders(token)
+    mapping(address => EnumerableSet.AddressSet) internal tokenSpenders;
+
+    struct AllowanceUpdate {
+        address spender;
+        address[] tokens;
+        bool approved;
+    }
+
+    struct Conversion {
+        address token;
+        address adapter;
+        uint256 amount; // 0 converts the full balance
+        uint256 minOut;
+    }
+
     event SpenderApproved(address indexed spender);
     event SpenderRevoked(address indexed spender);
+    event TokenRevoked(address indexed token);
+    event SwapAdapterSet(address indexed adapter, bool approved);
+    event TokenConverted(
+        address indexed token,
+        address indexed adapter,
+        uint256 amountIn,
+        uint256 amountOut
+    );
     event GuardianSet(address indexed guardian);
 
     constructor(address _guardian) {
@@ -44,6 +86,17 @@ contract FeeBurner is Ownable2Step {
         return spenderApprovals[_spender].values();
     }
 
+    /**
+     * @notice Check which spenders are approved to pull a token from this contract.
+     * @param _token Address of the token to check
+     * @return spenders Addresses currently approved for this token
+     */
+    function getSpenders(
+        address _token
+    ) public view returns (address[] memory spenders) {
+        return tokenSpenders[_token].values();
+    }
+
     /* ========== GUARDIAN FUNCTIONS ========== */
 
     /**
@@ -61,8 +114,7 @@ contract FeeBurner is Ownable2Step {
         );
         require(isTokenSpender[_spender], "unapproved spender");
         for (uint256 i; i < _tokens.length; ++i) {
-            IERC20(_tokens[i]).forceApprove(_spender, type(uint256).max);
-            spenderApprovals[_spender].add(_tokens[i]);
+            _giveAllowance(_spender, _tokens[i]);
         }
     }
 
@@ -80,8 +132,97 @@ contract FeeBurner is Ownable2Step {
             "not approved"
         );
         for (uint256 i; i < _tokens.length; ++i) {
-            IERC20(_tokens[i]).forceApprove(_spender, 0);
-            spenderApprovals[_spender].remove(_tokens[i]);
+            _revokeAllowance(_spender, _tokens[i]);
+        }
+    }
+
+    /**
+     * @notice Give or revoke token allowances for several spenders in one call
+     * @dev Approvals still require an approved spender. Allowances that already
+     *  match are left untouched.
+     * @param _updates Spender, tokens and whether to approve or revoke them
+     */
+    function updateTokenAllowances(
+        AllowanceUpdate[] calldata _updates
+    ) external {
+        require(
+            msg.sender == guardian || msg.sender == owner(),
+            "not approved"
+        );
+        for (uint256 i; i < _updates.length; ++i) {
+            AllowanceUpdate calldata update = _updates[i];
+            if (update.approved) {
+                require(isTokenSpender[update.spender], "unapproved spender");
+                for (uint256 j; j < update.tokens.length; ++j) {
+                    _giveAllowance(update.spender, update.tokens[j]);
+                }
+            } else {
+                for (uint256 j; j < update.tokens.length; ++j) {
+                    _revokeAllowance(update.spender, update.tokens[j]);
+                }
+            }
+        }
+    }
+
+    /**
+     * @notice Revoke every spender's allowance for a token
+     * @dev Covers spenders approved through this contract. Spender status is unchanged.
+     * @param _token Address of the token to cut off
+     */
+    function revokeTokenEverywhere(address _token) external {
+        require(
+            msg.sender == guardian || msg.sender == owner(),
+            "not approved"
+        );
+        address[] memory spenders = tokenSpenders[_token].values();
+        for (uint256 i; i < spenders.length; ++i) {
+            _revokeAllowance(spenders[i], _token);
+        }
+        emit TokenRevoked(_token);
+    }
+
+    /**
+     * @notice Convert fee tokens into crvUSD through approved swap adapters
+     * @dev Each token is pushed to its adapter, which must send crvUSD back to
+     *  this contract. minOut is checked against the crvUSD actually received.
+     * @param _conversions Token, adapter, amount and minimum crvUSD out for each swap
+     * @return received Total crvUSD received
+     */
+    function convertTokens(
+        Conversion[] calldata _conversions
+    ) external returns (uint256 received) {
+        require(
+            msg.sender == guardian || msg.sender == owner(),
+            "not approved"
+        );
+        for (uint256 i; i < _conversions.length; ++i) {
+            Conversion calldata conversion = _conversions[i];
+            require(isSwapAdapter[conversion.adapter], "unapproved adapter");
+            require(conversion.token != address(CRVUSD), "!token");
+            uint256 amount = conversion.amount;
+            if (amount == 0) {
+                amount = IERC20(conversion.token).balanceOf(address(this));
+                if (amount == 0) continue;
+            }
+
+            uint256 balance = CRVUSD.balanceOf(address(this));
+            IERC20(conversion.token).safeTransfer(conversion.adapter, amount);
+            ISwapAdapter(conversion.adapter).swap(
+                conversion.token,
+                address(CRVUSD),
+                amount,
+                conversion.minOut,
+                address(this)
+            );
+            balance = CRVUSD.balanceOf(address(this)) - balance;
+            require(balance >= conversion.minOut, "slippage");
+            received += balance;
+            emit TokenConverted(
+                conversion.token,
+                conversion.adapter,
+                amount,
+                balance
+            );
         }
     }
 
@@ -102,8 +243,7 @@ contract FeeBurner is Ownable2Step {
         // revoke all of their approvals as well
         address[] memory tokens = spenderApprovals[_spender].values();
         for (uint256 i; i < tokens.length; ++i) {
-            IERC20(tokens[i]).forceApprove(_spender, 0);
-            spenderApprovals[_spender].remove(tokens[i]);
+            _revokeAllowance(_spender, tokens[i]);
         }
     }
 
@@ -134,6 +274,20 @@ contract FeeBurner is Ownable2Step {
         emit SpenderApproved(_spender);
     }
 
+    /**
+     * @notice Approve or remove a swap adapter used by convertTokens
+     * @dev Adapters receive the tokens they convert, so only add trusted ones.
+     * @param _adapter Address of the adapter
+     * @param _approved Whether convertTokens may route through it
+     */
+    function setSwapAdapter(
+        address _adapter,
+        bool _approved
+    ) external onlyOwner {
+        isSwapAdapter[_adapter] = _approved;
+        emit SwapAdapterSet(_adapter, _approved);
+    }
+
     /**
      * @notice Grant guardian role to an address
      * @dev Guardian can add tokens for approved spenders, revoke spenders, and revoke tokens
@@ -143,4 +297,22 @@ contract FeeBurner is Ownable2Step {
         guardian = _guardian;
         emit GuardianSet(_guardian);
     }
+
+    /* ========== INTERNAL FUNCTIONS ========== */
+
+    function _giveAllowance(address _spender, address _token) internal {
+        if (
+            IERC20(_token).allowance(address(this), _spender) !=
+            type(uint256).max
+        ) IERC20(_token).forceApprove(_spender, type(uint256).max);
+        spenderApprovals[_spender].add(_token);
+        tokenSpenders[_token].add(_spender);
+    }
+
+    function _revokeAllowance(address _spender, address _token) internal {
+        if (IERC20(_token).allowance(address(this), _spender) != 0)
+            IERC20(_token).forceApprove(_spender, 0);
+        spenderApprovals[_spender].remove(_token);
+        tokenSpenders[_token].remove(_spender);
+    }
 }
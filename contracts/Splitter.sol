@@ -2,6 +2,7 @@
 pragma solidity 0.8.25;
 
 import {IERC20, SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {SSTORE2} from "./libraries/SSTORE2.sol";
 
 interface IGaugeController {
     struct VotedSlope {
@@ -28,6 +29,27 @@ interface IVoter {
     function strategy() external view returns (IProxy);
 }
 
+interface IVotingEscrow {
+    function balanceOf(address user, uint t) external view returns (uint);
+}
+
+interface IVoteTracker {
+    function getVotes()
+        external
+        view
+        returns (uint ycrv, uint partners, uint discretionary);
+
+    function syncGauge(address gauge) external;
+
+    function syncCountedGauges() external;
+}
+
+interface IReceiver {
+    function depositRewards() external returns (uint);
+
+    function paused() external view returns (bool);
+}
+
 interface IVault {
     function deposit(uint amount, address receiver) external returns (uint);
 
@@ -61,23 +83,49 @@ contract YCRVSplitter {
         IVault(0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F); // V3 vault
 
     address public immutable FEE_BURNER;
-    uint public ybsVoteIncentiveRatio = 9e17;
+    // owner, ybsVoteIncentiveRatio, onlyTokenized and depositYbsRewards share a slot.
     address public owner = 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52;
+    uint64 public ybsVoteIncentiveRatio = 9e17;
+    bool public onlyTokenized = true;
+    /// @notice When set, the YBS recipient is treated as a Receiver and its
+    ///         depositRewards is called after every payout unless it is paused.
+    bool public depositYbsRewards;
     address public guardian = 0x4444AAAACDBa5580282365e25b16309Bd770ce4a;
+    // Three slots, loaded once per split by _send. Each address needs 20 of a
+    // slot's 32 bytes, and no slot here has 20 bytes spare (guardian's has 12,
+    // gaugeData's 6), so no recipient can be packed into an existing slot.
     Recipients public recipients;
-    uint public ycrvGaugesLength;
-    uint public partnerGaugesLength;
-    uint public discretionaryGaugesLength;
-    address[] public discretionaryGauges;
-    address[] public ycrvGauges;
-    address[] public partnerGauges;
+    // SSTORE2 pointer to the packed yCRV, partner and discretionary gauge
+    // lists, 20 bytes per gauge, sharing a slot with the list lengths. One
+    // blob for all three lists; see _writeGauges for the trade-off.
+    address internal gaugeData;
+    uint16 public ycrvGaugesLength;
+    uint16 public partnerGaugesLength;
+    uint16 public discretionaryGaugesLength;
     mapping(address caller => bool approved) public approvedSplitCallers;
-    bool public onlyTokenized = true;
-
+    /// @notice Bitmask of the lists a gauge is in: 1 yCRV, 2 partner, 4 discretionary.
+    ///         Bit 128 records that the gauge controller has approved it.
+    mapping(address gauge => uint8 lists) public gaugeLists;
+    /// @notice Split ratios stored by checkpointSplits for reuse during `week`.
+    SplitCheckpoint public splitCheckpoint;
+    /// @notice When set, category votes come from this tracker instead of a gauge walk.
+    IVoteTracker public voteTracker;
+
+    uint8 internal constant YCRV_GAUGES = 1;
+    uint8 internal constant PARTNER_GAUGES = 2;
+    uint8 internal constant DISCRETIONARY_GAUGES = 4;
+    // Curve never un-approves a gauge, so gauge_types is only checked once.
+    uint8 internal constant APPROVED_GAUGE = 128;
+
+    /// @dev Amounts of REWARD_TOKEN sent to each recipient.
     event AdminFeeSplit(uint ybs, uint treasury, uint remainder);
     event VoteIncentiveSplit(uint ybs, uint treasury, uint remainder);
     event OwnerSet(address indexed owner);
     event GuardianSet(address indexed guardian);
+    event SplitsCheckpointed(uint indexed week);
+    event SplitCheckpointCleared();
+    event VoteTrackerSet(address indexed voteTracker);
+    event DepositYbsRewardsSet(bool depositYbsRewards);
 
     struct BaseBalances {
         uint ybs;
@@ -101,6 +149,22 @@ contract YCRVSplitter {
         address remainderTarget;
     }
 
+    /// @dev getSplits output packed into one slot. The admin fee treasury
+    ///      ratio is always 0 and both remainders are derived from the rest.
+    struct SplitCheckpoint {
+        uint40 week;
+        uint64 adminFeeYbsRatio;
+        uint64 voteIncentiveYbsRatio;
+        uint64 voteIncentiveTreasuryRatio;
+    }
+
+    /// @dev Yearn's active bias per gauge category, read once per split.
+    struct Votes {
+        uint ycrv;
+        uint partners;
+        uint discretionary;
+    }
+
     constructor(
         address _feeBurner,
         address _receiver2,
@@ -108,9 +172,13 @@ contract YCRVSplitter {
         address[] memory partnerGauges,
         address[] memory discretionaryGauges
     ) public {
-        _setYCrvGauges(ycrvGauges);
-        _setPartnerGauges(partnerGauges);
-        _setDiscretionaryGauges(discretionaryGauges);
+        require(
+            _validateGaugeList(ycrvGauges, YCRV_GAUGES) &&
+                _validateGaugeList(partnerGauges, PARTNER_GAUGES) &&
+                _validateGaugeList(discretionaryGauges, DISCRETIONARY_GAUGES),
+            "Invalid gauge list"
+        );
+        _writeGauges(ycrvGauges, partnerGauges, discretionaryGauges);
 
         recipients.ybs = _receiver2;
         recipients.treasury = 0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde;
@@ -130,17 +198,21 @@ contract YCRVSplitter {
         _;
     }
 
-    /// @notice Split according to on-chain calculations.
-    function executeSplit() external {
+    modifier onlySplitCallers() {
         require(
             approvedSplitCallers[msg.sender] ||
                 msg.sender == owner ||
                 msg.sender == guardian
         );
+        _;
+    }
+
+    /// @notice Split according to on-chain calculations.
+    function executeSplit() external onlySplitCallers {
         (
             Split memory adminFeeSplits,
             Split memory voteIncentiveSplits
-        ) = getSplits();
+        ) = _currentSplits();
         _splitDepositAndSend(
             _claimAdminFees(),
             CRVUSD.balanceOf(FEE_BURNER),
@@ -149,6 +221,75 @@ contract YCRVSplitter {
         );
     }
 
+    /// @notice Compute and store this week's split ratios. executeSplit and
+    ///         depositAdminFeesAndSplit reuse them for the rest of the week,
+    ///         so keepers can pre-warm the gauge walk when gas is cheap.
+    ///         Restricted to split callers: the stored ratios apply to every
+    ///         split this week, so they must not come from a caller who can
+    ///         move votes or balances within the same transaction.
+    function checkpointSplits()
+        external
+        onlySplitCallers
+        returns (Split memory adminFeeSplits, Split memory voteIncentiveSplits)
+    {
+        return _checkpointSplits();
+    }
+
+    /// @notice Drop this week's checkpoint; the next split recomputes it.
+    function clearSplitCheckpoint() external onlyOwner {
+        delete splitCheckpoint;
+        emit SplitCheckpointCleared();
+    }
+
+    function _checkpointSplits()
+        internal
+        returns (Split memory adminFeeSplits, Split memory voteIncentiveSplits)
+    {
+        (adminFeeSplits, voteIncentiveSplits) = getSplits();
+        uint week = getCurrentWeekStartTime();
+        splitCheckpoint = SplitCheckpoint(
+            uint40(week),
+            uint64(adminFeeSplits.ybsRatio),
+            uint64(voteIncentiveSplits.ybsRatio),
+            uint64(voteIncentiveSplits.treasuryRatio)
+        );
+        emit SplitsCheckpointed(week);
+    }
+
+    /// @notice Split ratios checkpointed for the current week, if any.
+    function getCheckpointedSplits()
+        public
+        view
+        returns (
+            bool current,
+            Split memory adminFeeSplits,
+            Split memory voteIncentiveSplits
+        )
+    {
+        SplitCheckpoint memory checkpoint = splitCheckpoint;
+        if (checkpoint.week != getCurrentWeekStartTime())
+            return (false, adminFeeSplits, voteIncentiveSplits);
+        adminFeeSplits.ybsRatio = checkpoint.adminFeeYbsRatio;
+        adminFeeSplits.remainderRatio = PRECISION - adminFeeSplits.ybsRatio;
+        voteIncentiveSplits.ybsRatio = checkpoint.voteIncentiveYbsRatio;
+        voteIncentiveSplits.treasuryRatio = checkpoint
+            .voteIncentiveTreasuryRatio;
+        voteIncentiveSplits.remainderRatio =
+            PRECISION -
+            voteIncentiveSplits.ybsRatio -
+            voteIncentiveSplits.treasuryRatio;
+        return (true, adminFeeSplits, voteIncentiveSplits);
+    }
+
+    function _currentSplits()
+        internal
+        returns (Split memory adminFeeSplits, Split memory voteIncentiveSplits)
+    {
+        bool current;
+        (current, adminFeeSplits, voteIncentiveSplits) = getCheckpointedSplits();
+        if (!current) return _checkpointSplits();
+    }
+
     /// @notice Supply manual split values to override on-chain claculations.
     function executeManualSplit(
         Split memory adminFeeSplits,
@@ -181,7 +322,7 @@ contract YCRVSplitter {
         (
             Split memory adminFeeSplits,
             Split memory voteIncentiveSplits
-        ) = getSplits();
+        ) = _currentSplits();
 
         _splitDepositAndSend(
             _adminFeeAmount,
@@ -203,89 +344,95 @@ contract YCRVSplitter {
         if (total == 0) return;
         if (incentiveAmount != 0) {
             CRVUSD.transferFrom(FEE_BURNER, address(this), incentiveAmount);
-            incentiveAmount = (incentiveAmount * PRECISION) / total; // Ratio
         }
-        if (adminFeeAmount != 0) adminFeeAmount = PRECISION - incentiveAmount; // Ratio
-        total = _depositToVault(total);
-
-        Recipients memory _recipients = recipients;
-        _sendAdminFees(
-            (total * adminFeeAmount) / PRECISION,
-            adminFeeSplits,
-            _recipients
-        );
-        _sendVoteIncentives(
-            (total * incentiveAmount) / PRECISION,
-            voteIncentiveSplits,
-            _recipients
+        uint shares = _depositToVault(total);
+        uint incentiveShares = (shares * incentiveAmount) / total;
+        uint adminFeeShares = shares - incentiveShares;
+
+        // Amounts per recipient. Both fee types are paid out together below.
+        adminFeeSplits = _allocate(adminFeeShares, adminFeeSplits);
+        voteIncentiveSplits = _allocate(incentiveShares, voteIncentiveSplits);
+        if (adminFeeShares != 0) {
+            emit AdminFeeSplit(
+                adminFeeSplits.ybsRatio,
+                adminFeeSplits.treasuryRatio,
+                adminFeeSplits.remainderRatio
+            );
+        }
+        if (incentiveShares != 0) {
+            emit VoteIncentiveSplit(
+                voteIncentiveSplits.ybsRatio,
+                voteIncentiveSplits.treasuryRatio,
+                voteIncentiveSplits.remainderRatio
+            );
+        }
+        _send(
+            recipients,
+            adminFeeSplits.ybsRatio + voteIncentiveSplits.ybsRatio,
+            adminFeeSplits.treasuryRatio + voteIncentiveSplits.treasuryRatio,
+            adminFeeSplits.remainderRatio + voteIncentiveSplits.remainderRatio
         );
     }
 
-    function _sendVoteIncentives(
+    /// @dev Convert split ratios into amounts of `_amount`. Rounding dust goes
+    ///      to the remainder target when it has a share.
+    function _allocate(
         uint _amount,
-        Split memory splits,
-        Recipients memory _recipients
-    ) internal returns (uint amount) {
-        if (_amount == 0) return 0;
-        if (splits.ybsRatio > 0) {
-            splits.ybsRatio = (splits.ybsRatio * _amount) / PRECISION;
-            REWARD_TOKEN.transfer(_recipients.ybs, splits.ybsRatio);
+        Split memory splits
+    ) internal pure returns (Split memory amounts) {
+        if (_amount == 0) return amounts;
+        amounts.ybsRatio = (splits.ybsRatio * _amount) / PRECISION;
+        amounts.treasuryRatio = (splits.treasuryRatio * _amount) / PRECISION;
+        if (splits.remainderRatio > 0) {
+            amounts.remainderRatio =
+                _amount -
+                amounts.ybsRatio -
+                amounts.treasuryRatio;
+        }
+    }
+
+    /// @dev One transfer per distinct recipient.
+    function _send(
+        Recipients memory _recipients,
+        uint ybs,
+        uint treasury,
+        uint remainder
+    ) internal {
+        if (_recipients.treasury == _recipients.ybs) {
+            (ybs, treasury) = (ybs + treasury, 0);
         }
-        if (splits.treasuryRatio > 0) {
-            splits.treasuryRatio = (splits.treasuryRatio * _amount) / PRECISION;
-            REWARD_TOKEN.transfer(_recipients.treasury, splits.treasuryRatio);
+        if (_recipients.remainderTarget == _recipients.ybs) {
+            (ybs, remainder) = (ybs + remainder, 0);
+        } else if (_recipients.remainderTarget == _recipients.treasury) {
+            (treasury, remainder) = (treasury + remainder, 0);
         }
-        if (splits.remainderRatio > 0) {
-            REWARD_TOKEN.transfer(
-                _recipients.remainderTarget,
-                REWARD_TOKEN.balanceOf(address(this))
-            );
+        if (ybs > 0) REWARD_TOKEN.transfer(_recipients.ybs, ybs);
+        if (treasury > 0) REWARD_TOKEN.transfer(_recipients.treasury, treasury);
+        if (remainder > 0) {
+            REWARD_TOKEN.transfer(_recipients.remainderTarget, remainder);
+        }
+        if (ybs > 0 && depositYbsRewards) {
+            IReceiver receiver = IReceiver(_recipients.ybs);
+            if (!receiver.paused()) receiver.depositRewards();
         }
-        emit VoteIncentiveSplit(
-            splits.ybsRatio,
-            splits.treasuryRatio,
-            splits.remainderRatio
-        );
-        return amount;
     }
 
     function _claimAdminFees() internal returns (uint) {
         return _getProxy().claimAdminFees();
     }
 
-    function _sendAdminFees(
-        uint _amount,
-        Split memory splits,
-        Recipients memory _recipients
-    ) internal returns (uint) {
-        if (_amount == 0) return 0;
-        if (splits.ybsRatio > 0) {
-            splits.ybsRatio = (splits.ybsRatio * _amount) / PRECISION;
-            REWARD_TOKEN.transfer(_recipients.ybs, splits.ybsRatio);
-        }
-        // Note: Skip splits.treasuryRatio since it is effectively always hardcoded to 0.
-        if (splits.remainderRatio > 0) {
-            splits.remainderRatio =
-                (splits.remainderRatio * _amount) /
-                PRECISION;
-            REWARD_TOKEN.transfer(
-                _recipients.remainderTarget,
-                splits.remainderRatio
-            );
-        }
-        emit AdminFeeSplit(
-            splits.ybsRatio,
-            splits.treasuryRatio,
-            splits.remainderRatio
-        );
-        return _amount;
+    function getBaseBalances() public view returns (BaseBalances memory) {
+        return _getBaseBalances(getPartnerVotes(), yearnVeBalance());
     }
 
-    function getBaseBalances() public view returns (BaseBalances memory base) {
-        base.veTotal = yearnVeBalance();
+    function _getBaseBalances(
+        uint partnerVotes,
+        uint veTotal
+    ) internal view returns (BaseBalances memory base) {
+        base.veTotal = veTotal;
         base.ybs = ybsBalance();
         base.lp = YCRV.balanceOf(POOL);
-        base.partners = getPartnerVotes();
+        base.partners = partnerVotes;
         uint recognizedPositions = base.ybs + base.lp + base.partners;
         uint ycrvTotalSupply = YCRV.totalSupply();
         require(recognizedPositions < ycrvTotalSupply, "PartnerBalanceTooHigh");
@@ -310,17 +457,24 @@ contract YCRVSplitter {
 
     function getVoteIncentiveSplitRatios(
         BaseBalances memory base
-    ) public view returns (Split memory splits) {
-        uint nonVoteIncentiveVotes = getDiscretionaryVotes() +
-            getYcrvVotes() +
-            getPartnerVotes();
+    ) public view returns (Split memory) {
+        return _getVoteIncentiveSplitRatios(base, _getVotes());
+    }
+
+    function _getVoteIncentiveSplitRatios(
+        BaseBalances memory base,
+        Votes memory votes
+    ) internal view returns (Split memory splits) {
+        uint nonVoteIncentiveVotes = votes.discretionary +
+            votes.ycrv +
+            votes.partners;
         uint totalVoteIncentiveVotes = base.veTotal - nonVoteIncentiveVotes;
         if (totalVoteIncentiveVotes == 0) return Split(0, 0, PRECISION);
         splits.ybsRatio =
             (base.ybs * ybsVoteIncentiveRatio) /
             totalVoteIncentiveVotes;
         splits.treasuryRatio =
-            (PRECISION * (base.untokenized - getDiscretionaryVotes())) /
+            (PRECISION * (base.untokenized - votes.discretionary)) /
             totalVoteIncentiveVotes;
         splits.remainderRatio =
             PRECISION -
@@ -329,14 +483,45 @@ contract YCRVSplitter {
     }
 
     /// @notice Preview split ratios.
+    /// @dev Each gauge list is read once and the totals are shared by the
+    ///      base balance and ratio steps.
     function getSplits()
         public
         view
         returns (Split memory adminFeeSplits, Split memory voteIncentiveSplits)
     {
-        BaseBalances memory base = getBaseBalances();
+        Votes memory votes = _getVotes();
+        BaseBalances memory base = _getBaseBalances(
+            votes.partners,
+            yearnVeBalance()
+        );
+        adminFeeSplits = getAdminFeeSplitRatios(base);
+        voteIncentiveSplits = _getVoteIncentiveSplitRatios(base, votes);
+    }
+
+    /// @notice Project split ratios for the week containing `_timestamp`.
+    /// @dev Walks the gauge lists, never the vote tracker, and evaluates gauge
+    ///      bias and Yearn's veCRV balance at `_timestamp`; token balances are
+    ///      taken as they are now. getSplitsAt(block.timestamp) therefore equals
+    ///      getSplits() only while no vote tracker is set, and once this week's
+    ///      ratios are checkpointed executeSplit pays getCheckpointedSplits()
+    ///      instead. Reverts for timestamps before the current block: veCRV's
+    ///      balanceOf(user, t) underflows before the latest lock point.
+    function getSplitsAt(
+        uint _timestamp
+    )
+        public
+        view
+        returns (Split memory adminFeeSplits, Split memory voteIncentiveSplits)
+    {
+        require(_timestamp >= block.timestamp, "Past timestamp");
+        Votes memory votes = _getVotesAt(_weekStart(_timestamp));
+        BaseBalances memory base = _getBaseBalances(
+            votes.partners,
+            yearnVeBalanceAt(_timestamp)
+        );
         adminFeeSplits = getAdminFeeSplitRatios(base);
-        voteIncentiveSplits = getVoteIncentiveSplitRatios(base);
+        voteIncentiveSplits = _getVoteIncentiveSplitRatios(base, votes);
     }
 
     /// @dev Deposits full balance of crvUSD.
@@ -347,16 +532,146 @@ contract YCRVSplitter {
         return REWARD_TOKEN.deposit(_amount, address(this));
     }
 
+    function _getVotes() internal view returns (Votes memory votes) {
+        IVoteTracker tracker = voteTracker;
+        if (address(tracker) != address(0)) {
+            (votes.ycrv, votes.partners, votes.discretionary) = tracker
+                .getVotes();
+            return votes;
+        }
+        return _getVotesAt(getCurrentWeekStartTime());
+    }
+
+    function _getVotesAt(uint week) internal view returns (Votes memory votes) {
+        (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        ) = getGauges();
+        votes.ycrv = _sumGaugeBias(ycrv, week);
+        votes.partners = _sumGaugeBias(partners, week);
+        votes.discretionary = _sumGaugeBias(discretionary, week);
+    }
+
     function getDiscretionaryVotes() public view returns (uint) {
-        return sumGaugeBias(discretionaryGauges);
+        (, , address[] memory discretionary) = getGauges();
+        return sumGaugeBias(discretionary);
     }
 
     function getPartnerVotes() public view returns (uint) {
-        return sumGaugeBias(partnerGauges);
+        (, address[] memory partners, ) = getGauges();
+        return sumGaugeBias(partners);
     }
 
     function getYcrvVotes() public view returns (uint) {
-        return sumGaugeBias(ycrvGauges);
+        (address[] memory ycrv, , ) = getGauges();
+        return sumGaugeBias(ycrv);
+    }
+
+    /// @notice All three gauge lists, loaded with a single code read.
+    function getGauges()
+        public
+        view
+        returns (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        )
+    {
+        uint ycrvLength = ycrvGaugesLength;
+        uint partnerLength = partnerGaugesLength;
+        uint discretionaryLength = discretionaryGaugesLength;
+        bytes memory data = SSTORE2.read(
+            gaugeData,
+            0,
+            20 * (ycrvLength + partnerLength + discretionaryLength)
+        );
+        ycrv = _unpackGauges(data, 0, ycrvLength);
+        partners = _unpackGauges(data, ycrvLength, partnerLength);
+        discretionary = _unpackGauges(
+            data,
+            ycrvLength + partnerLength,
+            discretionaryLength
+        );
+    }
+
+    function ycrvGauges(uint i) external view returns (address) {
+        require(i < ycrvGaugesLength);
+        return _gaugeAt(i);
+    }
+
+    function partnerGauges(uint i) external view returns (address) {
+        require(i < partnerGaugesLength);
+        return _gaugeAt(ycrvGaugesLength + i);
+    }
+
+    function discretionaryGauges(uint i) external view returns (address) {
+        require(i < discretionaryGaugesLength);
+        return _gaugeAt(uint(ycrvGaugesLength) + partnerGaugesLength + i);
+    }
+
+    function _gaugeAt(uint index) internal view returns (address gauge) {
+        bytes memory data = SSTORE2.read(gaugeData, 20 * index, 20);
+        assembly {
+            gauge := shr(96, mload(add(data, 32)))
+        }
+    }
+
+    function _unpackGauges(
+        bytes memory data,
+        uint start,
+        uint length
+    ) internal pure returns (address[] memory gauges) {
+        gauges = new address[](length);
+        for (uint i; i < length; ++i) {
+            uint offset = 20 * (start + i);
+            address gauge;
+            assembly {
+                gauge := shr(96, mload(add(add(data, 32), offset)))
+            }
+            gauges[i] = gauge;
+        }
+    }
+
+    function _packGauges(
+        bytes memory data,
+        uint offset,
+        address[] memory gauges
+    ) internal pure returns (uint) {
+        for (uint i; i < gauges.length; ++i) {
+            address gauge = gauges[i];
+            assembly {
+                // Writes a full word; the 12 trailing zero bytes are
+                // overwritten by the next gauge or land in free memory.
+                mstore(add(add(data, 32), offset), shl(96, gauge))
+            }
+            offset += 20;
+        }
+        return offset;
+    }
+
+    /// @dev Replaces the stored gauge lists with a new code blob. All three
+    ///      lists share one blob, so even a single-gauge add or remove
+    ///      redeploys every list: 32k gas plus ~4k per stored gauge. That is
+    ///      deliberate: list updates are rare admin calls, while every split
+    ///      reads all three lists, and one blob keeps that to a single cold
+    ///      EXTCODECOPY instead of three (~5k gas saved per split).
+    function _writeGauges(
+        address[] memory ycrv,
+        address[] memory partners,
+        address[] memory discretionary
+    ) internal {
+        uint total = ycrv.length + partners.length + discretionary.length;
+        require(total <= type(uint16).max, "Too many gauges");
+        bytes memory data = new bytes(20 * total);
+        uint offset = _packGauges(data, 0, ycrv);
+        offset = _packGauges(data, offset, partners);
+        _packGauges(data, offset, discretionary);
+        gaugeData = SSTORE2.write(data);
+        delete splitCheckpoint;
+        ycrvGaugesLength = uint16(ycrv.length);
+        partnerGaugesLength = uint16(partners.length);
+        discretionaryGaugesLength = uint16(discretionary.length);
     }
 
     function unmigrated() public view returns (uint) {
@@ -372,10 +687,27 @@ contract YCRVSplitter {
         return IERC20(VE).balanceOf(VOTER);
     }
 
+    function yearnVeBalanceAt(uint _timestamp) public view returns (uint) {
+        return IVotingEscrow(VE).balanceOf(VOTER, _timestamp);
+    }
+
     /// @dev Sum all active bias (veCRV contributed by Yearn) for a list of gauges.
     function sumGaugeBias(address[] memory gauges) public view returns (uint) {
-        uint biasTotal;
-        uint currentWeekTimestamp = getCurrentWeekStartTime();
+        return _sumGaugeBias(gauges, getCurrentWeekStartTime());
+    }
+
+    /// @notice sumGaugeBias as of the week containing `_timestamp`.
+    function sumGaugeBiasAt(
+        address[] memory gauges,
+        uint _timestamp
+    ) public view returns (uint) {
+        return _sumGaugeBias(gauges, _weekStart(_timestamp));
+    }
+
+    function _sumGaugeBias(
+        address[] memory gauges,
+        uint currentWeekTimestamp
+    ) internal view returns (uint biasTotal) {
         for (uint i; i < gauges.length; i++) {
             IGaugeController.VotedSlope memory slopeData = GAUGE_CONTROLLER
                 .vote_user_slopes(VOTER, gauges[i]);
@@ -383,49 +715,128 @@ contract YCRVSplitter {
             if (currentWeekTimestamp + 1 weeks < end)
                 biasTotal += slopeData.slope * (end - currentWeekTimestamp);
         }
-        return biasTotal;
     }
 
     function getCurrentWeekStartTime() public view returns (uint) {
-        return (block.timestamp / 1 weeks) * 1 weeks;
+        return _weekStart(block.timestamp);
     }
 
-    /// @notice Manually specify gauges used for yCRV voting.
-    function setYCrvGauges(address[] memory _gauges) external onlyAdmins {
-        _setYCrvGauges(_gauges);
+    function _weekStart(uint _timestamp) internal pure returns (uint) {
+        return (_timestamp / 1 weeks) * 1 weeks;
     }
 
-    function _setYCrvGauges(address[] memory _gauges) internal {
-        require(_validateGaugeList(_gauges), "Invalid gauge list");
-        delete ycrvGauges;
-        ycrvGauges = _gauges;
-        ycrvGaugesLength = _gauges.length;
+    /// @notice Manually specify gauges used for yCRV voting.
+    function setYCrvGauges(address[] memory _gauges) external onlyAdmins {
+        _setGaugeList(YCRV_GAUGES, _gauges);
     }
 
     /// @notice Manually specify gauges used for partner voting.
     function setPartnerGauges(address[] memory _gauges) external onlyAdmins {
-        _setPartnerGauges(_gauges);
-    }
-
-    function _setPartnerGauges(address[] memory _gauges) internal {
-        require(_validateGaugeList(_gauges), "Invalid gauge list");
-        delete partnerGauges;
-        partnerGauges = _gauges;
-        partnerGaugesLength = _gauges.length;
+        _setGaugeList(PARTNER_GAUGES, _gauges);
     }
 
     /// @notice Manually specify gauges that Yearn elects to use its own veCRV balance to vote for.
     function setDiscretionaryGauges(
         address[] memory _gauges
     ) external onlyAdmins {
-        _setDiscretionaryGauges(_gauges);
+        _setGaugeList(DISCRETIONARY_GAUGES, _gauges);
+    }
+
+    function addYCrvGauge(address _gauge) external onlyAdmins {
+        _addGauge(YCRV_GAUGES, _gauge);
+    }
+
+    function removeYCrvGauge(address _gauge) external onlyAdmins {
+        _removeGauge(YCRV_GAUGES, _gauge);
+    }
+
+    function addPartnerGauge(address _gauge) external onlyAdmins {
+        _addGauge(PARTNER_GAUGES, _gauge);
+    }
+
+    function removePartnerGauge(address _gauge) external onlyAdmins {
+        _removeGauge(PARTNER_GAUGES, _gauge);
+    }
+
+    function addDiscretionaryGauge(address _gauge) external onlyAdmins {
+        _addGauge(DISCRETIONARY_GAUGES, _gauge);
+    }
+
+    function removeDiscretionaryGauge(address _gauge) external onlyAdmins {
+        _removeGauge(DISCRETIONARY_GAUGES, _gauge);
+    }
+
+    function _setGaugeList(uint8 list, address[] memory _gauges) internal {
+        address[] memory current = _getGaugeList(list);
+        for (uint i; i < current.length; ++i) {
+            gaugeLists[current[i]] &= ~list;
+        }
+        require(_validateGaugeList(_gauges, list), "Invalid gauge list");
+        _writeGaugeList(list, _gauges);
+        _syncTrackedGauges(current);
+        _syncTrackedGauges(_gauges);
+    }
+
+    function _addGauge(uint8 list, address _gauge) internal {
+        require(_registerGauge(_gauge, list), "Invalid gauge");
+        address[] memory current = _getGaugeList(list);
+        address[] memory gauges = new address[](current.length + 1);
+        for (uint i; i < current.length; ++i) gauges[i] = current[i];
+        gauges[current.length] = _gauge;
+        _writeGaugeList(list, gauges);
+        _syncTrackedGauge(_gauge);
+    }
+
+    /// @dev Keeps the order of the remaining gauges.
+    function _removeGauge(uint8 list, address _gauge) internal {
+        uint8 lists = gaugeLists[_gauge];
+        require((lists & list) != 0, "Gauge not in list");
+        gaugeLists[_gauge] = lists & ~list;
+        address[] memory current = _getGaugeList(list);
+        address[] memory gauges = new address[](current.length - 1);
+        uint k;
+        for (uint i; i < current.length; ++i) {
+            if (current[i] != _gauge) gauges[k++] = current[i];
+        }
+        _writeGaugeList(list, gauges);
+        _syncTrackedGauge(_gauge);
     }
 
-    function _setDiscretionaryGauges(address[] memory _gauges) internal {
-        require(_validateGaugeList(_gauges), "Invalid gauge list");
-        delete discretionaryGauges;
-        discretionaryGauges = _gauges;
-        discretionaryGaugesLength = _gauges.length;
+    /// @dev Keep the vote tracker's category membership in line with ours.
+    function _syncTrackedGauge(address _gauge) internal {
+        IVoteTracker tracker = voteTracker;
+        if (address(tracker) != address(0)) tracker.syncGauge(_gauge);
+    }
+
+    function _syncTrackedGauges(address[] memory _gauges) internal {
+        IVoteTracker tracker = voteTracker;
+        if (address(tracker) == address(0)) return;
+        for (uint i; i < _gauges.length; ++i) tracker.syncGauge(_gauges[i]);
+    }
+
+    function _getGaugeList(
+        uint8 list
+    ) internal view returns (address[] memory) {
+        (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        ) = getGauges();
+        if (list == YCRV_GAUGES) return ycrv;
+        if (list == PARTNER_GAUGES) return partners;
+        return discretionary;
+    }
+
+    function _writeGaugeList(uint8 list, address[] memory _gauges) internal {
+        (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        ) = getGauges();
+        if (list == YCRV_GAUGES) ycrv = _gauges;
+        else if (list == PARTNER_GAUGES) partners = _gauges;
+        else discretionary = _gauges;
+        _writeGauges(ycrv, partners, discretionary);
     }
 
     function sweep(IERC20 token, uint amount) external onlyOwner {
@@ -455,8 +866,37 @@ contract YCRVSplitter {
         approvedSplitCallers[_caller] = _approved;
     }
 
+    /// @notice Read category votes from `_voteTracker` (zero address to walk the
+    ///         gauge lists again). Every listed gauge is synced on the way in.
+    /// @dev List changes are not reported while no tracker is set, so the
+    ///      gauges `_voteTracker` still counts are re-synced first; removed or
+    ///      moved gauges then leave their old categories.
+    function setVoteTracker(IVoteTracker _voteTracker) external onlyOwner {
+        voteTracker = _voteTracker;
+        if (address(_voteTracker) != address(0))
+            _voteTracker.syncCountedGauges();
+        (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        ) = getGauges();
+        _syncTrackedGauges(ycrv);
+        _syncTrackedGauges(partners);
+        _syncTrackedGauges(discretionary);
+        delete splitCheckpoint;
+        emit VoteTrackerSet(address(_voteTracker));
+    }
+
+    /// @notice Forward YBS payouts to stakers in the same transaction by
+    ///         calling depositRewards on the YBS recipient.
+    function setDepositYbsRewards(bool _depositYbsRewards) external onlyOwner {
+        depositYbsRewards = _depositYbsRewards;
+        emit DepositYbsRewardsSet(_depositYbsRewards);
+    }
+
     function setOnlyTokenized(bool _onlyTokenized) external onlyOwner {
         onlyTokenized = _onlyTokenized;
+        delete splitCheckpoint;
     }
 
     function setOwner(address _owner) external onlyOwner {
@@ -477,22 +917,33 @@ contract YCRVSplitter {
         return IVoter(VOTER).strategy();
     }
 
-    /// @dev Prevents duplicates and unapproved gauges
+    /// @dev Prevents duplicates and unapproved gauges. Expects `list` to
+    ///      already be cleared from the gauges being replaced.
     function _validateGaugeList(
-        address[] memory _gauges
+        address[] memory _gauges,
+        uint8 list
     ) internal returns (bool) {
-        for (uint i = 0; i < _gauges.length; i++) {
-            for (uint k = 0; k < i; k++) {
-                // Loop through only the part of the array that has been processed
-                if (i != k && _gauges[i] == _gauges[k]) {
-                    return false;
-                }
-            }
+        for (uint i; i < _gauges.length; ++i) {
+            if (!_registerGauge(_gauges[i], list)) return false;
+        }
+        return true;
+    }
+
+    /// @dev Marks `_gauge` as a member of `list`. False if it is already a
+    ///      member or the gauge controller does not know it.
+    function _registerGauge(
+        address _gauge,
+        uint8 list
+    ) internal returns (bool) {
+        uint8 lists = gaugeLists[_gauge];
+        if ((lists & list) != 0) return false;
+        if ((lists & APPROVED_GAUGE) == 0) {
             // Reverts if Curve gov has not approved this address.
-            try GAUGE_CONTROLLER.gauge_types(_gauges[i]) {} catch {
+            try GAUGE_CONTROLLER.gauge_types(_gauge) {} catch {
                 return false;
             }
         }
+        gaugeLists[_gauge] = lists | list | APPROVED_GAUGE;
         return true;
     }
 }
@@ -0,0 +1,181 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.25;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {YCRVSplitter, IGaugeController, IProxy, IVoter} from "./Splitter.sol";
+
+interface IERC4626Preview {
+    function previewDeposit(uint assets) external view returns (uint);
+}
+
+/// @notice Read-only view of everything a keeper or monitor needs from a
+///         YCRVSplitter, returned from a single eth_call.
+contract SplitterLens {
+    uint public constant PRECISION = 1e18;
+
+    YCRVSplitter public immutable splitter;
+
+    struct GaugeVote {
+        address gauge;
+        uint slope;
+        uint end;
+        uint bias;
+    }
+
+    struct State {
+        uint timestamp;
+        uint weekStart;
+        GaugeVote[] ycrvGauges;
+        GaugeVote[] partnerGauges;
+        GaugeVote[] discretionaryGauges;
+        // Raw inputs; always populated even if the split calculation reverts.
+        uint veTotal;
+        uint ybs;
+        uint lp;
+        uint ycrvSupply;
+        uint unmigrated;
+        uint ybsVoteIncentiveRatio;
+        bool onlyTokenized;
+        // Derived by the splitter from live votes. The splits are zeroed with
+        // splitsReverted set when getSplits would revert (e.g.
+        // PartnerBalanceTooHigh, which also leaves base zero).
+        bool splitsReverted;
+        YCRVSplitter.BaseBalances base;
+        YCRVSplitter.Split adminFeeSplits;
+        YCRVSplitter.Split voteIncentiveSplits;
+        // Ratios the next executeSplit pays: this week's checkpoint if one
+        // was taken (splitsCheckpointed), otherwise the live splits above.
+        // Read these, not the live splits, to show what will be paid.
+        bool splitsCheckpointed;
+        YCRVSplitter.Split payoutAdminFeeSplits;
+        YCRVSplitter.Split payoutVoteIncentiveSplits;
+        YCRVSplitter.Recipients recipients;
+        // Pending payout of the next executeSplit.
+        bool canClaim;
+        uint pendingAdminFees;
+        uint pendingVoteIncentives;
+        uint expectedShares;
+    }
+
+    constructor(YCRVSplitter _splitter) {
+        splitter = _splitter;
+    }
+
+    function getState() external view returns (State memory state) {
+        state.timestamp = block.timestamp;
+        state.weekStart = splitter.getCurrentWeekStartTime();
+        (
+            address[] memory ycrv,
+            address[] memory partners,
+            address[] memory discretionary
+        ) = splitter.getGauges();
+        state.ycrvGauges = _gaugeVotes(ycrv, state.weekStart);
+        state.partnerGauges = _gaugeVotes(partners, state.weekStart);
+        state.discretionaryGauges = _gaugeVotes(
+            discretionary,
+            state.weekStart
+        );
+
+        state.veTotal = splitter.yearnVeBalance();
+        state.ybs = splitter.ybsBalance();
+        state.lp = splitter.YCRV().balanceOf(splitter.POOL());
+        state.ycrvSupply = splitter.YCRV().totalSupply();
+        state.unmigrated = splitter.unmigrated();
+        state.ybsVoteIncentiveRatio = splitter.ybsVoteIncentiveRatio();
+        state.onlyTokenized = splitter.onlyTokenized();
+
+        _loadSplits(state);
+        (
+            state.splitsCheckpointed,
+            state.payoutAdminFeeSplits,
+            state.payoutVoteIncentiveSplits
+        ) = splitter.getCheckpointedSplits();
+        if (!state.splitsCheckpointed) {
+            state.payoutAdminFeeSplits = state.adminFeeSplits;
+            state.payoutVoteIncentiveSplits = state.voteIncentiveSplits;
+        }
+        (
+            state.recipients.ybs,
+            state.recipients.treasury,
+            state.recipients.remainderTarget
+        ) = splitter.recipients();
+
+        (
+            state.canClaim,
+            state.pendingAdminFees,
+            state.pendingVoteIncentives
+        ) = pendingFees();
+        state.expectedShares = IERC4626Preview(address(splitter.REWARD_TOKEN()))
+            .previewDeposit(state.pendingAdminFees + state.pendingVoteIncentives);
+    }
+
+    /// @notice crvUSD the next executeSplit would pick up.
+    /// @dev Admin fees are a lower bound: crvUSD already swept to the voter.
+    ///      Fees still sitting in the Curve fee distributor are only known
+    ///      once claimed.
+    function pendingFees()
+        public
+        view
+        returns (bool canClaim, uint adminFees, uint voteIncentives)
+    {
+        IERC20 crvusd = splitter.CRVUSD();
+        IProxy proxy = IVoter(splitter.VOTER()).strategy();
+        canClaim = proxy.canClaim();
+        adminFees = crvusd.balanceOf(splitter.VOTER());
+        // Mirrors StrategyProxy._claimAdminFees and _splitDepositAndSend thresholds.
+        if (!canClaim && adminFees <= PRECISION) adminFees = 0;
+        voteIncentives = crvusd.balanceOf(splitter.FEE_BURNER());
+        if (voteIncentives <= PRECISION) voteIncentives = 0;
+    }
+
+    /// @dev Each splitter call is guarded on its own: the ratio steps can
+    ///      revert even when the base balances do not (e.g. category bias
+    ///      above the remaining ve balance underflows the vote incentive
+    ///      denominator). Both splits stay zero if either step reverts.
+    function _loadSplits(State memory state) internal view {
+        try splitter.getBaseBalances() returns (
+            YCRVSplitter.BaseBalances memory base
+        ) {
+            state.base = base;
+        } catch {
+            state.splitsReverted = true;
+            return;
+        }
+        try splitter.getAdminFeeSplitRatios(state.base) returns (
+            YCRVSplitter.Split memory adminFeeSplits
+        ) {
+            state.adminFeeSplits = adminFeeSplits;
+        } catch {
+            state.splitsReverted = true;
+        }
+        try splitter.getVoteIncentiveSplitRatios(state.base) returns (
+            YCRVSplitter.Split memory voteIncentiveSplits
+        ) {
+            state.voteIncentiveSplits = voteIncentiveSplits;
+        } catch {
+            state.splitsReverted = true;
+        }
+        if (state.splitsReverted) {
+            delete state.adminFeeSplits;
+            delete state.voteIncentiveSplits;
+        }
+    }
+
+    function _gaugeVotes(
+        address[] memory gauges,
+        uint weekStart
+    ) internal view returns (GaugeVote[] memory votes) {
+        IGaugeController controller = splitter.GAUGE_CONTROLLER();
+        address voter = splitter.VOTER();
+        votes = new GaugeVote[](gauges.length);
+        for (uint i; i < gauges.length; ++i) {
+            address gauge = gauges[i];
+            IGaugeController.VotedSlope memory data = controller
+                .vote_user_slopes(voter, gauge);
+            votes[i] = GaugeVote(gauge, data.slope, data.end, 0);
+            // Same activity rule as YCRVSplitter.sumGaugeBias.
+            if (weekStart + 1 weeks < data.end)
+                votes[i].bias = data.slope * (data.end - weekStart);
+        }
+    }
+}
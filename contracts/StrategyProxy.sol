@@ -8,12 +8,20 @@ import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
 import {IEscrow, IGauge, IFeeDistribution, IMetaRegistry, IGaugeController} from "./interfaces/Curve.sol";
 import {IProxy, SafeProxy} from "./interfaces/IProxy.sol";
 
+interface IVoteTracker {
+    function syncGauge(address gauge) external;
+}
+
 contract StrategyProxy {
     using SafeERC20 for IERC20;
     using Address for address;
     using SafeProxy for IProxy;
 
     uint constant WEEK = 1 weeks;
+    /// @dev Curve's fee distributor runs at most 50 iterations per claim,
+    ///      each one week of history or one of the voter's ve epochs.
+    uint constant WEEKS_PER_CLAIM = 50;
+    uint constant MAX_CLAIMS = 10;
 
     /// @notice Yearn's voter proxy. Typically referred to as "voter".
     IProxy public constant proxy =
@@ -66,6 +74,9 @@ contract StrategyProxy {
     /// @notice Check if an address is an approved factory for deploying Curve voter strategies.
     mapping(address => bool) public approvedFactories;
 
+    /// @notice Tracker notified of every gauge vote, if set.
+    IVoteTracker public voteTracker;
+
     // Events so that indexers can keep track of key actions
     event GovernanceSet(address indexed governance);
     event AdminFeeRecipientSet(address indexed recipient);
@@ -75,6 +86,11 @@ contract StrategyProxy {
     event LockerApprovalSet(address indexed locker, bool indexed approved);
     event RewardTokenApprovalSet(address indexed token, bool approved);
     event FactorySet(address indexed factory, bool indexed approved);
+    event VoteTrackerSet(address indexed voteTracker);
+    event VoteTrackerSyncFailed(
+        address indexed voteTracker,
+        address indexed gauge
+    );
     event TokenClaimed(
         address indexed token,
         address indexed recipient,
@@ -106,6 +122,15 @@ contract StrategyProxy {
         emit GovernanceSet(_governance);
     }
 
+    /// @notice Set the tracker that is told about every gauge vote.
+    /// @dev Must be called by governance. Zero address to disable.
+    /// @param _voteTracker Tracker to notify after each vote.
+    function setVoteTracker(IVoteTracker _voteTracker) external {
+        require(msg.sender == governance, "!governance");
+        voteTracker = _voteTracker;
+        emit VoteTrackerSet(address(_voteTracker));
+    }
+
     /// @notice Set recipient of weekly crvUSD admin fees.
     /// @dev Only a single address can be approved at any time.
     ///  Must be called by governance.
@@ -230,6 +255,13 @@ contract StrategyProxy {
                 _weight
             )
         );
+        // The vote must not depend on the tracker; a failed sync is logged
+        // and can be redone with the permissionless syncGauge.
+        IVoteTracker tracker = voteTracker;
+        if (address(tracker) == address(0)) return;
+        try tracker.syncGauge(_gauge) {} catch {
+            emit VoteTrackerSyncFailed(address(tracker), _gauge);
+        }
     }
 
     /// @notice Withdraw exact amount of LPs from gauge.
@@ -243,6 +275,36 @@ contract StrategyProxy {
         uint256 _amount
     ) public returns (uint256) {
         require(strategies[_gauge] == msg.sender, "!strategy");
+        return _withdraw(_gauge, _token, _amount);
+    }
+
+    /// @notice Withdraw exact amounts of LPs from several gauges.
+    /// @dev Must be called by the strategy approved for every given gauge.
+    /// @param _gauges The gauges from which to withdraw.
+    /// @param _tokens The LP token of each gauge.
+    /// @param _amounts The exact amount of LPs to withdraw from each gauge.
+    function withdrawMany(
+        address[] calldata _gauges,
+        address[] calldata _tokens,
+        uint256[] calldata _amounts
+    ) external returns (uint256[] memory _withdrawn) {
+        require(
+            _gauges.length == _tokens.length &&
+                _gauges.length == _amounts.length,
+            "!mismatch"
+        );
+        _withdrawn = new uint256[](_gauges.length);
+        for (uint256 i = 0; i < _gauges.length; i++) {
+            require(strategies[_gauges[i]] == msg.sender, "!strategy");
+            _withdrawn[i] = _withdraw(_gauges[i], _tokens[i], _amounts[i]);
+        }
+    }
+
+    function _withdraw(
+        address _gauge,
+        address _token,
+        uint256 _amount
+    ) internal returns (uint256) {
         uint256 _balance = IERC20(_token).balanceOf(address(proxy));
         proxy.safeExecute(
             _gauge,
@@ -285,6 +347,26 @@ contract StrategyProxy {
     /// @param _token The LP token to deposit into gauge.
     function deposit(address _gauge, address _token) external {
         require(strategies[_gauge] == msg.sender, "!strategy");
+        _deposit(_gauge, _token);
+    }
+
+    /// @notice Deposit Curve LPs into several gauges.
+    /// @dev Strategy must first transfer LPs to this contract prior to calling.
+    ///  Must be called by the strategy approved for every given gauge.
+    /// @param _gauges The gauges to deposit LP tokens into.
+    /// @param _tokens The LP token of each gauge.
+    function depositMany(
+        address[] calldata _gauges,
+        address[] calldata _tokens
+    ) external {
+        require(_gauges.length == _tokens.length, "!mismatch");
+        for (uint256 i = 0; i < _gauges.length; i++) {
+            require(strategies[_gauges[i]] == msg.sender, "!strategy");
+            _deposit(_gauges[i], _tokens[i]);
+        }
+    }
+
+    function _deposit(address _gauge, address _token) internal {
         uint256 _balance = IERC20(_token).balanceOf(address(this));
         IERC20(_token).safeTransfer(address(proxy), _balance);
         _balance = IERC20(_token).balanceOf(address(proxy));
@@ -333,6 +415,46 @@ contract StrategyProxy {
         );
     }
 
+    /// @notice Harvest CRV from several gauges in one transaction.
+    /// @dev Mints through the minter's mint_many, eight gauges per call, and
+    ///  sends the combined CRV to the strategy in a single transfer.
+    ///  Must be called by the strategy approved for every given gauge.
+    /// @param _gauges The gauges which this strategy is claiming CRV from.
+    /// @return _amount CRV transferred to the strategy.
+    function harvestMany(
+        address[] calldata _gauges
+    ) external returns (uint256 _amount) {
+        uint256 _balance = IERC20(crv).balanceOf(address(proxy));
+        address[8] memory _batch;
+        uint256 _size;
+        for (uint256 i = 0; i < _gauges.length; i++) {
+            require(strategies[_gauges[i]] == msg.sender, "!strategy");
+            _batch[_size++] = _gauges[i];
+            if (_size == 8 || i == _gauges.length - 1) {
+                // mint_many stops at the first empty slot.
+                proxy.safeExecute(
+                    mintr,
+                    0,
+                    abi.encodeWithSignature("mint_many(address[8])", _batch)
+                );
+                delete _batch;
+                _size = 0;
+            }
+        }
+        _amount = IERC20(crv).balanceOf(address(proxy)) - _balance;
+        if (_amount > 0) {
+            proxy.safeExecute(
+                crv,
+                0,
+                abi.encodeWithSignature(
+                    "transfer(address,uint256)",
+                    msg.sender,
+                    _amount
+                )
+            );
+        }
+    }
+
     /// @notice Claim share of weekly admin fees from Curve fee distributor.
     /// @dev Admin fees become available every Thursday at 00:00 UTC
     function claimAdminFees() external returns (uint) {
@@ -346,17 +468,23 @@ contract StrategyProxy {
         return _claimAdminFees(_recipient);
     }
 
+    /// @dev Claims until the voter's cursor reaches the distributor's last
+    ///      checkpointed week or stops moving. previewClaim's count is only a
+    ///      lower bound: iterations spent on ve epochs do not advance it.
     function _claimAdminFees(address _recipient) internal returns (uint) {
         address p = address(proxy);
-        uint balance = crvUSD.balanceOf(p);
         if (!canClaim()) {
+            uint balance = crvUSD.balanceOf(p);
             return balance > 1e18 ? _transferBalance(crvUSD, _recipient) : 0;
         }
 
-        for (uint i; i < 10; i++) {
-            // @dev max 10 tries is up to 500 weeks of history.
+        uint lastTokenWeek = (feeDistribution.last_token_time() / WEEK) * WEEK;
+        uint cursor = feeDistribution.time_cursor_of(p);
+        for (uint i; i < MAX_CLAIMS && cursor < lastTokenWeek; ++i) {
             feeDistribution.claim(p);
-            if (crvUSD.balanceOf(p) > balance) break;
+            uint next = feeDistribution.time_cursor_of(p);
+            if (next == cursor) break;
+            cursor = next;
         }
         return _transferBalance(crvUSD, _recipient);
     }
@@ -398,6 +526,31 @@ contract StrategyProxy {
         return false;
     }
 
+    /// @notice Weeks of admin fees waiting in the fee distributor and the
+    ///         fewest claim calls that can collect them.
+    /// @dev Both are zero when canClaim is false. Weeks are counted up to the
+    ///      distributor's last checkpointed week, where claimAdminFees stops.
+    ///      A voter that never claimed has no cursor yet; the distributor
+    ///      starts it inside claim, so that case reports no known weeks and
+    ///      one claim. Claims are capped at MAX_CLAIMS. Each ve epoch of the
+    ///      voter inside the pending range costs a claim iteration too, so
+    ///      collecting can take more calls; claimAdminFees keeps going while
+    ///      the cursor advances.
+    function previewClaim()
+        public
+        view
+        returns (uint pendingWeeks, uint claims)
+    {
+        if (!canClaim()) return (0, 0);
+        uint cursor = feeDistribution.time_cursor_of(address(proxy));
+        if (cursor == 0) return (0, 1);
+        uint lastTokenWeek = (feeDistribution.last_token_time() / WEEK) * WEEK;
+        if (cursor >= lastTokenWeek) return (0, 0);
+        pendingWeeks = (lastTokenWeek - cursor) / WEEK;
+        claims = (pendingWeeks + WEEKS_PER_CLAIM - 1) / WEEKS_PER_CLAIM;
+        if (claims > MAX_CLAIMS) claims = MAX_CLAIMS;
+    }
+
     /// @notice Claim non-CRV token incentives from the gauge and transfer to strategy.
     /// @dev    There are two claim methods:
     ///         - new (preferred): strategy is set as the recipient in the gauge contract. Rewards are fwd'd directly to strategy.
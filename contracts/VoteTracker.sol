@@ -0,0 +1,185 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.25;
+
+import {YCRVSplitter, IGaugeController} from "./Splitter.sol";
+
+/// @notice Keeps Yearn's vote bias per splitter gauge category as running
+///         aggregates, so the splitter can read each category total in O(1)
+///         instead of walking every gauge.
+/// @dev Mirrors the gauge controller's point-history model: each category
+///      holds sum(slope) and sum(slope * end) over its active votes, and
+///      slope leaving a category is bucketed by lock end and expired as weeks
+///      pass. The bias at week `t` is then `slopeEnd - t * slope`, which equals
+///      YCRVSplitter.sumGaugeBias over the same gauges.
+///
+///      Every update re-reads the gauge controller and the splitter's list
+///      membership, so syncGauge is permissionless. StrategyProxy calls it
+///      after each vote and the splitter after each list change; votes cast
+///      by any other path must be synced by hand. List changes made while the
+///      splitter was not using this tracker are caught up by
+///      syncCountedGauges, which the splitter calls when the tracker is set.
+contract VoteTracker {
+    uint constant CATEGORIES = 3;
+
+    YCRVSplitter public immutable splitter;
+    address public immutable voter;
+    IGaugeController public immutable gaugeController;
+
+    struct TrackedGauge {
+        uint80 slope;
+        uint40 end;
+        uint8 lists; // YCRVSplitter.gaugeLists bits the vote is counted in
+        uint32 index; // 1-based position in countedGauges, 0 if not counted
+    }
+
+    struct Point {
+        uint128 slope;
+        uint128 slopeEnd;
+    }
+
+    /// @notice Vote last recorded for each gauge.
+    mapping(address gauge => TrackedGauge) public trackedGauges;
+    /// @notice Gauges counted in at least one category.
+    address[] public countedGauges;
+    /// @notice Aggregates per category (0 yCRV, 1 partner, 2 discretionary) as of lastWeek.
+    Point[CATEGORIES] public points;
+    uint public lastWeek;
+    // lock end => slope leaving each category once `end` is within a week.
+    mapping(uint end => uint80[CATEGORIES] slopes) internal slopeChanges;
+
+    event GaugeSynced(
+        address indexed gauge,
+        uint slope,
+        uint end,
+        uint8 lists
+    );
+
+    constructor(YCRVSplitter _splitter) {
+        splitter = _splitter;
+        voter = _splitter.VOTER();
+        gaugeController = _splitter.GAUGE_CONTROLLER();
+        lastWeek = _currentWeek();
+    }
+
+    /// @notice Active bias per category for the current week.
+    function getVotes()
+        external
+        view
+        returns (uint ycrv, uint partners, uint discretionary)
+    {
+        uint week = _currentWeek();
+        Point[CATEGORIES] memory current = _advance(points, lastWeek, week);
+        ycrv = current[0].slopeEnd - week * current[0].slope;
+        partners = current[1].slopeEnd - week * current[1].slope;
+        discretionary = current[2].slopeEnd - week * current[2].slope;
+    }
+
+    /// @notice Expire votes whose locks ended since the last update.
+    function checkpoint() public returns (uint week) {
+        week = _currentWeek();
+        uint last = lastWeek;
+        if (week == last) return week;
+        Point[CATEGORIES] memory current = _advance(points, last, week);
+        for (uint i; i < CATEGORIES; ++i) points[i] = current[i];
+        lastWeek = week;
+    }
+
+    /// @notice Re-read a gauge's vote and list membership and update the aggregates.
+    function syncGauge(address _gauge) public {
+        uint week = checkpoint();
+        TrackedGauge memory old = trackedGauges[_gauge];
+        IGaugeController.VotedSlope memory vote = gaugeController
+            .vote_user_slopes(voter, _gauge);
+        require(vote.slope <= type(uint80).max, "Slope too large");
+        // Curve lock ends are week-aligned; expiry buckets rely on it.
+        require(vote.end % 1 weeks == 0, "Unaligned lock end");
+        TrackedGauge memory tracked = TrackedGauge(
+            uint80(vote.slope),
+            uint40(vote.end),
+            splitter.gaugeLists(_gauge) & 7,
+            old.index
+        );
+
+        for (uint i; i < CATEGORIES; ++i) {
+            uint8 bit = uint8(1 << i);
+            if ((old.lists & bit) != 0) _update(i, old, week, false);
+            if ((tracked.lists & bit) != 0) _update(i, tracked, week, true);
+        }
+        if (old.lists == 0 && tracked.lists != 0) {
+            countedGauges.push(_gauge);
+            tracked.index = uint32(countedGauges.length);
+        } else if (old.lists != 0 && tracked.lists == 0) {
+            _removeCounted(old.index);
+            tracked.index = 0;
+        }
+        trackedGauges[_gauge] = tracked;
+        emit GaugeSynced(_gauge, vote.slope, vote.end, tracked.lists);
+    }
+
+    function syncGauges(address[] calldata _gauges) external {
+        for (uint i; i < _gauges.length; ++i) syncGauge(_gauges[i]);
+    }
+
+    /// @notice Re-sync every gauge still counted in a category, dropping the
+    ///         ones the splitter no longer lists.
+    function syncCountedGauges() external {
+        address[] memory gauges = countedGauges;
+        for (uint i; i < gauges.length; ++i) syncGauge(gauges[i]);
+    }
+
+    function countedGaugesLength() external view returns (uint) {
+        return countedGauges.length;
+    }
+
+    /// @dev Swap-and-pop; moves the last gauge into the freed position.
+    function _removeCounted(uint32 index) internal {
+        address last = countedGauges[countedGauges.length - 1];
+        if (index != countedGauges.length) {
+            countedGauges[index - 1] = last;
+            trackedGauges[last].index = index;
+        }
+        countedGauges.pop();
+    }
+
+    function _update(
+        uint category,
+        TrackedGauge memory gauge,
+        uint week,
+        bool add
+    ) internal {
+        // Matches sumGaugeBias: only counted while week + 1 weeks < end.
+        if (gauge.end <= week + 1 weeks || gauge.slope == 0) return;
+        Point storage point = points[category];
+        uint80[CATEGORIES] storage changes = slopeChanges[gauge.end];
+        if (add) {
+            point.slope += gauge.slope;
+            point.slopeEnd += uint128(gauge.slope) * gauge.end;
+            changes[category] += gauge.slope;
+        } else {
+            point.slope -= gauge.slope;
+            point.slopeEnd -= uint128(gauge.slope) * gauge.end;
+            changes[category] -= gauge.slope;
+        }
+    }
+
+    function _advance(
+        Point[CATEGORIES] memory current,
+        uint from,
+        uint to
+    ) internal view returns (Point[CATEGORIES] memory) {
+        for (uint t = from + 1 weeks; t <= to; t += 1 weeks) {
+            // Votes ending at t + 1 weeks stop counting in week t.
+            uint end = t + 1 weeks;
+            uint80[CATEGORIES] memory changes = slopeChanges[end];
+            for (uint i; i < CATEGORIES; ++i) {
+                current[i].slope -= changes[i];
+                current[i].slopeEnd -= uint128(changes[i] * end);
+            }
+        }
+        return current;
+    }
+
+    function _currentWeek() internal view returns (uint) {
+        return (block.timestamp / 1 weeks) * 1 weeks;
+    }
+}
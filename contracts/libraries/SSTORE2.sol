@@ -0,0 +1,33 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/// @notice Read and write persistent data as contract bytecode, so large
+///         read-mostly values load with one EXTCODECOPY instead of one SLOAD
+///         per word.
+/// @dev Adapted from Solmate's SSTORE2. Data is stored after a leading STOP
+///      byte so the pointer contract can never be called.
+library SSTORE2 {
+    function write(bytes memory data) internal returns (address pointer) {
+        bytes memory runtimeCode = abi.encodePacked(hex"00", data);
+        bytes memory creationCode = abi.encodePacked(
+            // Copy the runtime code that follows this 11 byte prefix into memory and return it.
+            hex"60_0B_59_81_38_03_80_92_59_39_F3",
+            runtimeCode
+        );
+        assembly {
+            pointer := create(0, add(creationCode, 32), mload(creationCode))
+        }
+        require(pointer != address(0), "SSTORE2: write failed");
+    }
+
+    function read(
+        address pointer,
+        uint start,
+        uint size
+    ) internal view returns (bytes memory data) {
+        data = new bytes(size);
+        assembly {
+            extcodecopy(pointer, add(data, 32), add(start, 1), size)
+        }
+    }
+}
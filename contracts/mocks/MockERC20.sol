@@ -0,0 +1,63 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/// @notice Mintable ERC20 stand-in for the mainnet tokens used by the splitter.
+/// @dev Revert strings mirror the ones the fork tests already expect.
+contract MockERC20 {
+    string public name;
+    string public symbol;
+    uint8 public constant decimals = 18;
+    uint public totalSupply;
+    mapping(address => uint) public balanceOf;
+    mapping(address => mapping(address => uint)) public allowance;
+
+    event Transfer(
+        address indexed sender,
+        address indexed receiver,
+        uint value
+    );
+    event Approval(address indexed owner, address indexed spender, uint value);
+
+    constructor(string memory _name, string memory _symbol) {
+        name = _name;
+        symbol = _symbol;
+    }
+
+    function mint(address _to, uint _amount) external {
+        totalSupply += _amount;
+        balanceOf[_to] += _amount;
+        emit Transfer(address(0), _to, _amount);
+    }
+
+    function approve(address _spender, uint _amount) external returns (bool) {
+        allowance[msg.sender][_spender] = _amount;
+        emit Approval(msg.sender, _spender, _amount);
+        return true;
+    }
+
+    function transfer(address _to, uint _amount) external returns (bool) {
+        _transfer(msg.sender, _to, _amount);
+        return true;
+    }
+
+    function transferFrom(
+        address _from,
+        address _to,
+        uint _amount
+    ) external returns (bool) {
+        uint allowed = allowance[_from][msg.sender];
+        require(allowed >= _amount, "ERC20: allowance too low");
+        if (allowed != type(uint).max) {
+            allowance[_from][msg.sender] = allowed - _amount;
+        }
+        _transfer(_from, _to, _amount);
+        return true;
+    }
+
+    function _transfer(address _from, address _to, uint _amount) internal {
+        require(balanceOf[_from] >= _amount, "ERC20: balance too low");
+        balanceOf[_from] -= _amount;
+        balanceOf[_to] += _amount;
+        emit Transfer(_from, _to, _amount);
+    }
+}
@@ -0,0 +1,101 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+interface IVotingEscrowBalance {
+    function balanceOf(address user) external view returns (uint);
+
+    function totalSupply() external view returns (uint);
+
+    function user_point_epoch(address user) external view returns (uint);
+
+    function user_point_ts(address user, uint epoch) external view returns (uint);
+}
+
+/// @notice Fee distributor stand-in exposing the checkpoint/claim surface of Curve's.
+/// @dev Tokens are shared pro-rata to ve balances at claim time rather than per week.
+///      Like Curve's, one claim runs at most 50 iterations, each either
+///      stepping past one of the user's ve epochs or advancing the cursor a
+///      week, so a lock with many epochs needs extra claims.
+contract MockFeeDistributor {
+    uint constant WEEK = 1 weeks;
+    uint constant ITERATIONS_PER_CLAIM = 50;
+    uint constant TOKEN_CHECKPOINT_DEADLINE = 1 days;
+
+    IERC20 public immutable token;
+    IVotingEscrowBalance public immutable voting_escrow;
+    bool public can_checkpoint_token;
+    uint public last_token_time;
+    uint public token_last_balance;
+    uint public tokens_per_ve;
+    mapping(address => uint) public time_cursor_of;
+    mapping(address => uint) public user_epoch_of;
+    mapping(address => uint) internal paidPerVe;
+
+    constructor(IERC20 _token, IVotingEscrowBalance _votingEscrow) {
+        token = _token;
+        voting_escrow = _votingEscrow;
+    }
+
+    function setTimeCursorOf(address _addr, uint _t) external {
+        time_cursor_of[_addr] = (_t / WEEK) * WEEK;
+    }
+
+    function toggle_allow_checkpoint_token() external {
+        can_checkpoint_token = !can_checkpoint_token;
+    }
+
+    function checkpoint_token() external {
+        require(
+            can_checkpoint_token &&
+                block.timestamp > last_token_time + TOKEN_CHECKPOINT_DEADLINE,
+            "!checkpoint"
+        );
+        _checkpointToken();
+    }
+
+    function claim(address _addr) external returns (uint amount) {
+        if (
+            can_checkpoint_token &&
+            block.timestamp > last_token_time + TOKEN_CHECKPOINT_DEADLINE
+        ) _checkpointToken();
+
+        uint lastTokenWeek = (last_token_time / WEEK) * WEEK;
+        uint cursor = time_cursor_of[_addr];
+        if (cursor >= lastTokenWeek) return 0;
+        uint epoch = user_epoch_of[_addr];
+        uint maxEpoch = voting_escrow.user_point_epoch(_addr);
+        for (uint i; i < ITERATIONS_PER_CLAIM && cursor < lastTokenWeek; ++i) {
+            if (
+                epoch < maxEpoch &&
+                voting_escrow.user_point_ts(_addr, epoch + 1) <= cursor
+            ) ++epoch;
+            else cursor += WEEK;
+        }
+        user_epoch_of[_addr] = epoch;
+        time_cursor_of[_addr] = cursor;
+
+        amount =
+            ((tokens_per_ve - paidPerVe[_addr]) *
+                voting_escrow.balanceOf(_addr)) /
+            1e18;
+        paidPerVe[_addr] = tokens_per_ve;
+        if (amount > token_last_balance) amount = token_last_balance;
+        if (amount == 0) return 0;
+        token_last_balance -= amount;
+        token.transfer(_addr, amount);
+    }
+
+    function _checkpointToken() internal {
+        uint balance = token.balanceOf(address(this));
+        uint supply = voting_escrow.totalSupply();
+        if (supply != 0) {
+            tokens_per_ve +=
+                ((balance - token_last_balance) * 1e18) /
+                supply;
+        }
+        token_last_balance = balance;
+        last_token_time = block.timestamp;
+    }
+}
@@ -0,0 +1,39 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import {IERC20, SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+/// @notice Liquidity gauge stand-in with the deposit, withdraw and minting
+///         surface StrategyProxy uses.
+/// @dev CRV earned is set directly with accrue instead of following emissions.
+contract MockGauge {
+    using SafeERC20 for IERC20;
+
+    IERC20 public immutable lp_token;
+    mapping(address => uint) public balanceOf;
+    mapping(address => address) public rewards_receiver;
+    // Total CRV ever earned per user; the minter pays out the difference.
+    mapping(address => uint) public integrate_fraction;
+
+    constructor(IERC20 _lpToken) {
+        lp_token = _lpToken;
+    }
+
+    function deposit(uint _value) external {
+        lp_token.safeTransferFrom(msg.sender, address(this), _value);
+        balanceOf[msg.sender] += _value;
+    }
+
+    function withdraw(uint _value) external {
+        balanceOf[msg.sender] -= _value;
+        lp_token.safeTransfer(msg.sender, _value);
+    }
+
+    function set_rewards_receiver(address _receiver) external {
+        rewards_receiver[msg.sender] = _receiver;
+    }
+
+    function accrue(address _user, uint _amount) external {
+        integrate_fraction[_user] += _amount;
+    }
+}
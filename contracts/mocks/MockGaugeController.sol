@@ -0,0 +1,60 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+interface IMockVotingEscrow {
+    function get_last_user_slope(address user) external view returns (int128);
+
+    function locked__end(address user) external view returns (uint);
+}
+
+/// @notice Gauge controller stand-in that tracks per-user vote slopes like Curve's.
+/// @dev No vote delay and no gauge weight bookkeeping; only what the splitter reads.
+contract MockGaugeController {
+    uint constant MAX_POWER = 10_000;
+
+    struct VotedSlope {
+        uint slope;
+        uint power;
+        uint end;
+    }
+
+    IMockVotingEscrow public immutable voting_escrow;
+    // gauge => type + 1, so zero means "not added"
+    mapping(address => int128) internal gaugeTypes;
+    mapping(address => mapping(address => VotedSlope)) public vote_user_slopes;
+    mapping(address => uint) public vote_user_power;
+
+    constructor(IMockVotingEscrow _votingEscrow) {
+        voting_escrow = _votingEscrow;
+    }
+
+    function add_gauge(address _gauge, int128 _gaugeType) external {
+        require(gaugeTypes[_gauge] == 0, "cannot add the same gauge twice");
+        gaugeTypes[_gauge] = _gaugeType + 1;
+    }
+
+    function gauge_types(address _gauge) external view returns (int128) {
+        int128 gaugeType = gaugeTypes[_gauge];
+        require(gaugeType != 0, "gauge not added");
+        return gaugeType - 1;
+    }
+
+    function vote_for_gauge_weights(address _gauge, uint _weight) external {
+        require(_weight <= MAX_POWER, "You used all your voting power");
+        require(gaugeTypes[_gauge] != 0, "Gauge not added");
+        uint end = voting_escrow.locked__end(msg.sender);
+        require(end > block.timestamp, "Your token lock expires too soon");
+
+        VotedSlope memory old = vote_user_slopes[msg.sender][_gauge];
+        uint power = vote_user_power[msg.sender] + _weight - old.power;
+        require(power <= MAX_POWER, "Used too much power");
+        vote_user_power[msg.sender] = power;
+
+        uint slope = uint(int(voting_escrow.get_last_user_slope(msg.sender)));
+        vote_user_slopes[msg.sender][_gauge] = VotedSlope(
+            (slope * _weight) / MAX_POWER,
+            _weight,
+            end
+        );
+    }
+}
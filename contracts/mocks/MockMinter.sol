@@ -0,0 +1,44 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+interface IMintableERC20 {
+    function mint(address to, uint amount) external;
+}
+
+interface IMockGauge {
+    function integrate_fraction(address user) external view returns (uint);
+}
+
+/// @notice Curve token minter stand-in: mints each gauge's unpaid CRV.
+contract MockMinter {
+    IMintableERC20 public immutable token;
+    mapping(address user => mapping(address gauge => uint)) public minted;
+    uint public mint_many_calls;
+
+    event Minted(address indexed recipient, address gauge, uint minted);
+
+    constructor(IMintableERC20 _token) {
+        token = _token;
+    }
+
+    function mint(address _gauge) external {
+        _mintFor(_gauge, msg.sender);
+    }
+
+    /// @dev Like Curve's, stops at the first empty slot.
+    function mint_many(address[8] calldata _gauges) external {
+        ++mint_many_calls;
+        for (uint i; i < 8 && _gauges[i] != address(0); ++i) {
+            _mintFor(_gauges[i], msg.sender);
+        }
+    }
+
+    function _mintFor(address _gauge, address _user) internal {
+        uint total = IMockGauge(_gauge).integrate_fraction(_user);
+        uint amount = total - minted[_user][_gauge];
+        if (amount == 0) return;
+        minted[_user][_gauge] = total;
+        token.mint(_user, amount);
+        emit Minted(_user, _gauge, total);
+    }
+}
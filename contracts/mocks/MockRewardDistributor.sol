@@ -0,0 +1,26 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import {IERC20, SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+/// @notice YBS reward distributor stand-in; it only accepts and records deposits.
+contract MockRewardDistributor {
+    using SafeERC20 for IERC20;
+
+    IERC20 public immutable rewardToken;
+
+    event RewardDeposited(
+        uint indexed week,
+        address indexed depositor,
+        uint rewardAmount
+    );
+
+    constructor(IERC20 _rewardToken) {
+        rewardToken = _rewardToken;
+    }
+
+    function depositReward(uint _amount) external {
+        rewardToken.safeTransferFrom(msg.sender, address(this), _amount);
+        emit RewardDeposited(block.timestamp / 1 weeks, msg.sender, _amount);
+    }
+}
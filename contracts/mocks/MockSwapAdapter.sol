@@ -0,0 +1,29 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import {IERC20, SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+/// @notice Fixed-rate DEX stand-in for FeeBurner conversions.
+/// @dev Pays out of its own balance, so fund it with the output token first.
+contract MockSwapAdapter {
+    using SafeERC20 for IERC20;
+
+    // tokenIn => tokenOut per tokenIn, scaled by 1e18
+    mapping(address => uint) public rates;
+
+    function setRate(address _token, uint _rate) external {
+        rates[_token] = _rate;
+    }
+
+    function swap(
+        address _tokenIn,
+        address _tokenOut,
+        uint _amountIn,
+        uint _minOut,
+        address _receiver
+    ) external returns (uint amountOut) {
+        amountOut = (_amountIn * rates[_tokenIn]) / 1e18;
+        require(amountOut >= _minOut, "slippage");
+        IERC20(_tokenOut).safeTransfer(_receiver, amountOut);
+    }
+}
@@ -0,0 +1,13 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {IERC20Metadata} from "@openzeppelin/contracts/token/ERC20/extensions/IERC20Metadata.sol";
+import {ERC4626} from "@openzeppelin/contracts/token/ERC20/extensions/ERC4626.sol";
+
+/// @notice ERC4626 stand-in for the yvcrvUSD V3 vault.
+contract MockVault is ERC4626 {
+    constructor(
+        IERC20Metadata _asset
+    ) ERC20("Mock Vault", "mvTOKEN") ERC4626(_asset) {}
+}
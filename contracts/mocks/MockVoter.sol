@@ -0,0 +1,30 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/// @notice Stand-in for Yearn's veCRV voter proxy.
+contract MockVoter {
+    address public immutable governance;
+    address public strategy;
+
+    constructor(address _governance) {
+        governance = _governance;
+    }
+
+    function setStrategy(address _strategy) external {
+        require(msg.sender == governance, "!governance");
+        strategy = _strategy;
+    }
+
+    function execute(
+        address _to,
+        uint _value,
+        bytes calldata _data
+    ) external returns (bool, bytes memory) {
+        require(msg.sender == strategy || msg.sender == governance, "!authorized");
+        return _to.call{value: _value}(_data);
+    }
+
+    function increaseAmount(uint) external {
+        require(msg.sender == strategy || msg.sender == governance, "!authorized");
+    }
+}
@@ -0,0 +1,61 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/// @notice Linear-decay veCRV stand-in. Locks are set directly instead of by depositing CRV.
+/// @dev Every lock change records a user point timestamp, like a new user
+///      epoch in Curve's escrow; the fee distributor mock walks them.
+contract MockVotingEscrow {
+    uint constant WEEK = 1 weeks;
+
+    struct Lock {
+        uint slope;
+        uint end;
+    }
+
+    mapping(address => Lock) internal locks;
+    mapping(address => uint[]) internal pointTimestamps;
+    uint public totalSupply;
+
+    function setLock(address _user, uint _slope, uint _end) external {
+        locks[_user] = Lock(_slope, (_end / WEEK) * WEEK);
+        pointTimestamps[_user].push(block.timestamp);
+    }
+
+    /// @notice Latest user epoch; epochs are numbered from 1 as in Curve's.
+    function user_point_epoch(address _user) external view returns (uint) {
+        return pointTimestamps[_user].length;
+    }
+
+    function user_point_ts(address _user, uint _epoch) external view returns (uint) {
+        return pointTimestamps[_user][_epoch - 1];
+    }
+
+    function setTotalSupply(uint _totalSupply) external {
+        totalSupply = _totalSupply;
+    }
+
+    function balanceOf(address _user) external view returns (uint) {
+        return balanceOf(_user, block.timestamp);
+    }
+
+    function balanceOf(address _user, uint _t) public view returns (uint) {
+        Lock memory lock = locks[_user];
+        if (lock.end <= _t) return 0;
+        return lock.slope * (lock.end - _t);
+    }
+
+    function locked__end(address _user) external view returns (uint) {
+        return locks[_user].end;
+    }
+
+    function get_last_user_slope(address _user) external view returns (int128) {
+        return int128(int(locks[_user].slope));
+    }
+
+    function increase_unlock_time(uint _unlockTime) external {
+        uint end = (_unlockTime / WEEK) * WEEK;
+        require(end > locks[msg.sender].end, "Can only increase lock duration");
+        locks[msg.sender].end = end;
+        pointTimestamps[msg.sender].push(block.timestamp);
+    }
+}
@@ -0,0 +1,56 @@
+"""
+Reconstruct weekly splits and payouts since deployment.
+
+    SPLITTER=0x... START_BLOCK=19000000 ape run backfill --network ethereum:mainnet:alchemy
+
+Needs an archive node. Reads are cached in BACKFILL_CACHE (default
+.cache/backfill.sqlite), so re-running only fetches weeks added since the
+last run. Results are written to BACKFILL_OUT (default reports/backfill.csv);
+amounts are raw integers, which can exceed what Parquet's int64 holds.
+"""
+import os
+from pathlib import Path
+
+from ape import chain
+
+from ycrv_splitter.backfill import Backfill, BackfillCache
+from ycrv_splitter.report import ScenarioCollector
+
+COLUMNS = [
+    "week",
+    "block",
+    "reverted",
+    "admin_fee_ybs",
+    "admin_fee_treasury",
+    "admin_fee_remainder",
+    "vote_incentive_ybs",
+    "vote_incentive_treasury",
+    "vote_incentive_remainder",
+    "admin_fee_paid",
+    "vote_incentive_paid",
+]
+
+
+def main():
+    start_block = int(os.environ["START_BLOCK"])
+    cache_path = Path(os.environ.get("BACKFILL_CACHE", ".cache/backfill.sqlite"))
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    backfill = Backfill(
+        os.environ["SPLITTER"], cache=BackfillCache(cache_path), start_block=start_block
+    )
+    records = backfill.run(chain.blocks[start_block].timestamp)
+
+    collector = ScenarioCollector(COLUMNS)
+    for r in records:
+        collector.append(
+            week=r.week,
+            block=r.block,
+            reverted=r.reverted,
+            **dict(zip(COLUMNS[3:6], r.admin_fee)),
+            **dict(zip(COLUMNS[6:9], r.vote_incentive)),
+            admin_fee_paid=r.admin_fee_paid,
+            vote_incentive_paid=r.vote_incentive_paid,
+        )
+    path = collector.export_csv(os.environ.get("BACKFILL_OUT", "reports/backfill.csv"))
+    print(f"Data exported to {path}")
@@ -0,0 +1,46 @@
+"""
+Deploy the splitter system against local mainnet stand-ins.
+
+    ape run deploy_local --network ethereum:local:foundry
+"""
+from ape import accounts, project
+
+from ycrv_splitter.stack import GOV, VOTES, deploy_mock_stack
+
+GUARDIAN = "0x4444AAAACDBa5580282365e25b16309Bd770ce4a"
+
+
+def main():
+    dev = accounts.test_accounts[0]
+    gov = accounts[GOV]
+    gov.balance += 10**18
+    stack = deploy_mock_stack(dev)
+
+    fee_burner = gov.deploy(project.FeeBurner, GUARDIAN)
+    receiver = dev.deploy(
+        project.Receiver, gov, GUARDIAN, gov, stack.reward_distributor
+    )
+    gauges = list(VOTES)
+    splitter = dev.deploy(
+        project.YCRVSplitter,
+        fee_burner,
+        receiver,
+        gauges[:1],  # yCRV
+        gauges[1:2],  # partner
+        gauges[2:4],  # discretionary
+    )
+    fee_burner.approveTokenSpender(splitter, sender=gov)
+    fee_burner.giveTokenAllowance(splitter, [stack.crvusd], sender=gov)
+
+    strategy_proxy = gov.deploy(project.StrategyProxy, splitter)
+    stack.voter.setStrategy(strategy_proxy, sender=gov)
+    lens = dev.deploy(project.SplitterLens, splitter)
+
+    for name, contract in (
+        ("FeeBurner", fee_burner),
+        ("Receiver", receiver),
+        ("YCRVSplitter", splitter),
+        ("StrategyProxy", strategy_proxy),
+        ("SplitterLens", lens),
+    ):
+        print(f"{name}: {contract.address}")
@@ -0,0 +1,41 @@
+"""
+Sync the local event index and print the recent payout shares.
+
+    SPLITTER=0x... START_BLOCK=19000000 ape run index_events --network ethereum:mainnet:alchemy
+
+The fee burner, receiver (the ybs recipient) and its distributor are read
+from the splitter. Events are stored in EVENT_INDEX (default
+.cache/events.sqlite); each run only fetches blocks added since the last one.
+WEEKS (default 26) sets the window for the printed shares.
+"""
+import os
+from pathlib import Path
+
+from ape import project
+
+from ycrv_splitter.indexer import SPLIT_RECIPIENTS, Indexer
+
+
+def main():
+    splitter = project.YCRVSplitter.at(os.environ["SPLITTER"])
+    receiver = project.Receiver.at(splitter.recipients().ybs)
+    path = Path(os.environ.get("EVENT_INDEX", ".cache/events.sqlite"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    weeks = int(os.environ.get("WEEKS", 26))
+
+    contracts = {
+        "splitter": splitter.address,
+        "fee_burner": splitter.FEE_BURNER(),
+        "receiver": receiver.address,
+        "distributor": receiver.DISTRIBUTOR(),
+    }
+    index = Indexer(
+        path,
+        contracts,
+        splitter.REWARD_TOKEN(),
+        start_block=int(os.environ.get("START_BLOCK", 0)),
+    )
+    print(f"Indexed {index.sync()} new rows up to block {index.synced_to}")
+    for recipient in SPLIT_RECIPIENTS:
+        share = index.share(recipient, weeks=weeks)
+        print(f"{recipient} share over the last {weeks} weeks: {share:.2%}")
@@ -0,0 +1,50 @@
+"""
+Run the weekly keeper until interrupted.
+
+    KEEPER_ACCOUNT=keeper SPLITTER=0x... STRATEGY_PROXY=0x... \
+        ape run keeper --network ethereum:mainnet:alchemy
+
+The keeper account must be an approved split caller on the splitter.
+POLL_INTERVAL (seconds, default 60) sets how often state is re-read between
+epochs. MIN_DEPOSIT (reward token wei, default 10**18) is the smallest receiver
+balance worth a depositRewards transaction. Against `ethereum:local:foundry`
+the mock stand-ins deployed by deploy_local are used for the external contracts.
+"""
+import asyncio
+import logging
+import os
+
+from ape import Contract, accounts, chain, project
+
+from ycrv_splitter.keeper import MIN_DEPOSIT, ApeBackend, Keeper
+
+
+def external(container, address):
+    # Local nodes run the etched stand-ins; elsewhere use the verified ABI.
+    if chain.provider.network.name == "local":
+        return container.at(address)
+    return Contract(address)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    sender = accounts.load(os.environ["KEEPER_ACCOUNT"])
+    sender.set_autosign(True)
+    splitter = project.YCRVSplitter.at(os.environ["SPLITTER"])
+    proxy = project.StrategyProxy.at(os.environ["STRATEGY_PROXY"])
+    receiver = project.Receiver.at(splitter.recipients().ybs)
+    backend = ApeBackend(
+        splitter,
+        proxy,
+        external(project.MockFeeDistributor, proxy.feeDistribution()),
+        receiver,
+        external(project.MockERC20, splitter.CRVUSD()),
+        external(project.MockVault, splitter.REWARD_TOKEN()),
+        sender,
+    )
+    keeper = Keeper(
+        backend,
+        poll_interval=float(os.environ.get("POLL_INTERVAL", 60)),
+        min_deposit=int(os.environ.get("MIN_DEPOSIT", MIN_DEPOSIT)),
+    )
+    asyncio.run(keeper.run_forever())
@@ -0,0 +1,29 @@
+"""
+Print where a transaction's gas went and write a folded-stack file.
+
+    TX=0x... ape run profile_tx --network ethereum:mainnet-fork:foundry
+
+The node must support ``debug_traceTransaction``, as anvil does. Without TX
+an ``executeSplit`` from the owner of the splitter at SPLITTER is run on the
+fork and profiled instead. The folded stacks go to GAS_PROFILE_OUT (default
+reports/gas/<tx>.folded), ready for flamegraph.pl or speedscope.
+"""
+import os
+
+from ape import accounts, project
+
+from ycrv_splitter.profiler import profile_transaction
+
+
+def main():
+    tx_hash = os.environ.get("TX")
+    if tx_hash is None:
+        splitter = project.YCRVSplitter.at(os.environ["SPLITTER"])
+        owner = accounts[splitter.owner()]
+        owner.balance += 10**18
+        tx_hash = splitter.executeSplit(sender=owner).txn_hash
+
+    profile = profile_transaction(tx_hash)
+    print(profile.summary())
+    out = os.environ.get("GAS_PROFILE_OUT", f"reports/gas/{profile.tx_hash}.folded")
+    print(f"Folded stacks written to {profile.write_folded(out)}")
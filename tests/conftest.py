@@ -1,10 +1,155 @@
 import pytest
 import ape
+from pathlib import Path
 from ape import chain, Contract
 from ape.utils import ZERO_ADDRESS
 
+from ycrv_splitter import stack
+from ycrv_splitter.gas import GasBaseline
+from ycrv_splitter.profiler import profile_transaction
+from ycrv_splitter.stack import deploy_mock_stack, mock_stack_at
+from ycrv_splitter.state_cache import StateCache, state_key
+
 DAY = 24 * 60 * 60
 WEEK = DAY * 7
+STATE_CACHE = Path(__file__).parent.parent / ".cache" / "state"
+CRVUSD_WHALE = "0xA920De414eA4Ab66b97dA1bFE9e6EcA7d4219635"
+CRV_WHALE = "0xF977814e90dA44bFA03b6295A0616a897441aceC"  # also holds SPELL
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        help="Write measured gas to tests/gas_baseline.json instead of checking it.",
+    )
+    parser.addoption(
+        "--gas-tolerance",
+        type=float,
+        default=0.02,
+        help="Allowed gas increase over the baseline before failing (0.02 = 2%%).",
+    )
+    parser.addoption(
+        "--rebuild-state-cache",
+        action="store_true",
+        help="Redeploy the local system and overwrite its cached state.",
+    )
+    parser.addoption(
+        "--gas-profile-dir",
+        default=None,
+        help="Write a folded-stack file for every transaction passed to gas_profile.",
+    )
+
+
+def network_key():
+    # Gas and state are only comparable for the same network at the same fork block.
+    name = chain.provider.network.name
+    fork_block = getattr(chain.provider, "fork_block_number", None)
+    return name if fork_block is None else f"{name}@{fork_block}"
+
+
+@pytest.fixture(scope="session")
+def gas_benchmark(request):
+    baseline = GasBaseline(
+        Path(__file__).parent / "gas_baseline.json",
+        network_key(),
+        tolerance=request.config.getoption("--gas-tolerance"),
+        update=request.config.getoption("--update-gas-baseline"),
+    )
+    yield baseline
+    baseline.save()
+    print(f"\n{baseline.report()}")
+
+
+@pytest.fixture
+def gas_profile(request):
+    """Call with a receipt to print its gas breakdown (``-s`` to see it)."""
+    out = request.config.getoption("--gas-profile-dir")
+    profiled = []
+
+    def profile(tx):
+        result = profile_transaction(tx.txn_hash)
+        print(f"\n{result.summary()}")
+        if out:
+            name = "".join(c if c.isalnum() else "_" for c in request.node.name)
+            result.write_folded(Path(out) / f"{name}-{len(profiled)}.folded")
+        profiled.append(result)
+        return result
+
+    yield profile
+
+
+@pytest.fixture(scope="session")
+def deployment(request, project, dev, gov, ylockers_ms):
+    """Addresses of the local deployment, restored from the state cache if possible.
+
+    On a local node the mock stack, the splitter system and the whale balances
+    are set up together once, and later sessions load the dumped state instead
+    (``--rebuild-state-cache`` forces a fresh setup). The key includes the
+    current week so time-dependent mock state matches a fresh deploy. Forks
+    get None: their fixtures deploy lazily against the upstream state.
+    """
+    if chain.provider.network.is_fork:
+        yield None
+        return
+    key = state_key(
+        project.contracts,
+        __file__,
+        stack.__file__,
+        salt=chain.pending_timestamp // WEEK,
+    )
+    cache = StateCache(STATE_CACHE, key)
+    addresses = None
+    if not request.config.getoption("--rebuild-state-cache"):
+        addresses = cache.load()
+    if addresses is None:
+        addresses = deploy_local(project, dev, gov, ylockers_ms)
+        cache.save(addresses)
+    yield addresses
+
+
+def deploy_local(project, dev, gov, ylockers_ms):
+    mock_stack = deploy_mock_stack(dev)
+    fee_burner = deploy_fee_burner(project, gov, ylockers_ms)
+    receiver = deploy_receiver(
+        project, dev, gov, ylockers_ms, mock_stack.reward_distributor
+    )
+    splitter = deploy_splitter(
+        project, dev, gov, fee_burner, receiver, mock_stack.crvusd
+    )
+    mock_proxy = deploy_proxy(project, gov, splitter, mock_stack)
+    # Forks rely on whale balances; local stand-ins are minted up front.
+    for token, whale in (
+        (mock_stack.crvusd, CRVUSD_WHALE),
+        (mock_stack.crv, CRV_WHALE),
+        (mock_stack.spell, CRV_WHALE),
+    ):
+        token.mint(whale, 10_000_000 * 10**18, sender=dev)
+    return {
+        "reward_distributor": mock_stack.reward_distributor.address,
+        "fee_burner": fee_burner.address,
+        "receiver": receiver.address,
+        "splitter": splitter.address,
+        "mock_proxy": mock_proxy.address,
+    }
+
+
+# Mainnet dependencies. On a fork these are the live contracts; on a plain local
+# node (`--network ethereum:local:foundry`) they are mocks etched at the same
+# addresses, so every fixture below works unchanged on either network.
+@pytest.fixture(scope="session")
+def mock_stack(deployment):
+    if deployment is None:
+        yield None
+    else:
+        yield mock_stack_at(deployment["reward_distributor"])
+
+
+def mainnet_contract(mock_stack, name, address):
+    if mock_stack is None:
+        return Contract(address)
+    return getattr(mock_stack, name)
+
 
 # Accounts
 @pytest.fixture(scope="session")
@@ -34,19 +179,44 @@ def trade_factory(accounts):
 
 
 @pytest.fixture(scope="session")
-def fee_burner(project, gov, ylockers_ms, trade_factory):
+def fee_burner(project, gov, ylockers_ms, trade_factory, deployment):
+    if deployment is None:
+        yield deploy_fee_burner(project, gov, ylockers_ms)
+    else:
+        yield project.FeeBurner.at(deployment["fee_burner"])
+
+
+def deploy_fee_burner(project, gov, ylockers_ms):
     print(f"GOV: {gov}")
-    fee_burner = gov.deploy(project.FeeBurner, ylockers_ms)
-    yield fee_burner
+    return gov.deploy(project.FeeBurner, ylockers_ms)
 
 
 @pytest.fixture(scope="session")
-def receiver(project, gov, ylockers_ms, reward_distributor, dev):
-    yield dev.deploy(project.Receiver, gov, ylockers_ms, gov, reward_distributor)
+def swap_adapter(project, dev):
+    yield dev.deploy(project.MockSwapAdapter)
 
 
 @pytest.fixture(scope="session")
-def splitter(project, dev, fee_burner, receiver, gov, crvusd):
+def receiver(project, gov, ylockers_ms, reward_distributor, dev, deployment):
+    if deployment is None:
+        yield deploy_receiver(project, dev, gov, ylockers_ms, reward_distributor)
+    else:
+        yield project.Receiver.at(deployment["receiver"])
+
+
+def deploy_receiver(project, dev, gov, ylockers_ms, reward_distributor):
+    return dev.deploy(project.Receiver, gov, ylockers_ms, gov, reward_distributor)
+
+
+@pytest.fixture(scope="session")
+def splitter(project, dev, fee_burner, receiver, gov, crvusd, deployment):
+    if deployment is None:
+        yield deploy_splitter(project, dev, gov, fee_burner, receiver, crvusd)
+    else:
+        yield project.YCRVSplitter.at(deployment["splitter"])
+
+
+def deploy_splitter(project, dev, gov, fee_burner, receiver, crvusd):
     discretionary_gauges = [
         "0x05255C5BD33672b9FEA4129C13274D1E6193312d",  # YFI/ETH
         "0x138cC21D15b7A06F929Fc6CFC88d2b830796F4f1",  # ETH/yETH
@@ -70,57 +240,90 @@ def splitter(project, dev, fee_burner, receiver, gov, crvusd):
     fee_burner.approveTokenSpender(splitter, sender=gov)
     fee_burner.giveTokenAllowance(splitter, [crvusd], sender=gov)
 
-    yield splitter
+    return splitter
+
+
+@pytest.fixture(scope="session")
+def lens(project, dev, splitter):
+    yield dev.deploy(project.SplitterLens, splitter)
+
+
+@pytest.fixture(scope="session")
+def vote_tracker(project, dev, splitter):
+    # Deployed only; tests opt in with setVoteTracker on the splitter and proxy.
+    yield dev.deploy(project.VoteTracker, splitter)
 
 
 @pytest.fixture(scope="session")
-def mock_proxy(accounts, project, gov, fee_burner, splitter):
+def mock_proxy(accounts, project, gov, fee_burner, splitter, mock_stack, deployment):
+    if deployment is None:
+        yield deploy_proxy(project, gov, splitter, mock_stack)
+    else:
+        yield project.StrategyProxy.at(deployment["mock_proxy"])
+
+
+def deploy_proxy(project, gov, splitter, mock_stack):
     mock_proxy = gov.deploy(project.StrategyProxy, splitter)
-    voter = Contract(mock_proxy.proxy())
+    voter = mainnet_contract(mock_stack, "voter", mock_proxy.proxy())
     voter.setStrategy(mock_proxy, sender=gov)
     assert mock_proxy.adminFeeRecipient() == splitter.address
     # mock_proxy.setAdminFeeRecipient(fee_burner, sender=gov)
-    yield mock_proxy
+    return mock_proxy
 
 
 @pytest.fixture(scope="session")
-def reward_distributor():
-    yield Contract("0xB226c52EB411326CdB54824a88aBaFDAAfF16D3d")
+def reward_distributor(mock_stack):
+    yield mainnet_contract(
+        mock_stack, "reward_distributor", "0xB226c52EB411326CdB54824a88aBaFDAAfF16D3d"
+    )
 
 
 @pytest.fixture(scope="session")
-def crvusd():
-    yield Contract("0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E")
+def crvusd(mock_stack):
+    yield mainnet_contract(
+        mock_stack, "crvusd", "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
+    )
 
 
 @pytest.fixture(scope="session")
-def crv():
-    yield Contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
+def crv(mock_stack):
+    yield mainnet_contract(mock_stack, "crv", "0xD533a949740bb3306d119CC777fa900bA034cd52")
 
 
 @pytest.fixture(scope="session")
-def spell():
-    yield Contract("0x090185f2135308BaD17527004364eBcC2D37e5F6")
+def spell(mock_stack):
+    yield mainnet_contract(
+        mock_stack, "spell", "0x090185f2135308BaD17527004364eBcC2D37e5F6"
+    )
+
+
+@pytest.fixture(scope="session")
+def ycrv(splitter, mock_stack):
+    yield mainnet_contract(mock_stack, "ycrv", splitter.YCRV())
 
 
 @pytest.fixture(scope="session")
-def gauge_controller():
-    yield Contract("0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB")
+def gauge_controller(mock_stack):
+    yield mainnet_contract(
+        mock_stack, "gauge_controller", "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
+    )
 
 
 @pytest.fixture(scope="session")
-def yvcrvusd(splitter):
-    yield Contract(splitter.REWARD_TOKEN())
+def yvcrvusd(splitter, mock_stack):
+    yield mainnet_contract(mock_stack, "reward_token", splitter.REWARD_TOKEN())
 
 
 @pytest.fixture(scope="session")
-def reward_token(splitter):
-    yield Contract(splitter.REWARD_TOKEN())
+def reward_token(splitter, mock_stack):
+    yield mainnet_contract(mock_stack, "reward_token", splitter.REWARD_TOKEN())
 
 
 @pytest.fixture(scope="session")
-def new_fee_distributor():
-    yield Contract("0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914")
+def new_fee_distributor(mock_stack):
+    yield mainnet_contract(
+        mock_stack, "fee_distributor", "0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914"
+    )
 
 
 @pytest.fixture(scope="session")
@@ -131,22 +334,23 @@ def voter(splitter, accounts):
 
 
 @pytest.fixture(scope="session")
-def crvusd_whale(accounts):
-    whale = accounts["0xA920De414eA4Ab66b97dA1bFE9e6EcA7d4219635"]
+def crvusd_whale(accounts, mock_stack):
+    # Local balances are minted by deploy_local.
+    whale = accounts[CRVUSD_WHALE]
     whale.balance += 10**18
     yield whale
 
 
 @pytest.fixture(scope="session")
-def crv_whale(accounts):
-    whale = accounts["0xF977814e90dA44bFA03b6295A0616a897441aceC"]
+def crv_whale(accounts, mock_stack):
+    whale = accounts[CRV_WHALE]
     whale.balance += 10**18
     yield whale
 
 
 @pytest.fixture(scope="session")
-def spell_whale(accounts):
-    whale = accounts["0xF977814e90dA44bFA03b6295A0616a897441aceC"]
+def spell_whale(accounts, mock_stack):
+    whale = accounts[CRV_WHALE]
     whale.balance += 10**18
     yield whale
 
@@ -0,0 +1,270 @@
+from collections import Counter
+
+import pytest
+from ape import chain
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from ycrv_splitter.backfill import (
+    MULTICALL3,
+    WEEK,
+    Backfill,
+    BackfillCache,
+    Call,
+    find_block,
+)
+
+SPLITTER = "0xf4e55515952BdAb2aeB4010f777E802D61eB384f"
+VOTER = "0xF147b8125d2ef93FB6965Db97D6746952a133934"
+POOL = "0x99f5aCc8EC2Da2BC0771c32814EFF52b712de1E5"
+YCRV = "0xFCc5c47bE19d06BF83eB04298b026F81069ff65b"
+CONTROLLER = "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
+REWARD_TOKEN = "0x27B5739e22ad9033bcBf192059122d163b60349D"
+RECEIVER = "0x2e13f7644014F6E934E314F0371585845de7B986"
+TREASURY = "0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde"
+GAUGES = (
+    ["0xEEBC06d495c96E57542A6d829184A907A02ef602"],
+    ["0x6070fBD4E608ee5391189E7205d70cc4A274c017"],
+    ["0x05255C5BD33672b9FEA4129C13274D1E6193312d"],
+)
+START = 2_800 * WEEK
+BLOCK_TIME = 12 * 60 * 60  # two blocks a day keeps the fake chain small
+
+
+def topic(value) -> str:
+    if isinstance(value, str):
+        return "0x" + encode(["address"], [value]).hex()
+    return "0x" + keccak(text=value[0]).hex()
+
+
+def make_log(block, tx, index, address, topics, data):
+    return {
+        "address": address.lower(),
+        "topics": [topic(t) for t in topics],
+        "data": "0x" + encode(["uint256"] * len(data), data).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": "0x" + keccak(text=tx).hex(),
+    }
+
+
+def split_log(block, tx, index, amounts, event="VoteIncentiveSplit"):
+    return make_log(
+        block, tx, index, SPLITTER, [(f"{event}(uint256,uint256,uint256)",)], amounts
+    )
+
+
+def transfer_log(block, tx, index, receiver, value):
+    signature = ("Transfer(address,address,uint256)",)
+    return make_log(
+        block, tx, index, REWARD_TOKEN, [signature, SPLITTER, receiver], [value]
+    )
+
+
+def matches(query, log) -> bool:
+    addresses = query["address"]
+    if isinstance(addresses, str):
+        addresses = [addresses]
+    if log["address"] not in {a.lower() for a in addresses}:
+        return False
+    if not int(query["fromBlock"], 16) <= int(log["blockNumber"], 16):
+        return False
+    if not int(log["blockNumber"], 16) <= int(query["toBlock"], 16):
+        return False
+    for wanted, actual in zip(query["topics"], log["topics"]):
+        if wanted is not None and actual not in (
+            wanted if isinstance(wanted, list) else [wanted]
+        ):
+            return False
+    return True
+
+
+class FakeChain:
+    """Answers the JSON-RPC calls a backfill makes, counting each method."""
+
+    def __init__(self, blocks, multicall=False, get_gauges=True):
+        self.blocks = blocks
+        self.multicall = multicall
+        self.logs = []
+        self.requests = Counter()
+        self.views = {
+            (SPLITTER, "VOTER()"): lambda b, *_: (["address"], [VOTER]),
+            (SPLITTER, "POOL()"): lambda b, *_: (["address"], [POOL]),
+            (SPLITTER, "YCRV()"): lambda b, *_: (["address"], [YCRV]),
+            (SPLITTER, "GAUGE_CONTROLLER()"): lambda b, *_: (["address"], [CONTROLLER]),
+            (SPLITTER, "REWARD_TOKEN()"): lambda b, *_: (["address"], [REWARD_TOKEN]),
+            (SPLITTER, "yearnVeBalance()"): lambda b, *_: (["uint256"], [10**26]),
+            (SPLITTER, "ybsBalance()"): lambda b, *_: (["uint256"], [2 * 10**25 + b]),
+            (YCRV, "balanceOf(address)"): lambda b, *_: (["uint256"], [10**25]),
+            (YCRV, "totalSupply()"): lambda b, *_: (["uint256"], [5 * 10**25]),
+            (SPLITTER, "unmigrated()"): lambda b, *_: (["uint256"], [10**24]),
+            (SPLITTER, "ybsVoteIncentiveRatio()"): lambda b, *_: (["uint256"], [9 * 10**17]),
+            (SPLITTER, "onlyTokenized()"): lambda b, *_: (["bool"], [True]),
+            (CONTROLLER, "vote_user_slopes(address,address)"): lambda b, *_: (
+                ["uint256"] * 3,
+                [10**12, 5_000, START + 52 * WEEK],
+            ),
+        }
+        if get_gauges:
+            self.views[(SPLITTER, "getGauges()")] = lambda b, *_: (
+                ["address[]"] * 3,
+                list(GAUGES),
+            )
+        else:  # splitters before the packed gauge lists
+            for category, gauges in zip(("ycrv", "partner", "discretionary"), GAUGES):
+                self.views[(SPLITTER, f"{category}GaugesLength()")] = (
+                    lambda b, *_, n=len(gauges): (["uint256"], [n])
+                )
+                self.views[(SPLITTER, f"{category}Gauges(uint256)")] = (
+                    lambda b, i, gauges=gauges: (["address"], [gauges[i]])
+                )
+        self.selectors = {
+            (target, keccak(text=sig)[:4]): view for (target, sig), view in self.views.items()
+        }
+
+    def __call__(self, method, params):
+        self.requests[method] += 1
+        if method == "eth_blockNumber":
+            return hex(len(self.blocks) - 1)
+        if method == "eth_getBlockByNumber":
+            return {"timestamp": hex(self.blocks[int(params[0], 16)])}
+        if method == "eth_getCode":
+            return "0x6000" if self.multicall else "0x"
+        if method == "eth_getLogs":
+            (query,) = params
+            return [log for log in self.logs if matches(query, log)]
+        if method == "eth_call":
+            target = to_checksum_address(params[0]["to"])
+            data = bytes.fromhex(params[0]["data"][2:])
+            block = int(params[1], 16)
+            if target != MULTICALL3:
+                return "0x" + self.view(target, data, block).hex()
+            (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+            results = []
+            for t, _, d in calls:
+                try:
+                    results.append((True, self.view(t, d, block)))
+                except KeyError:
+                    results.append((False, b""))
+            return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+        raise NotImplementedError(method)
+
+    def view(self, target, data, block) -> bytes:
+        # Unknown selectors raise KeyError, i.e. the call reverts.
+        view = self.selectors[(to_checksum_address(target), data[:4])]
+        args = decode(["uint256"] * ((len(data) - 4) // 32), data[4:])
+        types, values = view(block, *args)
+        return encode(types, values)
+
+    def mine_week(self):
+        for _ in range(WEEK // BLOCK_TIME):
+            self.blocks.append(self.blocks[-1] + BLOCK_TIME)
+
+
+def test_find_block():
+    timestamps = [100, 112, 124, 124, 136]
+    assert find_block(124, timestamps.__getitem__, 0, 4) == 2
+    assert find_block(125, timestamps.__getitem__, 0, 4) == 4
+    assert find_block(0, timestamps.__getitem__, 3, 4) == 3
+    assert find_block(999, timestamps.__getitem__, 0, 4) == 4
+
+
+def test_call_encoding():
+    call = Call(YCRV, "balanceOf(address)", (POOL,))
+    data = call.calldata()
+    assert data[:4] == keccak(text="balanceOf(address)")[:4]
+    assert decode(["address"], data[4:]) == (POOL.lower(),)
+    assert call.decode(encode(["uint256"], [42])) == (42,)
+
+
+@pytest.mark.parametrize("multicall", [False, True])
+def test_backfill_is_incremental(tmp_path, multicall):
+    fake = FakeChain([START - 100 + i * BLOCK_TIME for i in range(3 * 14)], multicall)
+    cache = BackfillCache(tmp_path / "backfill.sqlite")
+    records = Backfill(SPLITTER, fake, cache).run(START)
+    assert [r.week for r in records] == [START, START + WEEK, START + 2 * WEEK]
+    for r in records:
+        assert fake.blocks[r.block] >= r.week > fake.blocks[r.block - 1]
+    assert [r.admin_fee_paid for r in records[:-1]] == [0, 0]
+    assert records[-1].admin_fee_paid is None  # current week still open
+    assert not any(r.reverted for r in records)
+    assert all(sum(r.admin_fee) == 10**18 for r in records)
+
+    # A re-run from a fresh process reads nothing it has already seen.
+    fake.requests.clear()
+    reopened = BackfillCache(tmp_path / "backfill.sqlite")
+    again = Backfill(SPLITTER, fake, reopened).run(START)
+    assert again == records
+    assert fake.requests["eth_call"] == 0
+
+    # Extending by a week reads one new state (8 scalars, then 3 gauges) plus
+    # the 5 constants once per process; Multicall3 batches each group.
+    fake.requests.clear()
+    fake.mine_week()
+    extended = Backfill(SPLITTER, fake, cache).run(START)
+    assert extended[:-2] == records[:-1]
+    assert len(extended) == 4
+    assert fake.requests["eth_call"] == (3 if multicall else 8 + 3 + 5)
+
+
+@pytest.mark.parametrize("multicall", [False, True])
+def test_backfill_without_get_gauges(tmp_path, multicall):
+    blocks = [START - 100 + i * BLOCK_TIME for i in range(2 * 14)]
+    expected = Backfill(SPLITTER, FakeChain(blocks, multicall)).run(START)
+    fake = FakeChain(blocks, multicall, get_gauges=False)
+    records = Backfill(SPLITTER, fake).run(START)
+    assert records == expected
+    assert not any(r.reverted for r in records)
+
+
+def test_backfill_payouts_across_event_layouts():
+    fake = FakeChain([START - 100 + i * BLOCK_TIME for i in range(2 * 14)])
+    fake.logs = [
+        # Older splitter: pays out first, then emits the remainder ratio; the
+        # remainder transfer sweeps the balance, rounding dust included.
+        transfer_log(3, "old", 4, RECEIVER, 600),
+        transfer_log(3, "old", 5, TREASURY, 300),
+        transfer_log(3, "old", 6, TREASURY, 101),
+        split_log(3, "old", 7, [600, 300, 10**17]),
+        # Older splitter with no remainder share: the field is zero.
+        transfer_log(4, "old-no-remainder", 4, RECEIVER, 700),
+        transfer_log(4, "old-no-remainder", 5, TREASURY, 300),
+        split_log(4, "old-no-remainder", 6, [700, 300, 0]),
+        # Current splitter: amounts first, transfers after.
+        split_log(5, "new", 3, [600, 300, 100], event="AdminFeeSplit"),
+        split_log(5, "new", 4, [600, 300, 100]),
+        transfer_log(5, "new", 5, RECEIVER, 1_200),
+        transfer_log(5, "new", 6, TREASURY, 800),
+    ]
+    records = Backfill(SPLITTER, fake).run(START)
+    assert records[0].vote_incentive_paid == 1_001 + 1_000 + 1_000
+    assert records[0].admin_fee_paid == 1_000
+
+
+def test_backfill_matches_splitter(
+    splitter, mock_proxy, fee_burner, crvusd, crvusd_whale, gov
+):
+    start_block = chain.blocks.head.number
+    start = chain.blocks.head.timestamp // WEEK * WEEK
+    amount = 100_000 * 10**18
+    crvusd.transfer(fee_burner, amount, sender=crvusd_whale)
+    tx = splitter.executeSplit(sender=gov)
+    paid = sum(
+        log.ybs + log.treasury + log.remainder
+        for log in tx.decode_logs(splitter.VoteIncentiveSplit)
+    )
+    for _ in range(2):
+        chain.pending_timestamp = chain.blocks.head.timestamp // WEEK * WEEK + WEEK + 60
+        chain.mine()
+
+    records = Backfill(splitter.address, start_block=start_block).run(start)
+    assert len(records) == 3
+    for record in records:
+        onchain = splitter.getSplits(block_id=record.block)
+        assert record.admin_fee == tuple(onchain.adminFeeSplits)
+        assert record.vote_incentive == tuple(onchain.voteIncentiveSplits)
+        assert tuple(record.base.values()) == tuple(
+            splitter.getBaseBalances(block_id=record.block)
+        )
+    assert records[0].vote_incentive_paid == paid > 0
+    assert records[1].vote_incentive_paid == 0
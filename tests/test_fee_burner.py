@@ -250,3 +250,106 @@ def test_fee_burner(
         spell.allowance(fee_burner, trade_factory) / PRECISION,
         "\n",
     )
+
+
+def test_fee_burner_bulk_allowances(
+    fee_burner, trade_factory, ylockers_ms, gov, dev, crv, crvusd, spell
+):
+    MAX = 2**256 - 1
+    other = dev.address
+    fee_burner.approveTokenSpender(trade_factory, sender=gov)
+    fee_burner.approveTokenSpender(other, sender=gov)
+
+    updates = [
+        (trade_factory, [crv, crvusd, spell], True),
+        (other, [crv, spell], True),
+    ]
+    with ape.reverts("revert: not approved"):
+        fee_burner.updateTokenAllowances(updates, sender=dev)
+    with ape.reverts("revert: unapproved spender"):
+        fee_burner.updateTokenAllowances(
+            [(ylockers_ms, [crv], True)], sender=ylockers_ms
+        )
+    fee_burner.updateTokenAllowances(updates, sender=ylockers_ms)
+    assert set(fee_burner.getSpenders(crv)) == {trade_factory.address, other}
+    assert trade_factory.address in fee_burner.getSpenders(crvusd)
+    assert spell.allowance(fee_burner, other) == MAX
+
+    # Matching allowances are not re-approved.
+    tx = fee_burner.updateTokenAllowances(updates, sender=ylockers_ms)
+    assert not tx.decode_logs(crv.Approval)
+
+    # Cut one token off from every spender in a single call.
+    with ape.reverts("revert: not approved"):
+        fee_burner.revokeTokenEverywhere(crv, sender=dev)
+    fee_burner.revokeTokenEverywhere(crv, sender=ylockers_ms)
+    assert fee_burner.getSpenders(crv) == []
+    assert crv.allowance(fee_burner, trade_factory) == 0
+    assert crv.allowance(fee_burner, other) == 0
+    assert set(fee_burner.getApprovals(trade_factory)) == {
+        crvusd.address,
+        spell.address,
+    }
+    assert fee_burner.isTokenSpender(trade_factory)
+
+    # Batch revokes and spender revocation keep both indexes in sync.
+    fee_burner.updateTokenAllowances([(other, [spell], False)], sender=gov)
+    assert fee_burner.getSpenders(spell) == [trade_factory.address]
+    fee_burner.revokeTokenSpender(trade_factory, sender=gov)
+    assert fee_burner.getSpenders(spell) == []
+    assert trade_factory.address not in fee_burner.getSpenders(crvusd)
+
+
+def test_fee_burner_convert_tokens(
+    fee_burner,
+    swap_adapter,
+    ylockers_ms,
+    gov,
+    dev,
+    crvusd,
+    crvusd_whale,
+    crv,
+    crv_whale,
+    spell,
+    spell_whale,
+):
+    crv.transfer(fee_burner, 10_000 * PRECISION, sender=crv_whale)
+    spell.transfer(fee_burner, 1_000_000 * PRECISION, sender=spell_whale)
+    crvusd.transfer(swap_adapter, 100_000 * PRECISION, sender=crvusd_whale)
+    swap_adapter.setRate(crv, PRECISION // 2, sender=dev)
+    swap_adapter.setRate(spell, PRECISION // 1_000, sender=dev)
+
+    crv_out = crv.balanceOf(fee_burner) // 2
+    spell_out = spell.balanceOf(fee_burner) // 1_000
+    conversions = [
+        (crv, swap_adapter, 0, crv_out),
+        (spell, swap_adapter, 0, spell_out),
+    ]
+    with ape.reverts("revert: unapproved adapter"):
+        fee_burner.convertTokens(conversions, sender=ylockers_ms)
+    with ape.reverts("revert: Ownable: caller is not the owner"):
+        fee_burner.setSwapAdapter(swap_adapter, True, sender=ylockers_ms)
+    fee_burner.setSwapAdapter(swap_adapter, True, sender=gov)
+
+    with ape.reverts("revert: not approved"):
+        fee_burner.convertTokens(conversions, sender=dev)
+    with ape.reverts():
+        fee_burner.convertTokens(
+            [(crv, swap_adapter, 0, crv_out + 1)], sender=ylockers_ms
+        )
+
+    # Every fee token is converted in one transaction.
+    crvusd_before = crvusd.balanceOf(fee_burner)
+    tx = fee_burner.convertTokens(conversions, sender=ylockers_ms)
+    assert tx.return_value == crv_out + spell_out
+    assert crvusd.balanceOf(fee_burner) == crvusd_before + crv_out + spell_out
+    assert crv.balanceOf(fee_burner) == 0
+    assert spell.balanceOf(fee_burner) == 0
+    converted = [
+        (log.token, log.amountOut) for log in tx.decode_logs(fee_burner.TokenConverted)
+    ]
+    assert converted == [(crv.address, crv_out), (spell.address, spell_out)]
+
+    # Nothing left to convert is a no-op.
+    tx = fee_burner.convertTokens(conversions, sender=ylockers_ms)
+    assert tx.return_value == 0
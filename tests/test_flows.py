@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from ycrv_splitter.flows import DUST, FlowReport, reports_from_logs
+
+CRVUSD = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
+YVCRVUSD = "0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F"
+SPLITTER = "0xf4e55515952BdAb2aeB4010f777E802D61eB384f"
+VOTER = "0xF147b8125d2ef93FB6965Db97D6746952a133934"
+TREASURY = "0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde"
+RECEIVER = "0x2e13f7644014F6E934E314F0371585845de7B986"
+ZERO = "0x0000000000000000000000000000000000000000"
+OTHER_TOKEN = "0x0000000000000000000000000000000000000001"
+
+
+def log(index, name, address, *args, tx="0x01", block=1):
+    return SimpleNamespace(
+        event_name=name,
+        contract_address=address,
+        event_arguments=dict(zip(("a", "b", "c"), args)),
+        transaction_hash=tx,
+        log_index=index,
+        block_number=block,
+    )
+
+
+def split_logs(leftover=0, tx="0x01", block=1):
+    return [
+        log(0, "Transfer", CRVUSD, VOTER, SPLITTER, 1_000, tx=tx, block=block),
+        log(1, "Transfer", CRVUSD, SPLITTER, YVCRVUSD, 1_000 - leftover, tx=tx, block=block),
+        log(2, "Transfer", YVCRVUSD, ZERO, SPLITTER, 1_000 - leftover, tx=tx, block=block),
+        log(3, "Transfer", YVCRVUSD, SPLITTER, RECEIVER, 700 - leftover, tx=tx, block=block),
+        log(4, "Transfer", YVCRVUSD, SPLITTER, TREASURY, 300, tx=tx, block=block),
+        log(5, "Transfer", OTHER_TOKEN, SPLITTER, TREASURY, 5, tx=tx, block=block),
+        log(6, "AdminFeeSplit", SPLITTER, 700, 300, 0, tx=tx, block=block),
+    ]
+
+
+def analyze(logs):
+    return reports_from_logs(logs, [CRVUSD, YVCRVUSD], SPLITTER)
+
+
+def test_conserved_split():
+    report = analyze(split_logs())["0x01"]
+    assert len(report.transfers) == 5  # untracked token ignored
+    assert report.split_total("AdminFeeSplit") == 1_000
+    net = report.net_flows()
+    assert net[CRVUSD][VOTER] == -1_000
+    assert net[YVCRVUSD][RECEIVER] == 700
+    assert net[YVCRVUSD][TREASURY] == 300
+    assert not report.violations([SPLITTER])
+    assert {r["label"] for r in report.rows()} >= {"Receiver", "Treasury", "yVoter"}
+
+
+def test_leftover_flagged():
+    report = analyze(split_logs(leftover=DUST + 1))["0x01"]
+    (violation,) = report.violations([SPLITTER])
+    assert violation == {"token": CRVUSD, "holder": SPLITTER, "net": DUST + 1}
+    assert not analyze(split_logs(leftover=DUST))["0x01"].violations([SPLITTER])
+
+
+def test_grouped_by_tx():
+    logs = split_logs(tx="0x02", block=2) + split_logs(tx="0x01", block=1)
+    reports = analyze(logs)
+    assert list(reports) == ["0x01", "0x02"]
+    combined = FlowReport.combine(reports.values())
+    assert combined.net_flows()[YVCRVUSD][RECEIVER] == 1_400
+    assert len(combined.to_dict()["splits"]) == 2
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from ycrv_splitter.gas import GasBaseline, GasRegression, MissingGasBaseline
+
+NETWORK = "local"
+NAME = "YCRVSplitter.executeSplit"
+
+
+@pytest.fixture
+def baseline_path(tmp_path):
+    path = tmp_path / "gas_baseline.json"
+    path.write_text(json.dumps({NETWORK: {NAME: {"both": 100_000}}}))
+    return path
+
+
+def test_check_tolerance_boundary(baseline_path):
+    baseline = GasBaseline(baseline_path, NETWORK, tolerance=0.02)
+    baseline.check(NAME, "both", 90_000)
+    baseline.check(NAME, "both", 102_000)
+    with pytest.raises(GasRegression, match="102,001"):
+        baseline.check(NAME, "both", 102_001)
+
+
+def test_check_missing_baseline(baseline_path):
+    baseline = GasBaseline(baseline_path, NETWORK)
+    with pytest.raises(MissingGasBaseline, match="--update-gas-baseline"):
+        baseline.check(NAME, "zero_fees", 50_000)
+    # Another network's numbers are not a baseline for this one.
+    with pytest.raises(MissingGasBaseline):
+        GasBaseline(baseline_path, "mainnet-fork@1").check(NAME, "both", 1)
+
+
+def test_recorded(baseline_path, tmp_path):
+    assert GasBaseline(baseline_path, NETWORK).recorded
+    assert not GasBaseline(baseline_path, "mainnet-fork@1").recorded
+    assert not GasBaseline(tmp_path / "missing.json", NETWORK).recorded
+
+
+def test_update_mode(baseline_path):
+    baseline = GasBaseline(baseline_path, NETWORK, update=True)
+    baseline.check(NAME, "both", 200_000)  # regressions are recorded, not raised
+    baseline.check(NAME, "zero_fees", 50_000)
+    baseline.save()
+    assert json.loads(baseline_path.read_text()) == {
+        NETWORK: {NAME: {"both": 200_000, "zero_fees": 50_000}}
+    }
+    assert "+100,000" in baseline.report()
+
+
+def test_save_without_update_is_a_no_op(baseline_path):
+    before = baseline_path.read_text()
+    baseline = GasBaseline(baseline_path, NETWORK)
+    baseline.check(NAME, "both", 100_000)
+    baseline.save()
+    assert baseline_path.read_text() == before
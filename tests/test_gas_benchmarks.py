@@ -0,0 +1,193 @@
+"""
+Gas benchmarks for keeper-facing functions.
+
+Each benchmark runs under every scenario and is checked against
+tests/gas_baseline.json. The benchmarks are skipped on a network with no
+baselines at all; once it has some, a scenario with no entry fails. Record
+new entries, or refresh them after an intended change, with:
+
+    ape test tests/test_gas_benchmarks.py --network ethereum:local:foundry --update-gas-baseline
+
+To see where the gas goes, add ``--gas-profile-dir reports/gas`` for one
+folded-stack file per benchmark.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from ycrv_splitter.stack import VOTES
+
+AMOUNT = 100_000 * 10**18
+MANUAL_ADMIN_FEE_SPLIT = (5 * 10**17, 0, 5 * 10**17)
+MANUAL_VOTE_INCENTIVE_SPLIT = (4 * 10**17, 3 * 10**17, 3 * 10**17)
+
+# "second_call" loads both fee types, runs the function once, then measures
+# an immediate repeat that should have nothing left to do.
+SCENARIOS = ["zero_fees", "admin_only", "incentives_only", "both", "second_call"]
+
+
+def has_admin_fees(scenario):
+    return scenario in ("admin_only", "both", "second_call")
+
+
+def has_vote_incentives(scenario):
+    return scenario in ("incentives_only", "both", "second_call")
+
+
+def load_fees(b, scenario, admin_fee_holder=None):
+    if has_admin_fees(scenario):
+        b.crvusd.transfer(admin_fee_holder or b.voter, AMOUNT, sender=b.crvusd_whale)
+    if has_vote_incentives(scenario):
+        b.crvusd.transfer(b.fee_burner, AMOUNT, sender=b.crvusd_whale)
+
+
+def load_checkpointed(b, scenario):
+    load_fees(b, scenario)
+    b.splitter.checkpointSplits(sender=b.gov)
+
+
+def load_vote_tracker(b, scenario):
+    load_fees(b, scenario)
+    b.splitter.setVoteTracker(b.vote_tracker, sender=b.gov)
+
+
+def load_deposit_ybs_rewards(b, scenario):
+    load_fees(b, scenario)
+    b.splitter.setDepositYbsRewards(True, sender=b.gov)
+
+
+def load_manual_admin_fees(b, scenario):
+    load_fees(b, scenario, admin_fee_holder=b.ylockers_ms)
+    b.crvusd.approve(b.splitter, 2**256 - 1, sender=b.ylockers_ms)
+
+
+def load_receiver(b, scenario):
+    load_fees(b, scenario)
+    b.splitter.executeSplit(sender=b.gov)
+
+
+def load_spender(b, scenario):
+    load_fees(b, scenario)
+    b.fee_burner.approveTokenSpender(b.trade_factory, sender=b.gov)
+
+
+def add_discretionary_gauge(b):
+    listed = set(b.splitter.getGauges().discretionary)
+    gauge = next(g for g in VOTES if g not in listed)
+    return b.splitter.addDiscretionaryGauge(gauge, sender=b.gov)
+
+
+def remove_discretionary_gauge(b):
+    gauge = b.splitter.discretionaryGauges(0)
+    return b.splitter.removeDiscretionaryGauge(gauge, sender=b.gov)
+
+
+def revoke_spender(b):
+    b.fee_burner.approveTokenSpender(b.trade_factory, sender=b.gov)
+    b.fee_burner.giveTokenAllowance(b.trade_factory, [b.crvusd], sender=b.gov)
+    return b.fee_burner.revokeTokenSpender(b.trade_factory, sender=b.gov)
+
+
+# name => (prepare, run)
+BENCHMARKS = {
+    "YCRVSplitter.executeSplit": (
+        load_fees,
+        lambda b: b.splitter.executeSplit(sender=b.gov),
+    ),
+    "YCRVSplitter.executeSplit[checkpointed]": (
+        load_checkpointed,
+        lambda b: b.splitter.executeSplit(sender=b.gov),
+    ),
+    "YCRVSplitter.executeSplit[vote_tracker]": (
+        load_vote_tracker,
+        lambda b: b.splitter.executeSplit(sender=b.gov),
+    ),
+    "YCRVSplitter.executeSplit[deposit_ybs_rewards]": (
+        load_deposit_ybs_rewards,
+        lambda b: b.splitter.executeSplit(sender=b.gov),
+    ),
+    "YCRVSplitter.checkpointSplits": (
+        load_fees,
+        lambda b: b.splitter.checkpointSplits(sender=b.gov),
+    ),
+    "YCRVSplitter.executeManualSplit": (
+        load_fees,
+        lambda b: b.splitter.executeManualSplit(
+            MANUAL_ADMIN_FEE_SPLIT, MANUAL_VOTE_INCENTIVE_SPLIT, sender=b.gov
+        ),
+    ),
+    "YCRVSplitter.depositAdminFeesAndSplit": (
+        load_manual_admin_fees,
+        lambda b: b.splitter.depositAdminFeesAndSplit(
+            b.crvusd.balanceOf(b.ylockers_ms), sender=b.ylockers_ms
+        ),
+    ),
+    # Single-gauge updates rewrite the whole gauge blob, all three lists.
+    "YCRVSplitter.addDiscretionaryGauge": (load_fees, add_discretionary_gauge),
+    "YCRVSplitter.removeDiscretionaryGauge": (load_fees, remove_discretionary_gauge),
+    "Receiver.depositRewards": (
+        load_receiver,
+        lambda b: b.receiver.depositRewards(sender=b.dev),
+    ),
+    "FeeBurner.giveTokenAllowance": (
+        load_spender,
+        lambda b: b.fee_burner.giveTokenAllowance(
+            b.trade_factory, [b.crvusd], sender=b.gov
+        ),
+    ),
+    "FeeBurner.revokeTokenSpender": (load_fees, revoke_spender),
+    "StrategyProxy.claimAdminFees": (
+        load_fees,
+        lambda b: b.mock_proxy.claimAdminFees(sender=b.splitter_account),
+    ),
+}
+
+
+@pytest.fixture
+def bench(
+    accounts,
+    splitter,
+    mock_proxy,
+    vote_tracker,
+    fee_burner,
+    receiver,
+    crvusd,
+    crvusd_whale,
+    voter,
+    gov,
+    ylockers_ms,
+    trade_factory,
+    dev,
+):
+    splitter_account = accounts[splitter.address]
+    splitter_account.balance += 10**18
+    yield SimpleNamespace(
+        splitter=splitter,
+        splitter_account=splitter_account,
+        mock_proxy=mock_proxy,
+        vote_tracker=vote_tracker,
+        fee_burner=fee_burner,
+        receiver=receiver,
+        crvusd=crvusd,
+        crvusd_whale=crvusd_whale,
+        voter=voter,
+        gov=gov,
+        ylockers_ms=ylockers_ms,
+        trade_factory=trade_factory,
+        dev=dev,
+    )
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_gas(name, scenario, bench, gas_benchmark, gas_profile, request):
+    if not (gas_benchmark.recorded or gas_benchmark.update):
+        pytest.skip(f"no gas baselines recorded for {gas_benchmark.network}")
+    prepare, run = BENCHMARKS[name]
+    prepare(bench, scenario)
+    tx = run(bench)
+    if scenario == "second_call":
+        tx = run(bench)
+    if request.config.getoption("--gas-profile-dir"):
+        gas_profile(tx)
+    gas_benchmark.check(name, scenario, tx.gas_used)
@@ -0,0 +1,240 @@
+from collections import Counter
+
+from ape import chain
+from eth_abi import encode
+from eth_utils import keccak
+
+from ycrv_splitter.indexer import WEEK, Indexer
+
+SPLITTER = "0xf4e55515952BdAb2aeB4010f777E802D61eB384f"
+FEE_BURNER = "0x1E2D8bA0A2e3f0ac6ffB6aE0A15bB7D6E7a2F6a7"
+REWARD_TOKEN = "0x27B5739e22ad9033bcBf192059122d163b60349D"
+GUARDIAN = "0x4444AAAACDBa5580282365e25b16309Bd770ce4a"
+START = 2_800 * WEEK
+BLOCK_TIME = 24 * 60 * 60
+
+
+def split_log(block, index, amounts, event="AdminFeeSplit"):
+    return {
+        "address": SPLITTER.lower(),
+        "topics": ["0x" + keccak(text=f"{event}(uint256,uint256,uint256)").hex()],
+        "data": "0x" + encode(["uint256"] * 3, amounts).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": "0x" + keccak(text=f"{block}:{index}").hex(),
+    }
+
+
+def transfer_log(block, index, receiver, value, split_index):
+    """A transfer in the same transaction as ``split_log(block, split_index, ...)``."""
+    return {
+        "address": REWARD_TOKEN.lower(),
+        "topics": [
+            "0x" + keccak(text="Transfer(address,address,uint256)").hex(),
+            "0x" + encode(["address"], [SPLITTER]).hex(),
+            "0x" + encode(["address"], [receiver]).hex(),
+        ],
+        "data": "0x" + encode(["uint256"], [value]).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": "0x" + keccak(text=f"{block}:{split_index}").hex(),
+    }
+
+
+def matches(log, query):
+    addresses = query["address"]
+    if isinstance(addresses, str):
+        addresses = [addresses]
+    if log["address"].lower() not in {a.lower() for a in addresses}:
+        return False
+    for topic, wanted in zip(log["topics"], query["topics"]):
+        if isinstance(wanted, str):
+            wanted = [wanted]
+        if wanted is not None and topic not in wanted:
+            return False
+    return True
+
+
+def guardian_log(block, address=FEE_BURNER):
+    return {
+        "address": address,
+        "topics": [
+            "0x" + keccak(text="GuardianSet(address)").hex(),
+            "0x" + encode(["address"], [GUARDIAN]).hex(),
+        ],
+        "data": "0x",
+        "blockNumber": hex(block),
+        "logIndex": "0x0",
+        "transactionHash": "0x" + keccak(text=f"{block}:guardian").hex(),
+    }
+
+
+class FakeChain:
+    """A chain of daily blocks whose hashes change when a fork is mined."""
+
+    def __init__(self, length):
+        self.fork = 0
+        self.timestamps = [START + i * BLOCK_TIME for i in range(length)]
+        self.hashes = [self.block_hash(i) for i in range(length)]
+        self.logs = []
+        self.requests = Counter()
+
+    def block_hash(self, number):
+        return "0x" + keccak(text=f"{self.fork}:{number}").hex()
+
+    def reorg(self, depth, logs):
+        self.fork += 1
+        for number in range(len(self.hashes) - depth, len(self.hashes)):
+            self.hashes[number] = self.block_hash(number)
+        fork_block = len(self.hashes) - depth
+        self.logs = [e for e in self.logs if int(e["blockNumber"], 16) < fork_block]
+        self.logs += logs
+
+    def __call__(self, method, params):
+        self.requests[method] += 1
+        if method == "eth_blockNumber":
+            return hex(len(self.hashes) - 1)
+        if method == "eth_getBlockByNumber":
+            number = int(params[0], 16)
+            return {
+                "hash": self.hashes[number],
+                "timestamp": hex(self.timestamps[number]),
+            }
+        if method == "eth_getLogs":
+            (query,) = params
+            start, stop = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+            return [
+                {**log, "blockHash": self.hashes[int(log["blockNumber"], 16)]}
+                for log in self.logs
+                if start <= int(log["blockNumber"], 16) <= stop and matches(log, query)
+            ]
+        raise NotImplementedError(method)
+
+
+def indexer(path, fake, **kwargs):
+    contracts = {"splitter": SPLITTER, "fee_burner": FEE_BURNER}
+    return Indexer(path, contracts, REWARD_TOKEN, fake, chunk_size=5, **kwargs)
+
+
+def test_indexer_sync_and_query(tmp_path):
+    fake = FakeChain(3 * 7)
+    fake.logs = [
+        split_log(1, 0, [60, 30, 10]),
+        split_log(1, 1, [5, 5, 0], "VoteIncentiveSplit"),
+        guardian_log(3),
+        guardian_log(4, REWARD_TOKEN),  # unknown address: skipped
+        split_log(8, 0, [80, 20, 0]),
+        split_log(15, 0, [0, 50, 50]),
+    ]
+    index = indexer(tmp_path / "events.sqlite", fake)
+    assert index.sync() == 4 * 3 + 1
+    # 21 blocks in chunks of 5, plus the payout transfers of the first chunk.
+    assert fake.requests["eth_getLogs"] == 6
+    assert index.synced_to == 20
+
+    assert index.latest_epoch() == START + 2 * WEEK
+    assert index.payouts_by_epoch() == {
+        START: {"ybs": 65, "treasury": 35, "remainder": 10},
+        START + WEEK: {"ybs": 80, "treasury": 20, "remainder": 0},
+        START + 2 * WEEK: {"ybs": 0, "treasury": 50, "remainder": 50},
+    }
+    assert index.share("treasury", weeks=2) == 70 / 200
+    assert index.share("ybs", event="AdminFeeSplit") == 140 / 300
+    (guardian,) = index.events(event="GuardianSet")
+    assert guardian["recipient"] == GUARDIAN
+    assert guardian["contract"] == "fee_burner"
+    recent = index.events(recipient="remainder", since_epoch=START + WEEK)
+    assert [row["block"] for row in recent] == [8, 15]
+    splits = index.events(event="AdminFeeSplit")
+    assert all(row["token"] == REWARD_TOKEN for row in splits)
+
+    # Nothing new: a re-sync from a fresh connection fetches no logs.
+    fake.requests.clear()
+    assert indexer(tmp_path / "events.sqlite", fake).sync() == 0
+    assert fake.requests["eth_getLogs"] == 0
+
+
+def test_indexer_reorg(tmp_path):
+    fake = FakeChain(20)
+    fake.logs = [split_log(2, 0, [1, 1, 1]), split_log(17, 0, [10, 0, 0])]
+    index = indexer(tmp_path / "events.sqlite", fake)
+    index.sync()
+
+    # The last 5 blocks are replaced; the split at 17 moves to 18 with new amounts.
+    fake.reorg(5, [split_log(18, 0, [0, 10, 0])])
+    index.sync()
+    assert [row["block"] for row in index.events(recipient="treasury")] == [2, 18]
+    assert index.payouts_by_epoch()[START + 2 * WEEK] == {
+        "ybs": 0,
+        "treasury": 10,
+        "remainder": 0,
+    }
+
+    # A reorg deeper than anything stored re-indexes from the start block.
+    fake.reorg(20, [split_log(2, 0, [2, 2, 2])])
+    index.sync()
+    assert index.payouts_by_epoch() == {
+        START: {"ybs": 2, "treasury": 2, "remainder": 2}
+    }
+
+
+def test_indexer_old_remainder_layout(tmp_path):
+    # Older splitters emit VoteIncentiveSplit after the transfers, with the
+    # remainder ratio in place of the amount swept right before the event.
+    fake = FakeChain(7)
+    fake.logs = [
+        transfer_log(1, 0, GUARDIAN, 5, split_index=3),
+        transfer_log(1, 1, GUARDIAN, 3, split_index=3),
+        transfer_log(1, 2, GUARDIAN, 1_234, split_index=3),
+        split_log(1, 3, [5, 3, 10**18], "VoteIncentiveSplit"),
+        transfer_log(2, 0, GUARDIAN, 7, split_index=1),
+        split_log(2, 1, [7, 0, 0], "VoteIncentiveSplit"),
+        split_log(3, 0, [4, 4, 2], "VoteIncentiveSplit"),
+    ]
+    index = indexer(tmp_path / "events.sqlite", fake)
+    assert index.sync() == 3 * 3
+    assert index.payouts_by_epoch() == {
+        START: {"ybs": 16, "treasury": 7, "remainder": 1_236}
+    }
+    old = index.events(recipient="remainder")[0]
+    assert old["amount"] == 1_234
+    assert old["args"]["remainder"] == 10**18
+
+
+def test_indexer_matches_splitter(
+    tmp_path,
+    splitter,
+    mock_proxy,
+    fee_burner,
+    receiver,
+    reward_distributor,
+    crvusd,
+    crvusd_whale,
+    gov,
+):
+    start_block = chain.blocks.head.number + 1
+    crvusd.transfer(fee_burner, 100_000 * 10**18, sender=crvusd_whale)
+    tx = splitter.executeSplit(sender=gov)
+    splitter.setGuardian(gov, sender=gov)
+
+    contracts = {
+        "splitter": splitter.address,
+        "fee_burner": fee_burner.address,
+        "receiver": receiver.address,
+        "distributor": reward_distributor.address,
+    }
+    index = Indexer(
+        tmp_path / "events.sqlite",
+        contracts,
+        splitter.REWARD_TOKEN(),
+        start_block=start_block,
+    )
+    index.sync()
+    (log,) = tx.decode_logs(splitter.VoteIncentiveSplit)
+    epoch = chain.blocks[tx.block_number].timestamp // WEEK * WEEK
+    assert index.payouts_by_epoch(event="VoteIncentiveSplit") == {
+        epoch: {"ybs": log.ybs, "treasury": log.treasury, "remainder": log.remainder}
+    }
+    (guardian,) = index.events(event="GuardianSet")
+    assert guardian["recipient"] == gov.address
+    assert guardian["block"] == chain.blocks.head.number
@@ -0,0 +1,164 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+from ape import chain
+
+from ycrv_splitter.keeper import (
+    CHECKPOINT_TOKEN,
+    DAY,
+    DEPOSIT_REWARDS,
+    EXECUTE_SPLIT,
+    MIN_DEPOSIT,
+    PRECISION,
+    WEEK,
+    ApeBackend,
+    Keeper,
+    KeeperError,
+    KeeperState,
+    next_action,
+)
+
+AMOUNT = 100_000 * 10**18
+EPOCH = 2_000 * WEEK
+LAST_WEEK = EPOCH - 2 * DAY  # distributor last checkpointed before the epoch
+
+IDLE = KeeperState(
+    timestamp=EPOCH + 3600,
+    can_claim=False,
+    last_token_time=EPOCH + 60,
+    can_checkpoint_token=True,
+    admin_fees=0,
+    vote_incentives=0,
+    receiver_rewards=0,
+    receiver_paused=False,
+)
+
+
+class FakeBackend:
+    """Applies each sent action to an in-memory state."""
+
+    def __init__(self, state, failures=0, failing_calls=()):
+        self.state = state
+        # Either the first ``failures`` simulations fail, or the listed ones.
+        self.failing_calls = set(failing_calls) or set(range(failures))
+        self.calls = 0
+        self.sent = []
+
+    async def read_state(self):
+        return self.state
+
+    async def simulate(self, action):
+        self.calls += 1
+        if self.calls - 1 in self.failing_calls:
+            raise RuntimeError("execution reverted")
+
+    async def send(self, action):
+        self.sent.append(action)
+        if action == CHECKPOINT_TOKEN:
+            self.state = replace(
+                self.state, last_token_time=self.state.timestamp, can_claim=True
+            )
+        elif action == EXECUTE_SPLIT:
+            self.state = replace(
+                self.state,
+                can_claim=False,
+                admin_fees=0,
+                vote_incentives=0,
+                receiver_rewards=self.state.receiver_rewards + AMOUNT,
+            )
+        elif action == DEPOSIT_REWARDS:
+            self.state = replace(self.state, receiver_rewards=0)
+
+
+def test_next_action():
+    assert next_action(IDLE) is None
+    new_epoch = replace(IDLE, last_token_time=LAST_WEEK)
+    assert next_action(new_epoch) == CHECKPOINT_TOKEN
+    # The distributor only allows a checkpoint once a day.
+    too_soon = replace(new_epoch, timestamp=EPOCH + 60, last_token_time=EPOCH - 60)
+    assert next_action(too_soon) is None
+    assert next_action(replace(new_epoch, can_checkpoint_token=False)) is None
+
+    assert next_action(replace(IDLE, can_claim=True)) == EXECUTE_SPLIT
+    assert next_action(replace(IDLE, vote_incentives=PRECISION)) is None
+    assert next_action(replace(IDLE, vote_incentives=PRECISION + 1)) == EXECUTE_SPLIT
+    assert next_action(replace(IDLE, admin_fees=PRECISION + 1)) == EXECUTE_SPLIT
+
+    # Dust stays in the receiver until it is worth a transaction.
+    dust = replace(IDLE, receiver_rewards=MIN_DEPOSIT - 1)
+    assert next_action(dust) is None
+    assert next_action(dust, min_deposit=1) == DEPOSIT_REWARDS
+    rewards = replace(IDLE, receiver_rewards=MIN_DEPOSIT)
+    assert next_action(rewards) == DEPOSIT_REWARDS
+    assert next_action(replace(rewards, receiver_paused=True)) is None
+
+
+def test_keeper_runs_sequence():
+    backend = FakeBackend(replace(IDLE, last_token_time=LAST_WEEK))
+    sent = asyncio.run(Keeper(backend, retry_delay=0).run_once())
+    assert sent == [CHECKPOINT_TOKEN, EXECUTE_SPLIT, DEPOSIT_REWARDS]
+    assert backend.sent == sent
+    assert next_action(backend.state) is None
+
+
+def test_keeper_retries():
+    backend = FakeBackend(replace(IDLE, can_claim=True), failures=2)
+    sent = asyncio.run(Keeper(backend, retries=2, retry_delay=0).run_once())
+    assert sent == [EXECUTE_SPLIT, DEPOSIT_REWARDS]
+
+    backend = FakeBackend(replace(IDLE, can_claim=True), failures=3)
+    with pytest.raises(KeeperError):
+        asyncio.run(Keeper(backend, retries=2, retry_delay=0).run_once())
+    assert backend.sent == []
+
+    # Each action gets the full retry budget.
+    backend = FakeBackend(replace(IDLE, can_claim=True), failing_calls=[0, 1, 3, 4])
+    sent = asyncio.run(Keeper(backend, retries=2, retry_delay=0).run_once())
+    assert sent == [EXECUTE_SPLIT, DEPOSIT_REWARDS]
+
+
+def test_keeper_skips_dust():
+    backend = FakeBackend(replace(IDLE, receiver_rewards=10))
+    assert asyncio.run(Keeper(backend).run_once()) == []
+    sent = asyncio.run(Keeper(backend, min_deposit=10).run_once())
+    assert sent == [DEPOSIT_REWARDS]
+
+
+def test_keeper_wakes_at_epoch():
+    keeper = Keeper(FakeBackend(replace(IDLE, timestamp=EPOCH + WEEK - 10)))
+    assert asyncio.run(keeper.delay()) == 10
+    assert asyncio.run(Keeper(FakeBackend(IDLE)).delay()) == 60
+
+
+def test_keeper_on_node(
+    splitter,
+    mock_proxy,
+    receiver,
+    new_fee_distributor,
+    fee_burner,
+    crvusd,
+    crvusd_whale,
+    reward_token,
+    curve_dao,
+    gov,
+    dev,
+):
+    splitter.setApprovedSplitCaller(dev, True, sender=gov)
+    crvusd.transfer(new_fee_distributor, AMOUNT, sender=crvusd_whale)
+    crvusd.transfer(fee_burner, AMOUNT, sender=crvusd_whale)
+    if not new_fee_distributor.can_checkpoint_token():
+        new_fee_distributor.toggle_allow_checkpoint_token(sender=curve_dao)
+
+    # A minute into the next epoch.
+    chain.pending_timestamp = chain.blocks.head.timestamp // WEEK * WEEK + WEEK + 60
+    chain.mine()
+
+    backend = ApeBackend(
+        splitter, mock_proxy, new_fee_distributor, receiver, crvusd, reward_token, dev
+    )
+    sent = asyncio.run(Keeper(backend, retry_delay=0).run_once())
+    assert sent == [CHECKPOINT_TOKEN, EXECUTE_SPLIT, DEPOSIT_REWARDS]
+    assert next_action(asyncio.run(backend.read_state())) is None
+    assert reward_token.balanceOf(receiver) == 0
+    assert crvusd.balanceOf(fee_burner) <= PRECISION
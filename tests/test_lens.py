@@ -0,0 +1,98 @@
+import ape
+
+from ycrv_splitter import model
+from ycrv_splitter.stack import UNVOTED_GAUGES, VOTES
+
+AMOUNT = 100_000 * 10**18
+
+
+def gauge_list(splitter, name):
+    length = getattr(splitter, f"{name}GaugesLength")()
+    return [getattr(splitter, f"{name}Gauges")(i) for i in range(length)]
+
+
+def test_lens_matches_splitter(lens, splitter, mock_proxy, gauge_controller):
+    state = lens.getState()
+
+    for name, votes in (
+        ("ycrv", state.ycrvGauges),
+        ("partner", state.partnerGauges),
+        ("discretionary", state.discretionaryGauges),
+    ):
+        assert [v.gauge for v in votes] == gauge_list(splitter, name)
+        assert sum(v.bias for v in votes) == splitter.sumGaugeBias(
+            [v.gauge for v in votes]
+        )
+        for v in votes:
+            slope = gauge_controller.vote_user_slopes(splitter.VOTER(), v.gauge)
+            assert (v.slope, v.end) == (slope.slope, slope.end)
+
+    assert not state.splitsReverted
+    assert tuple(state.base) == tuple(splitter.getBaseBalances())
+    splits = splitter.getSplits()
+    assert tuple(state.adminFeeSplits) == tuple(splits.adminFeeSplits)
+    assert tuple(state.voteIncentiveSplits) == tuple(splits.voteIncentiveSplits)
+    assert tuple(state.recipients) == tuple(splitter.recipients())
+    assert state.canClaim == mock_proxy.canClaim()
+    # No checkpoint yet: executeSplit would pay the live splits.
+    assert not state.splitsCheckpointed
+    assert tuple(state.payoutAdminFeeSplits) == tuple(splits.adminFeeSplits)
+    assert tuple(state.payoutVoteIncentiveSplits) == tuple(
+        splits.voteIncentiveSplits
+    )
+
+
+def test_lens_pending_fees(
+    lens, mock_proxy, fee_burner, crvusd, crvusd_whale, reward_token
+):
+    crvusd.transfer(fee_burner, AMOUNT, sender=crvusd_whale)
+    state = lens.getState()
+    assert state.pendingVoteIncentives == crvusd.balanceOf(fee_burner)
+    assert state.expectedShares == reward_token.previewDeposit(
+        state.pendingAdminFees + state.pendingVoteIncentives
+    )
+
+
+def test_lens_feeds_model(lens, splitter, mock_proxy, gauge_controller, ycrv):
+    state = model.load_state_from_lens(lens)
+    direct = model.load_state(splitter, gauge_controller, ycrv)
+    for field in ("ve_total", "ybs", "lp", "ycrv_supply", "unmigrated"):
+        assert list(getattr(state, field)) == list(getattr(direct, field))
+    result = model.get_splits(state)
+    onchain = splitter.getSplits()
+    assert list(result.admin_fee[0]) == list(onchain.adminFeeSplits)
+    assert list(result.vote_incentive[0]) == list(onchain.voteIncentiveSplits)
+
+
+def test_lens_ratio_revert(lens, splitter, mock_proxy, gauge_controller, voter, gov):
+    # All vote weight on one discretionary gauge: its bias at the week start
+    # exceeds the untokenized ve balance, so only the ratio step reverts.
+    for gauge in VOTES:
+        gauge_controller.vote_for_gauge_weights(gauge, 0, sender=voter)
+    gauge = UNVOTED_GAUGES[0]
+    splitter.setDiscretionaryGauges([gauge], sender=gov)
+    gauge_controller.vote_for_gauge_weights(gauge, 10_000, sender=voter)
+    base = splitter.getBaseBalances()
+    with ape.reverts():
+        splitter.getVoteIncentiveSplitRatios(base)
+
+    state = lens.getState()
+    assert state.splitsReverted
+    assert tuple(state.base) == tuple(base)
+    assert tuple(state.adminFeeSplits) == (0, 0, 0)
+    assert tuple(state.voteIncentiveSplits) == (0, 0, 0)
+    assert tuple(state.recipients) == tuple(splitter.recipients())
+
+
+def test_lens_checkpointed_splits(lens, splitter, gauge_controller, voter, gov):
+    splitter.checkpointSplits(sender=gov)
+    (_, admin_fee, vote_incentive) = splitter.getCheckpointedSplits()
+    # Votes move mid-week; the checkpoint still decides this week's payout.
+    gauge_controller.vote_for_gauge_weights(
+        splitter.partnerGauges(0), 0, sender=voter
+    )
+    state = lens.getState()
+    assert state.splitsCheckpointed
+    assert tuple(state.voteIncentiveSplits) != tuple(vote_incentive)
+    assert tuple(state.payoutAdminFeeSplits) == tuple(admin_fee)
+    assert tuple(state.payoutVoteIncentiveSplits) == tuple(vote_incentive)
@@ -0,0 +1,123 @@
+from ethpm_types import ContractType
+
+from ycrv_splitter.profiler import ContractInfo, build_profile, contract_info
+
+SPLITTER = "0xf4e55515952BdAb2aeB4010f777E802D61eB384f"
+CONTROLLER = "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
+ECRECOVER = "0x0000000000000000000000000000000000000001"
+
+LABELS = {
+    SPLITTER: ContractInfo(
+        "YCRVSplitter",
+        {"0xbd650b73": "executeSplit"},
+        jumps={12: "i", 52: "o"},
+        lines={10: "Splitter.sol:674"},
+    ),
+    CONTROLLER: ContractInfo("GaugeController", {"0xa4d1c5d2": "vote_user_slopes"}),
+}
+
+CALL_TRACE = {
+    "type": "CALL",
+    "to": SPLITTER.lower(),
+    "input": "0xbd650b73",
+    "gasUsed": hex(21_155),
+    "calls": [
+        {
+            "type": "STATICCALL",
+            "to": CONTROLLER.lower(),
+            "input": "0xa4d1c5d2" + "00" * 64,
+            "gasUsed": hex(100),
+        }
+    ],
+}
+
+
+def step(pc, op, gas, depth=1, stack=None):
+    return {"pc": pc, "op": op, "gas": gas, "depth": depth, "stack": stack}
+
+
+# A two-pass loop over pcs 10..30: an internal call into pcs 50..52, then a
+# call to the controller. Before it, a precompile call the tracer left out.
+STRUCT_LOGS = [
+    step(0, "PUSH1", 1010),
+    step(2, "STATICCALL", 1007, stack=[ECRECOVER, "0x1000"]),
+    step(10, "JUMPDEST", 997),
+    step(12, "JUMP", 996),
+    step(50, "ADD", 988),
+    step(52, "JUMP", 985),
+    step(14, "STATICCALL", 977, stack=[CONTROLLER.lower(), "0x1000"]),
+    step(0, "PUSH1", 900, depth=2),
+    step(2, "STOP", 897, depth=2),
+    step(15, "POP", 870),
+    step(30, "JUMPI", 868),
+    step(10, "JUMPDEST", 860),
+    step(30, "JUMPI", 855),
+    step(31, "STOP", 845),
+]
+
+
+def test_build_profile():
+    profile = build_profile(CALL_TRACE, STRUCT_LOGS, LABELS.get)
+    loop = "loop@Splitter.sol:674"
+    # Loop steps: 1 + 8 + 3 + 8 + (107 - 100) + 2 + 8 + 5 + 10
+    assert profile.folded() == {
+        "YCRVSplitter.executeSplit": 21_055 - 52,
+        f"YCRVSplitter.executeSplit;{loop}": 52,
+        f"YCRVSplitter.executeSplit;{loop};GaugeController.vote_user_slopes": 100,
+    }
+    assert sum(profile.folded().values()) == 21_155
+    assert profile.functions() == {
+        "YCRVSplitter.executeSplit": (1, 21_155, 21_055),
+        "GaugeController.vote_user_slopes": (1, 100, 100),
+    }
+    assert profile.loops() == {f"YCRVSplitter.executeSplit/{loop}": (1, 52)}
+    assert "GaugeController.vote_user_slopes" in profile.summary()
+
+
+def test_build_profile_without_labels(tmp_path):
+    # No source map: frames are named by address and selector, with no loops.
+    profile = build_profile(CALL_TRACE, STRUCT_LOGS)
+    assert profile.loops() == {}
+    assert profile.folded() == {
+        f"{SPLITTER[:10]}.0xbd650b73": 21_055,
+        f"{SPLITTER[:10]}.0xbd650b73;{CONTROLLER[:10]}.0xa4d1c5d2": 100,
+    }
+    path = profile.write_folded(tmp_path / "gas" / "split.folded")
+    assert path.read_text().splitlines()[0] == f"{SPLITTER[:10]}.0xbd650b73 21055"
+
+
+def test_contract_info():
+    contract_type = ContractType.model_validate(
+        {
+            "contractName": "Example",
+            "sourceId": "contracts/Example.sol",
+            "runtimeBytecode": {"bytecode": "0x6001600256"},  # PUSH1 PUSH1 JUMP
+            "sourcemap": "1:2:0:-;;:::i",
+            "pcmap": {"4": {"location": [7, 1, 7, 9]}},
+            "abi": [
+                {
+                    "type": "function",
+                    "name": "executeSplit",
+                    "stateMutability": "nonpayable",
+                    "inputs": [],
+                    "outputs": [],
+                }
+            ],
+        }
+    )
+    info = contract_info(contract_type)
+    assert info.name == "Example"
+    assert info.functions == {"0xbd650b73": "executeSplit"}
+    assert info.jumps == {0: "-", 2: "-", 4: "i"}
+    assert info.lines == {4: "Example.sol:7"}
+
+
+def test_profile_execute_split(
+    splitter, mock_proxy, fee_burner, crvusd, crvusd_whale, gov, gas_profile
+):
+    crvusd.transfer(fee_burner, 100_000 * 10**18, sender=crvusd_whale)
+    tx = splitter.executeSplit(sender=gov)
+    profile = gas_profile(tx)
+    assert profile.root.label == "YCRVSplitter.executeSplit"
+    assert profile.root.gas == tx.gas_used
+    assert any(f.address == mock_proxy.address for f in profile.root.walk())
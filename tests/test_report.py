@@ -0,0 +1,89 @@
+import csv
+import logging
+import sys
+
+import pytest
+
+from ycrv_splitter.report import ScenarioCollector
+
+COLUMNS = ["Scenarios", "Reverted", "Admin Fee % YBS"]
+DO_NOTHING = {"Scenarios": "DO NOTHING", "Reverted": False, "Admin Fee % YBS": 50.0}
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_append():
+    scenarios = ScenarioCollector(COLUMNS)
+    scenarios.append(**DO_NOTHING)
+    scenarios.append(Scenarios="EXIT ALL YCRV FROM YBS", Reverted=True)
+    assert len(scenarios) == 2
+    assert list(scenarios.rows()) == [
+        ("DO NOTHING", False, 50.0),
+        ("EXIT ALL YCRV FROM YBS", True, None),
+    ]
+
+
+def test_columns():
+    with pytest.raises(ValueError):
+        ScenarioCollector([])
+    with pytest.raises(ValueError):
+        ScenarioCollector(["Scenarios", "Scenarios"])
+    scenarios = ScenarioCollector(COLUMNS)
+    with pytest.raises(KeyError, match="Admin Fee % Leftover"):
+        scenarios.append(Scenarios="DO NOTHING", **{"Admin Fee % Leftover": 1.0})
+    assert len(scenarios) == 0
+
+
+def test_csv_round_trip(tmp_path):
+    scenarios = ScenarioCollector(COLUMNS)
+    scenarios.append(**DO_NOTHING)
+    path = scenarios.export_csv(tmp_path / "out" / "scenarios.csv")
+    assert read_csv(path) == [COLUMNS, ["DO NOTHING", "False", "50.0"]]
+
+
+def test_render(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    scenarios = ScenarioCollector(COLUMNS)
+    scenarios.append(**DO_NOTHING)
+    scenarios.append(Scenarios="EXIT", Reverted=True)
+    assert scenarios.render().splitlines() == [
+        " Scenarios  Reverted  Admin Fee % YBS",
+        "DO NOTHING     False             50.0",
+        "      EXIT      True                 ",
+    ]
+    path = scenarios.export_text(tmp_path / "scenarios.txt")
+    assert path.read_text() == scenarios.render() + "\n"
+    with pytest.raises(ImportError, match="pandas"):
+        scenarios.to_frame()
+
+
+def test_stream(tmp_path):
+    path = tmp_path / "data" / "scenarios.csv"
+    scenarios = ScenarioCollector(COLUMNS, stream_to=path)
+    assert scenarios.data is None
+    scenarios.append(**DO_NOTHING)
+    # Each row is on disk before the next one is recorded.
+    assert read_csv(path) == [COLUMNS, ["DO NOTHING", "False", "50.0"]]
+    scenarios.append(Scenarios="EXIT ALL YCRV FROM YBS", Reverted=True)
+    scenarios.close()
+    assert len(scenarios) == 2
+    assert scenarios.rows()[1] == ("EXIT ALL YCRV FROM YBS", "True", "")
+    copy = scenarios.export_csv(tmp_path / "copy.csv")
+    assert read_csv(copy) == read_csv(path)
+    with pytest.raises(ValueError, match="closed"):
+        scenarios.append(Scenarios="TOO LATE")
+
+
+def test_export_without_pyarrow(tmp_path, monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    scenarios = ScenarioCollector(COLUMNS)
+    scenarios.append(Scenarios="DO NOTHING")
+    with pytest.raises(ImportError, match="pyarrow"):
+        scenarios.export_parquet(tmp_path / "scenarios.parquet")
+    with caplog.at_level(logging.WARNING):
+        written = scenarios.export(tmp_path / "scenarios")
+    assert written == [tmp_path / "scenarios.csv", tmp_path / "scenarios.txt"]
+    assert "scenarios.parquet" in caplog.text
@@ -0,0 +1,49 @@
+import numpy as np
+
+from ycrv_splitter import model
+
+PRECISION = 10**18
+
+
+def assert_matches_chain(result, row, onchain):
+    assert not result.reverted[row]
+    assert list(result.admin_fee[row]) == list(onchain.adminFeeSplits)
+    assert list(result.vote_incentive[row]) == list(onchain.voteIncentiveSplits)
+
+
+def test_model_matches_get_splits(splitter, gauge_controller, ycrv):
+    state = model.load_state(splitter, gauge_controller, ycrv)
+    assert_matches_chain(model.get_splits(state), 0, splitter.getSplits())
+
+
+def test_model_matches_after_vote_changes(splitter, gauge_controller, ycrv, voter):
+    state = model.load_state(splitter, gauge_controller, ycrv)
+    partner_gauges = [
+        splitter.partnerGauges(i) for i in range(splitter.partnerGaugesLength())
+    ]
+    for g in partner_gauges:
+        gauge_controller.vote_for_gauge_weights(g, 0, sender=voter)
+
+    # The offline edit must describe exactly what the on-chain votes did.
+    after = model.load_state(splitter, gauge_controller, ycrv)
+    assert not after.partner_slopes.any()
+    assert np.array_equal(after.ycrv_slopes, state.ycrv_slopes)
+    assert np.array_equal(after.discretionary_slopes, state.discretionary_slopes)
+    assert_matches_chain(model.get_splits(after), 0, splitter.getSplits())
+
+
+def test_model_scenario_sweep(splitter, gauge_controller, ycrv):
+    n = 5_000
+    rng = np.random.default_rng(0)
+    batch = model.load_state(splitter, gauge_controller, ycrv).tile(n)
+    for slopes in (batch.ycrv_slopes, batch.partner_slopes, batch.discretionary_slopes):
+        scale = rng.integers(0, 3, size=slopes.shape)
+        slopes[:] = slopes * scale.astype(object)
+
+    result = model.get_splits(batch)
+    assert result.admin_fee.shape == (n, 3)
+    ok = ~result.reverted
+    assert ok.any()
+    assert (result.admin_fee[ok].sum(axis=1) == PRECISION).all()
+    assert (result.vote_incentive[ok].sum(axis=1) == PRECISION).all()
+
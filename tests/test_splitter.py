@@ -1,35 +1,23 @@
 from ape import chain, accounts, Contract
 import ape
-import pandas as pd
 from ape.utils import ZERO_ADDRESS
 
+from ycrv_splitter.flows import analyze_tx
+from ycrv_splitter.report import ScenarioCollector
+
 DAY = 24 * 60 * 60
 WEEK = DAY * 7
 
-df = pd.DataFrame(
-    columns=[
-        "Scenarios",
-        "Admin Fee % YBS",
-        "Admin Fee % Treasury",
-        "Admin Fee % Leftover",
-        "Vote Incentive % YBS",
-        "Vote Incentive % Treasury",
-        "Vote Incentive % Leftover",
-    ]
-)
-
-CONTRACT_NAMES = {
-    '0x794f80E899c772de9E326eC83cCfD8D94e208B49': '0x Splits',
-    '0x2e13f7644014F6E934E314F0371585845de7B986': 'Receiver',
-    '0xf4e55515952BdAb2aeB4010f777E802D61eB384f': 'Splitter',
-    '0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde': 'Treasury',
-    '0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E': 'crvUSD',
-    '0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F': 'yvcrvUSD',
-    '0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914': 'Curve Fee Distro',
-    '0x47C4f7534995a50B5fa13ee49852B212Ea7d23eE': 'yFee Burner',
-    '0x0000000000000000000000000000000000000000': 'ZERO_ADDRESS',
-    '0xF147b8125d2ef93FB6965Db97D6746952a133934': 'yVoter',
-}
+SCENARIO_COLUMNS = [
+    "Scenarios",
+    "Reverted",
+    "Admin Fee % YBS",
+    "Admin Fee % Treasury",
+    "Admin Fee % Leftover",
+    "Vote Incentive % YBS",
+    "Vote Incentive % Treasury",
+    "Vote Incentive % Leftover",
+]
 
 
 def test_splitter(
@@ -80,30 +68,12 @@ def test_splitter(
     gas = tx.gas_used
     ve = Contract('0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2')
     print(f'⛽⛽⛽⛽ 1 Execute Split: {gas:,}')
-    transfers = list(tx.decode_logs(crvusd.Transfer))
-    splits = list(tx.decode_logs(splitter.VoteIncentiveSplit))
-    splits = splits[0] if len(splits) > 0 else None
-    if not splits:
-        total_vote_incentives = 0
-    else:
-        total_vote_incentives = splits.ybs + splits.treasury + splits.remainder
-        total_vote_incentives /= 10**18
-    splits = list(tx.decode_logs(splitter.AdminFeeSplit))
-    splits = splits[0] if len(splits) > 0 else None
-    if not splits:
-        total_admin_fees = 0
-    else:
-        total_admin_fees = splits.ybs + splits.treasury + splits.remainder
-        total_admin_fees /= 10**18
+    flows = check_flows(tx, splitter, crvusd, yvcrvusd)
+    total_admin_fees = flows.split_total("AdminFeeSplit") / 10**18
+    total_vote_incentives = flows.split_total("VoteIncentiveSplit") / 10**18
     print(f"Admin Fees {total_admin_fees:,.2f}")
     print(f"Vote Incentives {total_vote_incentives:,.2f}")
-    for t in transfers:
-        print(
-            CONTRACT_NAMES.get(t.contract_address, t.contract_address), 
-            CONTRACT_NAMES.get(t.sender, t.sender), 
-            CONTRACT_NAMES.get(t.receiver, t.receiver), 
-            f"{t.value/10**18:,.2f}"
-        )
+    print(flows.describe())
 
     total_rewards = yvcrvusd.balanceOf(receiver)
 
@@ -126,14 +96,7 @@ def test_splitter(
     assert yvcrvusd.balanceOf(receiver) > amount / 2
     assert yvcrvusd.balanceOf(splitter) < 10  # Some dust may exist
 
-    transfers = list(tx.decode_logs(crvusd.Transfer))
-    for t in transfers:
-        print(
-            CONTRACT_NAMES.get(t.contract_address, t.contract_address), 
-            CONTRACT_NAMES.get(t.sender, t.sender), 
-            CONTRACT_NAMES.get(t.receiver, t.receiver), 
-            f"{t.value/10**18:,.2f}"
-        )
+    print(check_flows(tx, splitter, crvusd, yvcrvusd).describe())
     
     crvusd.transfer(voter, amount, sender=crvusd_whale)
     tx = splitter.executeSplit(sender=gov)
@@ -141,22 +104,14 @@ def test_splitter(
     print(f'⛽⛽⛽⛽ 3 executeSplit: {gas:,}')
     assert yvcrvusd.balanceOf(receiver) > amount / 2
     assert yvcrvusd.balanceOf(splitter) < 10  # Some dust may exist
-    transfers = list(tx.decode_logs(crvusd.Transfer))
-    for t in transfers:
-        print(
-            CONTRACT_NAMES.get(t.contract_address, t.contract_address), 
-            CONTRACT_NAMES.get(t.sender, t.sender), 
-            CONTRACT_NAMES.get(t.receiver, t.receiver), 
-            f"{t.value/10**18:,.2f}"
-        )
+    print(check_flows(tx, splitter, crvusd, yvcrvusd).describe())
 
     tx = splitter.executeSplit(sender=gov)
     gas = tx.gas_used
     print(f'⛽⛽⛽⛽ 4 executeSplit: {gas:,}')
     assert yvcrvusd.balanceOf(receiver) > amount / 2
     assert yvcrvusd.balanceOf(splitter) < 10  # Some dust may exist
-    transfers = list(tx.decode_logs(crvusd.Transfer))
-    assert len(transfers) == 0
+    assert not check_flows(tx, splitter, crvusd, yvcrvusd).transfers
 
 def test_allocation_scenarios(
     dev,
@@ -171,8 +126,12 @@ def test_allocation_scenarios(
     fee_burner,
     reward_token,
     gauge_controller,
+    ycrv,
 ):
     voter.balance += 10**18
+    # Rows go to disk as each scenario is recorded, so a crash part-way
+    # through still leaves the earlier results.
+    scenarios = ScenarioCollector(SCENARIO_COLUMNS, stream_to="data/test_scenarios.csv")
     snap = chain.snapshot()
     voted_gauges = [
         "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e",
@@ -201,7 +160,7 @@ def test_allocation_scenarios(
 
     title = f"DO NOTHING"
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
 
     title = f"REMOVE VOTES FOR YCRV GAUGES"
     num_ycrv = splitter.ycrvGaugesLength()
@@ -211,7 +170,7 @@ def test_allocation_scenarios(
             continue
         tx = gauge_controller.vote_for_gauge_weights(g, 0, sender=voter)
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
     chain.restore(snap)
     snap = chain.snapshot()
 
@@ -223,7 +182,7 @@ def test_allocation_scenarios(
             continue
         tx = gauge_controller.vote_for_gauge_weights(g, 0, sender=voter)
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
     chain.restore(snap)
     snap = chain.snapshot()
 
@@ -237,7 +196,7 @@ def test_allocation_scenarios(
         tx = gauge_controller.vote_for_gauge_weights(g, 0, sender=voter)
     title = f"REMOVE VOTES FOR DISCRETIONARY VOTES"
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
     chain.restore(snap)
     snap = chain.snapshot()
 
@@ -247,7 +206,7 @@ def test_allocation_scenarios(
         tx = gauge_controller.vote_for_gauge_weights(g, 0, sender=voter)
     title = f"REMOVE ALL VOTES EXCEPT DISCRETIONARY"
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
     chain.restore(snap)
     snap = chain.snapshot()
 
@@ -257,7 +216,7 @@ def test_allocation_scenarios(
 
     assert gauge_controller.vote_user_power(voter) == 0
     print_splits(title, splitter, splitter.getSplits())
-    append_to_dataframe(title, splitter, splitter.getSplits())
+    record_scenario(scenarios, title, splitter.getSplits())
 
     title = f"100% OF VOTE WEIGHT TO DISCRETIONARY"
     d = "0x36152AA234fcF97b5C14Fc6d4893fC0dA5328BD2"  # Randomly selected gauge
@@ -266,6 +225,7 @@ def test_allocation_scenarios(
     # Group bias will be greater than ve balance
     # Must advance to next week to avoid reverting on this edge case
     week_start = int(chain.pending_timestamp / WEEK) * WEEK
+    projected = splitter.getSplitsAt(week_start + WEEK)
     chain.pending_timestamp = week_start + WEEK
     chain.mine()
     try:
@@ -273,7 +233,9 @@ def test_allocation_scenarios(
     except:
         splits = "REVERT"
     print_splits(title, splitter, splits)
-    append_to_dataframe(title, splitter, splits)
+    record_scenario(scenarios, title, splits)
+    assert splits != "REVERT"
+    assert as_tuples(splits) == as_tuples(projected)
 
     # assert False
     # assert False
@@ -285,21 +247,18 @@ def test_allocation_scenarios(
 
     # Remove from stake
     title = f"EXIT ALL YCRV FROM YBS"
-    ybs = Contract("0xE9A115b77A1057C918F997c32663FdcE24FB873f")
-    ybs_account = accounts[ybs.address]
+    ybs_account = accounts[splitter.YBS()]
     ybs_account.balance += 10**18
-    token = Contract(ybs.stakeToken())
-    token.transfer(gov, token.balanceOf(ybs), sender=ybs_account)
+    ycrv.transfer(gov, ycrv.balanceOf(ybs_account), sender=ybs_account)
     try:
         splits = splitter.getSplits()
     except:
         splits = "REVERT"
     print_splits(title, splitter, splits)
-    append_to_dataframe(title, splitter, splits)
-    try:
-        export_to_csv("data/test_scenarios.csv")
-    except:
-        print("😅 No directory for data, probably means you're not wavey!")
+    record_scenario(scenarios, title, splits)
+    assert splits != "REVERT"
+    scenarios.close()
+    export_scenarios(scenarios, "data/test_scenarios")
 
 
 def print_splits(title, splitter, splits):
@@ -335,6 +294,161 @@ def test_add_invalid_gauge(splitter, gov):
         # Should revert due to unapproved by curve gov
         tx = splitter.setYCrvGauges(invalid_gauges, sender=gov)
 
+
+def test_get_splits_at(splitter):
+    now = chain.blocks.head.timestamp
+    assert as_tuples(splitter.getSplitsAt(now)) == onchain_splits(splitter)
+    gauges = list(splitter.getGauges().discretionary)
+    assert splitter.sumGaugeBiasAt(gauges, now) == splitter.sumGaugeBias(gauges)
+    with ape.reverts("Past timestamp"):
+        splitter.getSplitsAt(now - 1)
+
+    target = now // WEEK * WEEK + 3 * WEEK + DAY
+    projected = as_tuples(splitter.getSplitsAt(target))
+    projected_bias = splitter.sumGaugeBiasAt(gauges, target)
+
+    chain.pending_timestamp = target
+    chain.mine()
+    assert onchain_splits(splitter) == projected
+    assert splitter.sumGaugeBias(gauges) == projected_bias
+
+
+def test_deposit_ybs_rewards(
+    splitter, receiver, reward_distributor, yvcrvusd, fee_burner, gov, dev,
+    crvusd, crvusd_whale, ylockers_ms, mock_proxy,
+):
+    amount = 100_000 * 10**18
+    with ape.reverts("!Owner"):
+        splitter.setDepositYbsRewards(True, sender=dev)
+    splitter.setDepositYbsRewards(True, sender=gov)
+
+    # Payouts reach stakers without a separate depositRewards call.
+    crvusd.transfer(fee_burner, amount, sender=crvusd_whale)
+    tx = splitter.executeSplit(sender=gov)
+    assert yvcrvusd.balanceOf(receiver) == 0
+    deposited = tx.decode_logs(reward_distributor.RewardDeposited)
+    assert len(deposited) == 1
+    check_flows(tx, splitter, crvusd, yvcrvusd)
+
+    # A paused receiver keeps its payout and the split still succeeds.
+    receiver.setPaused(True, sender=ylockers_ms)
+    crvusd.transfer(fee_burner, amount, sender=crvusd_whale)
+    tx = splitter.executeSplit(sender=gov)
+    assert yvcrvusd.balanceOf(receiver) > 0
+    assert not tx.decode_logs(reward_distributor.RewardDeposited)
+
+
+def get_gauges(splitter):
+    return tuple(list(gauges) for gauges in splitter.getGauges())
+
+
+def test_gauge_storage(splitter, gov):
+    ycrv, partners, discretionary = get_gauges(splitter)
+    new_partners = [
+        "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e",
+        "0x85D44861D024CB7603Ba906F2Dc9569fC02083F6",
+        "0xF29FfF074f5cF755b55FbB3eb10A29203ac91EA2",
+    ]
+    splitter.setPartnerGauges(new_partners, sender=gov)
+
+    # Neighbouring lists survive a rewrite of the shared blob.
+    assert get_gauges(splitter) == (ycrv, new_partners, discretionary)
+    assert splitter.partnerGaugesLength() == len(new_partners)
+    assert [splitter.partnerGauges(i) for i in range(3)] == new_partners
+    assert splitter.ycrvGauges(0) == ycrv[0]
+    assert splitter.discretionaryGauges(1) == discretionary[1]
+    with ape.reverts():
+        splitter.partnerGauges(len(new_partners))
+
+    splitter.setPartnerGauges([], sender=gov)
+    assert get_gauges(splitter) == (ycrv, [], discretionary)
+    assert splitter.getPartnerVotes() == 0
+
+
+def checkpointed(splitter):
+    current, admin_fee, vote_incentive = splitter.getCheckpointedSplits()
+    return current, tuple(admin_fee), tuple(vote_incentive)
+
+
+def as_tuples(splits):
+    return tuple(splits.adminFeeSplits), tuple(splits.voteIncentiveSplits)
+
+
+def onchain_splits(splitter):
+    return as_tuples(splitter.getSplits())
+
+
+def test_checkpoint_splits(splitter, mock_proxy, gov, dev, gauge_controller, voter):
+    voter.balance += 10**18
+    assert not splitter.approvedSplitCallers(dev)
+    with ape.reverts():
+        splitter.checkpointSplits(sender=dev)
+    splitter.checkpointSplits(sender=gov)
+    current, *splits = checkpointed(splitter)
+    assert current
+    assert tuple(splits) == onchain_splits(splitter)
+
+    # Stored ratios hold for the rest of the week even as votes move.
+    for gauge in get_gauges(splitter)[1]:
+        gauge_controller.vote_for_gauge_weights(gauge, 0, sender=voter)
+    assert onchain_splits(splitter) != tuple(splits)
+    assert checkpointed(splitter) == (True, *splits)
+
+    # Config changes invalidate the checkpoint; execution then recomputes.
+    splitter.setOnlyTokenized(True, sender=gov)
+    assert not checkpointed(splitter)[0]
+    tx = splitter.executeSplit(sender=gov)
+    assert list(tx.decode_logs(splitter.SplitsCheckpointed))
+    assert checkpointed(splitter) == (True, *onchain_splits(splitter))
+    tx = splitter.executeSplit(sender=gov)
+    assert not list(tx.decode_logs(splitter.SplitsCheckpointed))
+
+    with ape.reverts("!Owner"):
+        splitter.clearSplitCheckpoint(sender=dev)
+    tx = splitter.clearSplitCheckpoint(sender=gov)
+    assert list(tx.decode_logs(splitter.SplitCheckpointCleared))
+    assert not checkpointed(splitter)[0]
+
+    splitter.checkpointSplits(sender=gov)
+    chain.pending_timestamp += WEEK
+    chain.mine()
+    assert not checkpointed(splitter)[0]
+
+
+def test_incremental_gauge_updates(splitter, gov, ylockers_ms, dev):
+    ycrv, partners, discretionary = get_gauges(splitter)
+    gauge = "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e"
+    assert splitter.gaugeLists(partners[0]) & 2
+
+    splitter.addPartnerGauge(gauge, sender=ylockers_ms)
+    assert get_gauges(splitter) == (ycrv, partners + [gauge], discretionary)
+    # Membership is per list; the same gauge may also be a yCRV gauge.
+    splitter.addYCrvGauge(gauge, sender=gov)
+    assert splitter.gaugeLists(gauge) == 128 | 2 | 1
+
+    with ape.reverts("Invalid gauge"):
+        splitter.addPartnerGauge(gauge, sender=gov)
+    with ape.reverts("Invalid gauge"):
+        splitter.addPartnerGauge(splitter.address, sender=gov)
+    with ape.reverts("!Admin"):
+        splitter.addPartnerGauge(gauge, sender=dev)
+
+    splitter.removePartnerGauge(partners[0], sender=gov)
+    assert get_gauges(splitter) == (
+        ycrv + [gauge],
+        partners[1:] + [gauge],
+        discretionary,
+    )
+    assert splitter.gaugeLists(partners[0]) == 128
+    with ape.reverts("Gauge not in list"):
+        splitter.removePartnerGauge(partners[0], sender=gov)
+
+    # A full set clears memberships that are no longer listed.
+    splitter.setPartnerGauges([partners[0]], sender=gov)
+    assert splitter.gaugeLists(gauge) == 128 | 1
+    splitter.addPartnerGauge(gauge, sender=gov)
+
+
 def test_change_roles (
     splitter,
     dev,
@@ -362,46 +476,48 @@ def test_change_roles (
     tx = splitter.setGuardian(ylockers_ms, sender=gov)
 
 
-def append_to_dataframe(title, splitter, splits):
-    global df  # Access the global DataFrame
-
+def record_scenario(scenarios, title, splits):
     if splits == "REVERT":
         print(f"🚨🚨🚨🚨🚨 REVERT ON {title}")
-        new_row_df = pd.DataFrame(
-            {
-                "Scenarios": [title],
-                "Admin Fee % YBS": ["🚨 Revert!"],
-                # Provide default values for other columns if they exist in df to ensure schema alignment
-            }
-        )
-    else:
-        admin_split = splits.adminFeeSplits
-        voteIncentive_split = splits.voteIncentiveSplits
-
-        # Creating a new DataFrame from data dictionary for the row
-        new_row_df = pd.DataFrame(
-            {
-                "Scenarios": [title],
-                "Admin Fee % YBS": [admin_split[0] / 1e16],
-                "Admin Fee % Treasury": [admin_split[1] / 1e16],
-                "Admin Fee % Leftover": [admin_split[2] / 1e16],
-                "Vote Incentive % YBS": [voteIncentive_split[0] / 1e16],
-                "Vote Incentive % Treasury": [voteIncentive_split[1] / 1e16],
-                "Vote Incentive % Leftover": [voteIncentive_split[2] / 1e16],
-            }
-        )
-
-    # Concatenate the new row dataframe to the existing dataframe
-    df = pd.concat([df, new_row_df], ignore_index=True)
-
-    # Optionally, print the DataFrame to see updated rows
-    print(df)
-
-
-def export_to_csv(file_path):
-    global df
-    df.to_csv(file_path, index=False)
-    print(f"Data exported to {file_path}")
+        scenarios.append(Scenarios=title, Reverted=True)
+        return
+    admin_split = splits.adminFeeSplits
+    voteIncentive_split = splits.voteIncentiveSplits
+    scenarios.append(
+        **{
+            "Scenarios": title,
+            "Reverted": False,
+            "Admin Fee % YBS": admin_split[0] / 1e16,
+            "Admin Fee % Treasury": admin_split[1] / 1e16,
+            "Admin Fee % Leftover": admin_split[2] / 1e16,
+            "Vote Incentive % YBS": voteIncentive_split[0] / 1e16,
+            "Vote Incentive % Treasury": voteIncentive_split[1] / 1e16,
+            "Vote Incentive % Leftover": voteIncentive_split[2] / 1e16,
+        }
+    )
+
+
+def check_flows(tx, splitter, *tokens):
+    """Decode a split tx and assert the splitter kept nothing beyond dust."""
+    flows = analyze_tx(tx, splitter, tokens)
+    assert not flows.violations([splitter.address])
+
+    # Split events report amounts, paid with one transfer per recipient.
+    payouts = [
+        t
+        for t in flows.transfers
+        if t.sender == splitter.address and t.token == splitter.REWARD_TOKEN()
+    ]
+    assert len({t.receiver for t in payouts}) == len(payouts)
+    assert sum(t.value for t in payouts) == flows.split_total(
+        "AdminFeeSplit"
+    ) + flows.split_total("VoteIncentiveSplit")
+    return flows
+
+
+def export_scenarios(scenarios, stem):
+    for path in scenarios.export(stem):
+        print(f"Data exported to {path}")
 
 def can_checkpoint(new_fee_distributor, ts):
     can = new_fee_distributor.can_checkpoint_token()
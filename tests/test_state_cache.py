@@ -0,0 +1,61 @@
+import os
+import time
+
+from ethpm_types import ContractType
+
+from ycrv_splitter.state_cache import TTL, StateCache, state_key
+
+
+def contract(bytecode):
+    return ContractType.model_validate(
+        {"contractName": "Example", "deploymentBytecode": {"bytecode": bytecode}}
+    )
+
+
+class FakeAnvil:
+    def __init__(self):
+        self.state = "0x1f8b01"
+        self.loaded = []
+
+    def __call__(self, method, params):
+        if method == "anvil_dumpState":
+            return self.state
+        if method == "anvil_loadState":
+            self.loaded.append(params[0])
+            return True
+        raise NotImplementedError(method)
+
+
+def test_state_key(tmp_path):
+    setup = tmp_path / "conftest.py"
+    setup.write_text("deploy()")
+    key = state_key({"Example": contract("0x6001")}, setup, salt=2_900)
+    assert key == state_key({"Example": contract("0x6001")}, setup, salt=2_900)
+    assert key != state_key({"Example": contract("0x6002")}, setup, salt=2_900)
+    assert key != state_key({"Example": contract("0x6001")}, setup, salt=2_901)
+    setup.write_text("deploy(); configure()")
+    assert key != state_key({"Example": contract("0x6001")}, setup, salt=2_900)
+
+
+def test_state_cache(tmp_path):
+    anvil = FakeAnvil()
+    cache = StateCache(tmp_path, "old", anvil)
+    assert cache.load() is None
+    cache.save({"splitter": "0x01"})
+
+    # A changed key misses. Writing it keeps recent entries, which another
+    # worker may still be reading, and removes expired ones.
+    anvil.state = "0x1f8b02"
+    cache = StateCache(tmp_path, "new", anvil)
+    assert cache.load() is None
+    cache.save({"splitter": "0x02"})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.json", "old.json"]
+    expired = time.time() - TTL - 1
+    os.utime(tmp_path / "old.json", (expired, expired))
+    (tmp_path / "gone.123.tmp").write_text("{")
+    os.utime(tmp_path / "gone.123.tmp", (expired, expired))
+    cache.save({"splitter": "0x02"})
+    assert [p.name for p in tmp_path.iterdir()] == ["new.json"]
+
+    assert StateCache(tmp_path, "new", anvil).load() == {"splitter": "0x02"}
+    assert anvil.loaded == ["0x1f8b02"]
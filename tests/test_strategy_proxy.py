@@ -0,0 +1,158 @@
+import ape
+import pytest
+from ape import accounts, chain
+
+DAY = 24 * 60 * 60
+WEEK = DAY * 7
+
+
+def test_claim_admin_fees_after_missed_weeks(
+    mock_proxy, splitter, new_fee_distributor, crvusd, top_up_curve_fee_distributor
+):
+    splitter_account = accounts[splitter.address]
+    splitter_account.balance += 10**18
+    voter = mock_proxy.proxy()
+
+    # Skip two weekly claims before fees arrive.
+    chain.pending_timestamp += 2 * WEEK
+    chain.mine()
+    top_up_curve_fee_distributor()  # sends crvUSD, checkpoints, advances 1 week
+
+    week_start = chain.blocks.head.timestamp // WEEK * WEEK
+    cursor = new_fee_distributor.time_cursor_of(voter)
+    assert mock_proxy.canClaim()
+    pending_weeks, claims = mock_proxy.previewClaim()
+    assert pending_weeks == (week_start - cursor) // WEEK >= 3
+    assert claims == 1
+
+    before = crvusd.balanceOf(splitter)
+    mock_proxy.claimAdminFees(sender=splitter_account)
+    assert crvusd.balanceOf(splitter) > before
+    assert new_fee_distributor.time_cursor_of(voter) == week_start
+
+    # Nothing left this week: the distributor is not called again.
+    assert not mock_proxy.canClaim()
+    assert mock_proxy.previewClaim() == (0, 0)
+    before = crvusd.balanceOf(splitter)
+    tx = mock_proxy.claimAdminFees(sender=splitter_account)
+    assert crvusd.balanceOf(splitter) == before
+    assert not tx.decode_logs(crvusd.Transfer)
+
+
+def test_batch_operations_require_strategy(mock_proxy, dev):
+    gauges = [
+        "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e",
+        "0x85D44861D024CB7603Ba906F2Dc9569fC02083F6",
+    ]
+    tokens = [mock_proxy.crv()] * 2
+    for gauge in gauges:
+        assert mock_proxy.strategies(gauge) != dev
+
+    with ape.reverts("!strategy"):
+        mock_proxy.harvestMany(gauges, sender=dev)
+    with ape.reverts("!strategy"):
+        mock_proxy.depositMany(gauges, tokens, sender=dev)
+    with ape.reverts("!strategy"):
+        mock_proxy.withdrawMany(gauges, tokens, [0, 0], sender=dev)
+    with ape.reverts("!mismatch"):
+        mock_proxy.depositMany(gauges, tokens[:1], sender=dev)
+    with ape.reverts("!mismatch"):
+        mock_proxy.withdrawMany(gauges, tokens, [0], sender=dev)
+
+    # An empty batch mints nothing and transfers nothing.
+    tx = mock_proxy.harvestMany([], sender=dev)
+    assert tx.return_value == 0
+
+
+@pytest.mark.parametrize("count", [1, 8, 9])
+def test_batch_operations(count, project, mock_proxy, mock_stack, crv, gov, dev):
+    if mock_stack is None:
+        pytest.skip("needs mock gauges and minter; only possible on the local mocks")
+    voter = mock_proxy.proxy()
+    minter = mock_stack.minter
+    amounts = [(i + 1) * 10**18 for i in range(count)]
+    gauges, tokens = [], []
+    for i, amount in enumerate(amounts):
+        lp = dev.deploy(project.MockERC20, f"LP {i}", f"LP{i}")
+        gauge = dev.deploy(project.MockGauge, lp)
+        mock_proxy.approveStrategy(gauge, dev, sender=gov)
+        lp.mint(mock_proxy, amount, sender=dev)  # strategies send LPs first
+        gauges.append(gauge)
+        tokens.append(lp)
+
+    mock_proxy.depositMany(gauges, tokens, sender=dev)
+    for gauge, lp, amount in zip(gauges, tokens, amounts):
+        assert gauge.balanceOf(voter) == mock_proxy.balanceOf(gauge) == amount
+        assert lp.balanceOf(mock_proxy) == lp.balanceOf(voter) == 0
+
+    # Eight gauges per mint_many call; the last batch may be partial.
+    for gauge, amount in zip(gauges, amounts):
+        gauge.accrue(voter, amount, sender=dev)
+    calls, before = minter.mint_many_calls(), crv.balanceOf(dev)
+    tx = mock_proxy.harvestMany(gauges, sender=dev)
+    assert minter.mint_many_calls() - calls == (count + 7) // 8
+    minted = tx.decode_logs(minter.Minted)
+    assert [log.gauge for log in minted] == [g.address for g in gauges]
+    assert tx.return_value == sum(amounts)
+    assert crv.balanceOf(dev) - before == sum(amounts)
+    assert crv.balanceOf(voter) == 0
+    # Nothing new earned: nothing minted or sent.
+    assert mock_proxy.harvestMany(gauges, sender=dev).return_value == 0
+
+    halves = [amount // 2 for amount in amounts]
+    tx = mock_proxy.withdrawMany(gauges, tokens, halves, sender=dev)
+    assert list(tx.return_value) == halves
+    for gauge, lp, amount, half in zip(gauges, tokens, amounts, halves):
+        assert gauge.balanceOf(voter) == amount - half
+        assert lp.balanceOf(dev) == half
+    assert sum(mock_proxy.balanceOf(g) for g in gauges) == sum(amounts) - sum(halves)
+
+
+def test_claim_admin_fees_across_ve_epochs(
+    mock_proxy,
+    splitter,
+    new_fee_distributor,
+    crvusd,
+    top_up_curve_fee_distributor,
+    mock_stack,
+    dev,
+):
+    if mock_stack is None:
+        pytest.skip("needs extra veCRV epochs; only possible on the local mocks")
+    splitter_account = accounts[splitter.address]
+    splitter_account.balance += 10**18
+    voter = mock_proxy.proxy()
+    ve = mock_stack.ve
+
+    # Each lock update is a user epoch that costs the distributor an iteration.
+    slope, end = ve.get_last_user_slope(voter), ve.locked__end(voter)
+    for _ in range(5):
+        ve.setLock(voter, slope, end, sender=dev)
+    assert ve.user_point_epoch(voter) >= 6
+    # The distributor steps past an epoch once its cursor reaches it, so leave
+    # a full week between the epochs and the last claimable week.
+    chain.pending_timestamp += WEEK
+    chain.mine()
+    top_up_curve_fee_distributor()
+
+    # 48 pending weeks fit one claim by count, but not with the epochs on top.
+    week_start = chain.blocks.head.timestamp // WEEK * WEEK
+    new_fee_distributor.setTimeCursorOf(voter, week_start - 48 * WEEK, sender=dev)
+    assert mock_proxy.previewClaim() == (48, 1)
+
+    mock_proxy.claimAdminFees(sender=splitter_account)
+    assert new_fee_distributor.time_cursor_of(voter) == week_start
+    assert new_fee_distributor.user_epoch_of(voter) == ve.user_point_epoch(voter)
+    assert not mock_proxy.canClaim()
+
+
+def test_preview_claim_without_cursor(
+    mock_proxy, new_fee_distributor, top_up_curve_fee_distributor, mock_stack, dev
+):
+    if mock_stack is None:
+        pytest.skip("needs a reset fee distributor cursor; only on the local mocks")
+    top_up_curve_fee_distributor()
+    # A voter that never claimed: no cursor, so no meaningful week count.
+    new_fee_distributor.setTimeCursorOf(mock_proxy.proxy(), 0, sender=dev)
+    assert mock_proxy.canClaim()
+    assert mock_proxy.previewClaim() == (0, 1)
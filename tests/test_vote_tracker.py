@@ -0,0 +1,130 @@
+import pytest
+from ape import chain
+from ape.utils import ZERO_ADDRESS
+
+DAY = 24 * 60 * 60
+WEEK = DAY * 7
+GAUGE = "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e"
+
+
+@pytest.fixture
+def tracked(splitter, mock_proxy, vote_tracker, gov):
+    splitter.setVoteTracker(vote_tracker, sender=gov)
+    mock_proxy.setVoteTracker(vote_tracker, sender=gov)
+    yield vote_tracker
+
+
+def walked_votes(splitter):
+    return (
+        splitter.getYcrvVotes(),
+        splitter.getPartnerVotes(),
+        splitter.getDiscretionaryVotes(),
+    )
+
+
+def splits(splitter):
+    result = splitter.getSplits()
+    return tuple(result.adminFeeSplits), tuple(result.voteIncentiveSplits)
+
+
+def test_tracker_matches_gauge_walk(splitter, vote_tracker, gov):
+    before = splits(splitter)
+    splitter.setVoteTracker(vote_tracker, sender=gov)
+    assert tuple(vote_tracker.getVotes()) == walked_votes(splitter)
+    assert splits(splitter) == before
+
+    splitter.setVoteTracker(ZERO_ADDRESS, sender=gov)
+    assert splits(splitter) == before
+
+
+def test_tracker_follows_votes(
+    splitter, tracked, mock_proxy, gauge_controller, voter, gov, dev
+):
+    partner = splitter.partnerGauges(0)
+
+    # Votes cast around the proxy are picked up by a permissionless sync.
+    gauge_controller.vote_for_gauge_weights(partner, 0, sender=voter)
+    assert tuple(tracked.getVotes()) != walked_votes(splitter)
+    tracked.syncGauge(partner, sender=dev)
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+
+    # Votes through StrategyProxy sync automatically.
+    chain.pending_timestamp += 10 * DAY  # gauge controller vote delay
+    discretionary = splitter.discretionaryGauges(0)
+    tx = mock_proxy.vote(discretionary, 0, sender=gov)
+    synced = [log.gauge for log in tx.decode_logs(tracked.GaugeSynced)]
+    assert synced == [discretionary]
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+
+
+def test_vote_survives_tracker_failure(
+    splitter, mock_proxy, gauge_controller, voter, gov
+):
+    # The splitter has no syncGauge, so every sync reverts.
+    mock_proxy.setVoteTracker(splitter, sender=gov)
+    chain.pending_timestamp += 10 * DAY  # gauge controller vote delay
+    gauge = splitter.discretionaryGauges(0)
+    assert gauge_controller.vote_user_slopes(voter, gauge).power > 0
+    tx = mock_proxy.vote(gauge, 0, sender=gov)
+    (failed,) = tx.decode_logs(mock_proxy.VoteTrackerSyncFailed)
+    assert (failed.voteTracker, failed.gauge) == (splitter.address, gauge)
+    assert gauge_controller.vote_user_slopes(voter, gauge).power == 0
+
+
+def test_tracker_follows_list_changes(splitter, tracked, gov):
+    splitter.addPartnerGauge(GAUGE, sender=gov)
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+    splitter.addYCrvGauge(GAUGE, sender=gov)
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+    splitter.removePartnerGauge(GAUGE, sender=gov)
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+    splitter.setDiscretionaryGauges([GAUGE], sender=gov)
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
+    assert tracked.trackedGauges(GAUGE).lists == 1 | 4
+
+
+def test_tracker_catches_up_on_list_changes(splitter, vote_tracker, gov):
+    # List changes made while the tracker is unset reach it when it is set again.
+    splitter.setVoteTracker(vote_tracker, sender=gov)
+    partner = splitter.partnerGauges(0)
+    assert vote_tracker.countedGaugesLength() == 4
+    splitter.setVoteTracker(ZERO_ADDRESS, sender=gov)
+    splitter.removePartnerGauge(partner, sender=gov)
+    splitter.addDiscretionaryGauge(partner, sender=gov)
+    assert vote_tracker.trackedGauges(partner).lists == 2
+
+    splitter.setVoteTracker(vote_tracker, sender=gov)
+    assert vote_tracker.trackedGauges(partner).lists == 4
+    assert tuple(vote_tracker.getVotes()) == walked_votes(splitter)
+
+    splitter.setVoteTracker(ZERO_ADDRESS, sender=gov)
+    splitter.removeDiscretionaryGauge(partner, sender=gov)
+    splitter.setVoteTracker(vote_tracker, sender=gov)
+    assert vote_tracker.trackedGauges(partner).index == 0
+    counted = [vote_tracker.countedGauges(i) for i in range(3)]
+    assert partner not in counted
+    assert tuple(vote_tracker.getVotes()) == walked_votes(splitter)
+
+
+def test_tracker_expires_votes(
+    splitter, tracked, gauge_controller, voter, mock_stack, dev
+):
+    if mock_stack is None:
+        pytest.skip("needs a short veCRV lock; only possible on the local mocks")
+    week = chain.pending_timestamp // WEEK * WEEK
+    lock_end = week + 4 * WEEK
+    mock_stack.ve.setLock(voter, 10**18, lock_end, sender=dev)
+    # Re-cast each listed vote so its slope and end follow the short lock.
+    for gauge in [splitter.ycrvGauges(0), splitter.partnerGauges(0)]:
+        power = gauge_controller.vote_user_slopes(voter, gauge).power
+        gauge_controller.vote_for_gauge_weights(gauge, power, sender=voter)
+        tracked.syncGauge(gauge, sender=dev)
+
+    for _ in range(5):
+        assert tuple(tracked.getVotes()) == walked_votes(splitter)
+        chain.pending_timestamp += WEEK
+        chain.mine()
+    assert tracked.getVotes().ycrv == 0
+    tracked.checkpoint(sender=dev)
+    assert tracked.lastWeek() == chain.blocks.head.timestamp // WEEK * WEEK
+    assert tuple(tracked.getVotes()) == walked_votes(splitter)
@@ -0,0 +1 @@
+"""Off-chain tooling for the yCRV splitter contracts."""
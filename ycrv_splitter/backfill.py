@@ -0,0 +1,424 @@
+"""
+Week-by-week reconstruction of historical splits and payouts.
+
+For every epoch the backfill finds the first block of the week (binary search
+over block timestamps), reads everything ``YCRVSplitter.getSplits`` depends
+on at that block in two Multicall3 batches (scalars and gauge lists, then one
+``vote_user_slopes`` per gauge) and evaluates the splits with
+:mod:`ycrv_splitter.model`, so the formulas are the ones already checked
+against the contract. Splitters that predate ``getGauges`` are read through
+the per-list length and index getters instead, at two more batches. Payouts
+are the ``AdminFeeSplit``/``VoteIncentiveSplit`` events emitted between one
+epoch block and the next; for older splitters, whose ``VoteIncentiveSplit``
+carried the remainder ratio, the remainder comes from the payout transfer
+(see :func:`ycrv_splitter.flows.paid_split`).
+
+Block timestamps, epoch blocks, per-block states and per-range payouts are
+cached in SQLite keyed by block number, so re-running a backfill or extending
+it by a week only touches blocks it has not seen. Everything goes through a
+single ``rpc(method, params)`` callable; :func:`ycrv_splitter.rpc.ape_rpc`
+wraps the active ape provider.
+"""
+import json
+import sqlite3
+from dataclasses import asdict, dataclass
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from . import model
+from .flows import FlowReport, SplitEvent, Transfer, paid_split
+from .rpc import ape_rpc, as_bytes, as_hex, as_int
+
+WEEK = model.WEEK
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+CATEGORIES = ("ycrv", "partner", "discretionary")
+
+
+@dataclass(frozen=True)
+class Call:
+    target: str
+    signature: str
+    args: tuple = ()
+    returns: tuple = ("uint256",)
+
+    @property
+    def arg_types(self) -> list[str]:
+        inner = self.signature[self.signature.index("(") + 1 : -1]
+        return inner.split(",") if inner else []
+
+    def calldata(self) -> bytes:
+        selector = keccak(text=self.signature)[:4]
+        return selector + encode(self.arg_types, list(self.args))
+
+    def decode(self, data: bytes) -> tuple:
+        return decode(list(self.returns), data)
+
+
+class Multicall:
+    """Batches calls at a block through Multicall3's ``aggregate3``.
+
+    Falls back to one ``eth_call`` per call at blocks where Multicall3 has no
+    code (before its deployment, or on a plain local node). Failed calls come
+    back as None either way.
+    """
+
+    def __init__(self, rpc, address=MULTICALL3):
+        self.rpc = rpc
+        self.address = address
+        self._deployed: dict[int, bool] = {}
+
+    def deployed(self, block: int) -> bool:
+        if block not in self._deployed:
+            code = as_bytes(self.rpc("eth_getCode", [self.address, hex(block)]))
+            self._deployed[block] = len(code) > 0
+        return self._deployed[block]
+
+    def aggregate(self, calls, block: int) -> list:
+        if not calls:
+            return []
+        if not self.deployed(block):
+            return [self._call(call, block) for call in calls]
+        data = keccak(text="aggregate3((address,bool,bytes)[])")[:4] + encode(
+            ["(address,bool,bytes)[]"],
+            [[(call.target, True, call.calldata()) for call in calls]],
+        )
+        result = self.rpc("eth_call", [{"to": self.address, "data": as_hex(data)}, hex(block)])
+        (results,) = decode(["(bool,bytes)[]"], as_bytes(result))
+        return [
+            call.decode(returned) if success else None
+            for call, (success, returned) in zip(calls, results)
+        ]
+
+    def _call(self, call, block):
+        try:
+            result = self.rpc(
+                "eth_call",
+                [{"to": call.target, "data": as_hex(call.calldata())}, hex(block)],
+            )
+            return call.decode(as_bytes(result))
+        except Exception:
+            return None
+
+
+def find_block(timestamp: int, block_timestamp, lo: int, hi: int) -> int:
+    """First block in ``[lo, hi]`` whose timestamp is at least ``timestamp`` (``hi`` if none)."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if block_timestamp(mid) < timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class BackfillCache:
+    """SQLite store for everything the backfill reads, keyed by block."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, timestamp INTEGER);
+        CREATE TABLE IF NOT EXISTS epochs (
+            splitter TEXT, week INTEGER, block INTEGER, PRIMARY KEY (splitter, week)
+        );
+        CREATE TABLE IF NOT EXISTS states (
+            splitter TEXT, block INTEGER, state TEXT, PRIMARY KEY (splitter, block)
+        );
+        CREATE TABLE IF NOT EXISTS payouts (
+            splitter TEXT, start_block INTEGER, stop_block INTEGER, splits TEXT,
+            PRIMARY KEY (splitter, start_block, stop_block)
+        );
+    """
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(self.SCHEMA)
+
+    def get(self, table, column, **key):
+        where = " AND ".join(f"{name} = ?" for name in key)
+        row = self.db.execute(
+            f"SELECT {column} FROM {table} WHERE {where}", tuple(key.values())
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, table, **values):
+        columns = ", ".join(values)
+        marks = ", ".join("?" for _ in values)
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({marks})",
+            tuple(values.values()),
+        )
+        self.db.commit()
+
+
+@dataclass(frozen=True)
+class WeekRecord:
+    week: int
+    block: int
+    reverted: bool
+    admin_fee: tuple  # (ybs, treasury, remainder) ratios
+    vote_incentive: tuple
+    base: dict
+    # Split event totals until the next epoch block; None for the current week.
+    admin_fee_paid: int | None
+    vote_incentive_paid: int | None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class Backfill:
+    def __init__(self, splitter: str, rpc=ape_rpc, cache=None, start_block: int = 0):
+        self.splitter = to_checksum_address(splitter)
+        self.rpc = rpc
+        self.cache = cache if cache is not None else BackfillCache()
+        self.start_block = start_block
+        self.multicall = Multicall(rpc)
+        self._constants = None
+
+    # Blocks
+
+    def head(self) -> int:
+        return as_int(self.rpc("eth_blockNumber", []))
+
+    def block_timestamp(self, number: int) -> int:
+        timestamp = self.cache.get("blocks", "timestamp", number=number)
+        if timestamp is None:
+            block = self.rpc("eth_getBlockByNumber", [hex(number), False])
+            timestamp = as_int(block["timestamp"])
+            self.cache.put("blocks", number=number, timestamp=timestamp)
+        return timestamp
+
+    def epoch_blocks(self, weeks, head: int) -> list[int]:
+        """First block at or after each week start, never before ``start_block``."""
+        blocks, lo = [], self.start_block
+        for week in weeks:
+            block = self.cache.get("epochs", "block", splitter=self.splitter, week=week)
+            if block is None or block < lo:
+                block = find_block(week, self.block_timestamp, lo, head)
+                if self.block_timestamp(block) < week:
+                    raise ValueError(f"no block at or after {week} yet")
+                self.cache.put("epochs", splitter=self.splitter, week=week, block=block)
+            blocks.append(block)
+            lo = block
+        return blocks
+
+    # State
+
+    def constants(self) -> dict:
+        if self._constants is None:
+            calls = [
+                Call(self.splitter, f"{name}()", returns=("address",))
+                for name in ("VOTER", "POOL", "YCRV", "GAUGE_CONTROLLER", "REWARD_TOKEN")
+            ]
+            values = self.multicall.aggregate(calls, self.head())
+            self._constants = dict(
+                zip(
+                    ("voter", "pool", "ycrv", "controller", "reward_token"),
+                    (to_checksum_address(v[0]) for v in values),
+                )
+            )
+        return self._constants
+
+    def state_at(self, block: int) -> dict:
+        """Plain-int inputs of ``getSplits`` at ``block``, cached as JSON."""
+        cached = self.cache.get("states", "state", splitter=self.splitter, block=block)
+        if cached is not None:
+            return json.loads(cached)
+
+        c = self.constants()
+        scalars = {
+            "ve_total": Call(self.splitter, "yearnVeBalance()"),
+            "ybs": Call(self.splitter, "ybsBalance()"),
+            "lp": Call(c["ycrv"], "balanceOf(address)", (c["pool"],)),
+            "ycrv_supply": Call(c["ycrv"], "totalSupply()"),
+            "unmigrated": Call(self.splitter, "unmigrated()"),
+            "ybs_vote_incentive_ratio": Call(self.splitter, "ybsVoteIncentiveRatio()"),
+            "only_tokenized": Call(self.splitter, "onlyTokenized()", returns=("bool",)),
+            "gauges": Call(
+                self.splitter,
+                "getGauges()",
+                returns=("address[]", "address[]", "address[]"),
+            ),
+        }
+        values = self.multicall.aggregate(list(scalars.values()), block)
+        gauges = values.pop()
+        if gauges is None:
+            gauges = self.gauge_lists(block)
+        if gauges is None or any(v is None for v in values):
+            raise ValueError(f"splitter state not readable at block {block}")
+        state = {name: v[0] for name, v in zip(scalars, values)}
+        state["only_tokenized"] = int(state["only_tokenized"])
+
+        slope_calls = [
+            Call(
+                c["controller"],
+                "vote_user_slopes(address,address)",
+                (c["voter"], gauge),
+                ("uint256", "uint256", "uint256"),
+            )
+            for addresses in gauges
+            for gauge in addresses
+        ]
+        slopes = iter(self.multicall.aggregate(slope_calls, block))
+        for category, addresses in zip(CATEGORIES, gauges):
+            data = [next(slopes) for _ in addresses]
+            state[f"{category}_slopes"] = [d[0] for d in data]
+            state[f"{category}_ends"] = [d[2] for d in data]
+        state["timestamp"] = self.block_timestamp(block)
+
+        self.cache.put(
+            "states", splitter=self.splitter, block=block, state=json.dumps(state)
+        )
+        return state
+
+    def gauge_lists(self, block: int) -> tuple | None:
+        """Gauge lists one entry at a time, for splitters without ``getGauges``."""
+        lengths = self.multicall.aggregate(
+            [Call(self.splitter, f"{category}GaugesLength()") for category in CATEGORIES],
+            block,
+        )
+        if any(v is None for v in lengths):
+            return None
+        calls = [
+            Call(self.splitter, f"{category}Gauges(uint256)", (i,), ("address",))
+            for category, (length,) in zip(CATEGORIES, lengths)
+            for i in range(length)
+        ]
+        addresses = iter(self.multicall.aggregate(calls, block))
+        gauges = tuple([next(addresses) for _ in range(n)] for (n,) in lengths)
+        if any(a is None for category in gauges for a in category):
+            return None
+        return tuple([a[0] for a in category] for category in gauges)
+
+    # Payouts
+
+    def payouts(self, start_block: int, stop_block: int) -> FlowReport:
+        """Split events emitted in ``[start_block, stop_block]``."""
+        cached = self.cache.get(
+            "payouts",
+            "splits",
+            splitter=self.splitter,
+            start_block=start_block,
+            stop_block=stop_block,
+        )
+        if cached is None:
+            topics = {
+                as_hex(keccak(text=f"{name}(uint256,uint256,uint256)")): name
+                for name in ("AdminFeeSplit", "VoteIncentiveSplit")
+            }
+            logs = self.rpc(
+                "eth_getLogs",
+                [
+                    {
+                        "address": self.splitter,
+                        "topics": [list(topics)],
+                        "fromBlock": hex(start_block),
+                        "toBlock": hex(stop_block),
+                    }
+                ],
+            )
+            splits = [
+                SplitEvent(
+                    topics[as_hex(log["topics"][0])],
+                    *decode(["uint256"] * 3, as_bytes(log["data"])),
+                    as_hex(log["transactionHash"]),
+                    as_int(log["logIndex"]),
+                )
+                for log in logs
+            ]
+            if any(s.event == "VoteIncentiveSplit" for s in splits):
+                transfers = self.payout_transfers(start_block, stop_block)
+                splits = [paid_split(s, transfers) for s in splits]
+            cached = json.dumps([list(asdict(s).values()) for s in splits])
+            self.cache.put(
+                "payouts",
+                splitter=self.splitter,
+                start_block=start_block,
+                stop_block=stop_block,
+                splits=cached,
+            )
+        return FlowReport(splits=[SplitEvent(*s) for s in json.loads(cached)])
+
+    def payout_transfers(self, start_block: int, stop_block: int) -> dict:
+        """Reward token transfers out of the splitter, by ``(tx_hash, log_index)``."""
+        logs = self.rpc(
+            "eth_getLogs",
+            [
+                {
+                    "address": self.constants()["reward_token"],
+                    "topics": [
+                        as_hex(keccak(text="Transfer(address,address,uint256)")),
+                        as_hex(encode(["address"], [self.splitter])),
+                    ],
+                    "fromBlock": hex(start_block),
+                    "toBlock": hex(stop_block),
+                }
+            ],
+        )
+        transfers = {}
+        for log in logs:
+            tx_hash, log_index = as_hex(log["transactionHash"]), as_int(log["logIndex"])
+            (receiver,) = decode(["address"], as_bytes(log["topics"][2]))
+            (value,) = decode(["uint256"], as_bytes(log["data"]))
+            transfers[(tx_hash, log_index)] = Transfer(
+                to_checksum_address(log["address"]),
+                self.splitter,
+                to_checksum_address(receiver),
+                value,
+                tx_hash,
+                log_index,
+            )
+        return transfers
+
+    # Reconstruction
+
+    def run(self, start_week: int, stop_week: int | None = None) -> list[WeekRecord]:
+        """One record per epoch from ``start_week`` up to ``stop_week`` or the head."""
+        head = self.head()
+        head_week = self.block_timestamp(head) // WEEK * WEEK
+        last = head_week if stop_week is None else min(head_week, stop_week)
+        weeks = list(range(start_week // WEEK * WEEK, last + 1, WEEK))
+        if not weeks:
+            return []
+        blocks = self.epoch_blocks(weeks, head)
+        # Each week's payouts run until the next epoch block; the current week is open.
+        ends = blocks[1:]
+        ends.append(self.epoch_blocks([last + WEEK], head)[0] if last < head_week else None)
+
+        state = _stack([self.state_at(block) for block in blocks])
+        splits = model.get_splits(state)
+        base, _ = model.get_base_balances(state)
+        records = []
+        for i, (week, block, end) in enumerate(zip(weeks, blocks, ends)):
+            paid = (None, None)
+            if end is not None:
+                report = self.payouts(block, end - 1)
+                paid = (
+                    report.split_total("AdminFeeSplit"),
+                    report.split_total("VoteIncentiveSplit"),
+                )
+            records.append(
+                WeekRecord(
+                    week=week,
+                    block=block,
+                    reverted=bool(splits.reverted[i]),
+                    admin_fee=tuple(int(v) for v in splits.admin_fee[i]),
+                    vote_incentive=tuple(int(v) for v in splits.vote_incentive[i]),
+                    base={name: int(values[i]) for name, values in base.items()},
+                    admin_fee_paid=paid[0],
+                    vote_incentive_paid=paid[1],
+                )
+            )
+        return records
+
+
+def _stack(states) -> model.SplitterState:
+    """Rows to a :class:`model.SplitterState`, zero-padding gauge lists (zero slope is inactive)."""
+    values = {}
+    for name in states[0]:
+        column = [s[name] for s in states]
+        if name.endswith(("_slopes", "_ends")):
+            width = max(1, max(len(row) for row in column))
+            column = [row + [0] * (width - len(row)) for row in column]
+        values[name] = column
+    return model.SplitterState.build(**values)
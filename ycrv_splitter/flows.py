@@ -0,0 +1,198 @@
+"""
+Flow-of-funds analysis for splitter transactions.
+
+Decodes crvUSD/yvcrvUSD ``Transfer`` logs plus the splitter's ``AdminFeeSplit``
+and ``VoteIncentiveSplit`` events, nets them per token and recipient, and checks
+that nothing is left behind in the splitter beyond dust. Reports are plain
+dataclasses with ``to_dict()`` so they can be dumped to JSON for audits.
+"""
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field, replace
+
+DUST = 10  # wei
+
+LABELS = {
+    "0x794f80E899c772de9E326eC83cCfD8D94e208B49": "0x Splits",
+    "0x2e13f7644014F6E934E314F0371585845de7B986": "Receiver",
+    "0xf4e55515952BdAb2aeB4010f777E802D61eB384f": "Splitter",
+    "0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde": "Treasury",
+    "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E": "crvUSD",
+    "0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F": "yvcrvUSD",
+    "0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914": "Curve Fee Distro",
+    "0x47C4f7534995a50B5fa13ee49852B212Ea7d23eE": "yFee Burner",
+    "0x0000000000000000000000000000000000000000": "ZERO_ADDRESS",
+    "0xF147b8125d2ef93FB6965Db97D6746952a133934": "yVoter",
+}
+
+SPLIT_EVENTS = ("AdminFeeSplit", "VoteIncentiveSplit")
+
+
+@dataclass(frozen=True)
+class Transfer:
+    token: str
+    sender: str
+    receiver: str
+    value: int
+    tx_hash: str
+    log_index: int
+
+
+@dataclass(frozen=True)
+class SplitEvent:
+    event: str
+    ybs: int
+    treasury: int
+    remainder: int
+    tx_hash: str
+    log_index: int
+
+
+@dataclass
+class FlowReport:
+    transfers: list[Transfer] = field(default_factory=list)
+    splits: list[SplitEvent] = field(default_factory=list)
+
+    def net_flows(self) -> dict[str, dict[str, int]]:
+        """token => address => amount received minus amount sent."""
+        net: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for t in self.transfers:
+            net[t.token][t.sender] -= t.value
+            net[t.token][t.receiver] += t.value
+        return {token: dict(flows) for token, flows in net.items()}
+
+    def violations(self, holders, dust: int = DUST) -> list[dict]:
+        """Holders (e.g. the splitter) whose net position in any token exceeds ``dust``."""
+        return [
+            {"token": token, "holder": holder, "net": flows[holder]}
+            for token, flows in self.net_flows().items()
+            for holder in holders
+            if abs(flows.get(holder, 0)) > dust
+        ]
+
+    def rows(self, labels=LABELS) -> list[dict]:
+        return [
+            {
+                "token": token,
+                "token_label": labels.get(token, token),
+                "address": address,
+                "label": labels.get(address, address),
+                "net": amount,
+            }
+            for token, flows in self.net_flows().items()
+            for address, amount in flows.items()
+            if amount != 0
+        ]
+
+    def split_total(self, event: str) -> int:
+        return sum(s.ybs + s.treasury + s.remainder for s in self.splits if s.event == event)
+
+    def to_dict(self, labels=LABELS) -> dict:
+        return {
+            "transfers": [asdict(t) for t in self.transfers],
+            "splits": [asdict(s) for s in self.splits],
+            "net": self.rows(labels),
+        }
+
+    def describe(self, labels=LABELS) -> str:
+        return "\n".join(
+            f"{labels.get(t.token, t.token)} {labels.get(t.sender, t.sender)} "
+            f"{labels.get(t.receiver, t.receiver)} {t.value / 10**18:,.2f}"
+            for t in self.transfers
+        )
+
+    @classmethod
+    def combine(cls, reports) -> "FlowReport":
+        combined = cls()
+        for report in reports:
+            combined.transfers.extend(report.transfers)
+            combined.splits.extend(report.splits)
+        return combined
+
+
+def paid_split(split: SplitEvent, transfers: dict) -> SplitEvent:
+    """``split`` with the amounts actually paid, whichever splitter emitted it.
+
+    Splitters before per-recipient payouts emitted ``VoteIncentiveSplit`` after
+    paying out, with the remainder *ratio* in the last field; the remainder
+    itself was the splitter's whole reward token balance, sent by the transfer
+    right before the event. Current splitters emit amounts before any payout
+    transfer, so a reward token transfer out of the splitter at the preceding
+    log index identifies the old layout. ``transfers`` maps
+    ``(tx_hash, log_index)`` to those transfers.
+    """
+    if split.event != "VoteIncentiveSplit":
+        return split
+    paid = transfers.get((split.tx_hash, split.log_index - 1))
+    if paid is None:
+        return split
+    return replace(split, remainder=paid.value if split.remainder else 0)
+
+
+def reports_from_logs(logs, tokens, splitter) -> dict[str, FlowReport]:
+    """Group decoded ape ``ContractLog``s into one :class:`FlowReport` per transaction."""
+    tokens = set(tokens)
+    reports: dict[str, FlowReport] = defaultdict(FlowReport)
+    for log in sorted(logs, key=lambda l: (l.block_number, l.log_index)):
+        tx_hash = _hex(log.transaction_hash)
+        # Positional: token ABIs disagree on argument names (from/to vs sender/receiver).
+        args = list(log.event_arguments.values())
+        if log.event_name == "Transfer" and log.contract_address in tokens:
+            reports[tx_hash].transfers.append(
+                Transfer(log.contract_address, *args[:3], tx_hash, log.log_index)
+            )
+        elif log.event_name in SPLIT_EVENTS and log.contract_address == splitter:
+            reports[tx_hash].splits.append(
+                SplitEvent(log.event_name, *args[:3], tx_hash, log.log_index)
+            )
+    return dict(reports)
+
+
+def analyze_tx(tx, splitter, tokens) -> FlowReport:
+    """Flow report for a single receipt. ``tokens`` are ape contract instances."""
+    logs = tx.decode_logs(
+        [tokens[0].Transfer, splitter.AdminFeeSplit, splitter.VoteIncentiveSplit]
+    )
+    reports = reports_from_logs(logs, [t.address for t in tokens], splitter.address)
+    return reports.get(_hex(tx.txn_hash), FlowReport())
+
+
+def analyze_range(splitter, tokens, start_block, stop_block=None) -> dict[str, FlowReport]:
+    """Flow reports for every transaction in a block range that moved funds through the splitter.
+
+    Token transfers are filtered by topic to those touching the splitter, so the
+    scan does not pull every crvUSD transfer in the range.
+    """
+    from ape import chain
+    from ape.types import LogFilter
+
+    transfer = tokens[0].Transfer.abi
+    sender, receiver = (i.name for i in transfer.inputs[:2])
+    token_addresses = [t.address for t in tokens]
+    filters = [
+        LogFilter(
+            addresses=[splitter.address],
+            events=[splitter.AdminFeeSplit.abi, splitter.VoteIncentiveSplit.abi],
+            start_block=start_block,
+            stop_block=stop_block,
+        ),
+        *(
+            LogFilter.from_event(
+                transfer,
+                search_topics={side: splitter.address},
+                addresses=token_addresses,
+                start_block=start_block,
+                stop_block=stop_block,
+            )
+            for side in (sender, receiver)
+        ),
+    ]
+    logs = {}
+    for log_filter in filters:
+        for log in chain.provider.get_contract_logs(log_filter):
+            # Splitter-to-splitter transfers would match both topic filters.
+            logs[(_hex(log.transaction_hash), log.log_index)] = log
+    return reports_from_logs(logs.values(), token_addresses, splitter.address)
+
+
+def _hex(value) -> str:
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
@@ -0,0 +1,86 @@
+"""
+Gas baselines for keeper-facing functions.
+
+Measurements are grouped by network and fork block (gas on a mainnet fork
+differs from the local mocks), then by benchmark name and scenario::
+
+    {"mainnet-fork@21000000": {"YCRVSplitter.executeSplit": {"both": 412345}}}
+"""
+import fcntl
+import json
+from pathlib import Path
+
+
+class GasRegression(AssertionError):
+    pass
+
+
+class MissingGasBaseline(GasRegression):
+    pass
+
+
+class GasBaseline:
+    def __init__(self, path, network: str, tolerance: float = 0.02, update=False):
+        self.path = Path(path)
+        self.network = network
+        self.tolerance = tolerance
+        self.update = update
+        self.baseline = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self.results: dict[str, dict[str, int]] = {}
+
+    @property
+    def recorded(self) -> bool:
+        """Whether any baseline exists for this network."""
+        return bool(self.baseline.get(self.network))
+
+    def expected(self, name: str, scenario: str) -> int | None:
+        return self.baseline.get(self.network, {}).get(name, {}).get(scenario)
+
+    def check(self, name: str, scenario: str, gas_used: int):
+        """Record a measurement and raise if it regresses past the tolerance.
+
+        Once a network has baselines, a measurement without one also fails,
+        so a new benchmark cannot silently go unchecked; ``update`` mode
+        records it instead. Networks with no baselines at all are skipped by
+        the benchmark tests before they get here.
+        """
+        self.results.setdefault(name, {})[scenario] = gas_used
+        if self.update:
+            return
+        expected = self.expected(name, scenario)
+        if expected is None:
+            raise MissingGasBaseline(
+                f"{name} [{scenario}] has no baseline for {self.network}; "
+                "record one with --update-gas-baseline"
+            )
+        limit = int(expected * (1 + self.tolerance))
+        if gas_used > limit:
+            raise GasRegression(
+                f"{name} [{scenario}] used {gas_used:,} gas; baseline is "
+                f"{expected:,} (+{self.tolerance:.1%} allowed)"
+            )
+
+    def save(self):
+        """Merge this run's results into the baseline file (``--update-gas-baseline``).
+
+        Parallel workers each hold a subset of the results, so the file is
+        re-read and merged under a lock rather than overwritten.
+        """
+        if not self.update or not self.results:
+            return
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            baseline = json.loads(self.path.read_text()) if self.path.exists() else {}
+            network = baseline.setdefault(self.network, {})
+            for name, scenarios in self.results.items():
+                network.setdefault(name, {}).update(scenarios)
+            self.path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+    def report(self) -> str:
+        lines = [f"Gas benchmarks ({self.network})"]
+        for name, scenarios in sorted(self.results.items()):
+            for scenario, gas_used in sorted(scenarios.items()):
+                expected = self.expected(name, scenario)
+                delta = "new" if expected is None else f"{gas_used - expected:+,}"
+                lines.append(f"  {name:<40} {scenario:<16} {gas_used:>10,} {delta:>10}")
+        return "\n".join(lines)
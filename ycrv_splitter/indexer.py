@@ -0,0 +1,346 @@
+"""
+Incremental SQLite index of splitter, fee burner, receiver and distributor events.
+
+``Indexer.sync`` pulls logs with ``eth_getLogs`` in block-range chunks from
+the last synced block to the head and stores one row per event, or one row
+per recipient for the split events (``ybs``, ``treasury``, ``remainder``), with
+the epoch, recipient, token and amount in indexed columns. Queries such as
+"treasury share over the last 26 weeks" then run locally. Older splitters put
+the remainder ratio in ``VoteIncentiveSplit``; their remainder row holds the
+amount of the matching payout transfer instead (see
+:func:`ycrv_splitter.flows.paid_split`), while ``args`` keeps the raw event.
+
+Reorgs: the hash of every block that produced events, and of the last synced
+block, is stored. Before each sync the stored hashes are compared with the
+chain from the newest down; everything above the newest block that still
+matches is deleted and re-indexed.
+"""
+import json
+import sqlite3
+from dataclasses import dataclass
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from .flows import SplitEvent, Transfer, paid_split
+from .rpc import ape_rpc, as_bytes, as_hex, as_int
+
+WEEK = 7 * 24 * 60 * 60
+SPLIT_RECIPIENTS = ("ybs", "treasury", "remainder")
+TRANSFER = as_hex(keccak(text="Transfer(address,address,uint256)"))
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    name: str
+    inputs: tuple  # (name, type, indexed)
+
+    @property
+    def topic(self) -> str:
+        types = ",".join(t for _, t, _ in self.inputs)
+        return as_hex(keccak(text=f"{self.name}({types})"))
+
+    def decode(self, topics, data) -> dict:
+        indexed = iter(topics[1:])
+        values = iter(decode([t for _, t, i in self.inputs if not i], as_bytes(data)))
+        args = {}
+        for name, type_, is_indexed in self.inputs:
+            if is_indexed:
+                (args[name],) = decode([type_], as_bytes(next(indexed)))
+            else:
+                args[name] = next(values)
+            if type_ == "address":
+                args[name] = to_checksum_address(args[name])
+        return args
+
+
+def _amounts(name):
+    return EventSpec(name, tuple((r, "uint256", False) for r in SPLIT_RECIPIENTS))
+
+
+EVENTS = {
+    "splitter": (
+        _amounts("AdminFeeSplit"),
+        _amounts("VoteIncentiveSplit"),
+        EventSpec("OwnerSet", (("owner", "address", True),)),
+        EventSpec("GuardianSet", (("guardian", "address", True),)),
+    ),
+    "fee_burner": (
+        EventSpec("SpenderApproved", (("spender", "address", True),)),
+        EventSpec("SpenderRevoked", (("spender", "address", True),)),
+        EventSpec("GuardianSet", (("guardian", "address", True),)),
+    ),
+    "receiver": (
+        EventSpec(
+            "SpenderApproved",
+            (("spender", "address", True), ("approved", "bool", True)),
+        ),
+        EventSpec("GuardianSet", (("guardian", "address", True),)),
+    ),
+    "distributor": (
+        EventSpec(
+            "RewardDeposited",
+            (
+                ("week", "uint256", True),
+                ("depositor", "address", True),
+                ("rewardAmount", "uint256", False),
+            ),
+        ),
+    ),
+}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS events (
+        block INTEGER, log_index INTEGER, part INTEGER, tx_hash TEXT,
+        contract TEXT, address TEXT, event TEXT, epoch INTEGER,
+        recipient TEXT, token TEXT, amount TEXT, args TEXT,
+        PRIMARY KEY (block, log_index, part)
+    );
+    CREATE INDEX IF NOT EXISTS events_epoch ON events (epoch, event);
+    CREATE INDEX IF NOT EXISTS events_recipient ON events (recipient, epoch);
+    CREATE INDEX IF NOT EXISTS events_token ON events (token, epoch);
+    CREATE TABLE IF NOT EXISTS blocks (
+        number INTEGER PRIMARY KEY, hash TEXT, timestamp INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+class Indexer:
+    def __init__(
+        self,
+        path,
+        contracts: dict,
+        reward_token: str,
+        rpc=ape_rpc,
+        start_block: int = 0,
+        chunk_size: int = 2_000,
+    ):
+        """``contracts`` maps a kind in :data:`EVENTS` to its address."""
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+        self.rpc = rpc
+        self.reward_token = to_checksum_address(reward_token)
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.kinds = {to_checksum_address(a): kind for kind, a in contracts.items()}
+        self.specs = {
+            (address, spec.topic): spec
+            for address, kind in self.kinds.items()
+            for spec in EVENTS[kind]
+        }
+
+    # Sync
+
+    @property
+    def synced_to(self) -> int:
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE key = 'synced_to'"
+        ).fetchone()
+        return self.start_block - 1 if row is None else row[0]
+
+    def sync(self, to_block: int | None = None) -> int:
+        """Index up to ``to_block`` (default: head); returns the number of new rows."""
+        head = as_int(self.rpc("eth_blockNumber", [])) if to_block is None else to_block
+        self._unwind_reorg()
+        added = 0
+        start = self.synced_to + 1
+        while start <= head:
+            stop = min(start + self.chunk_size - 1, head)
+            logs = self.rpc(
+                "eth_getLogs",
+                [
+                    {
+                        "address": list(self.kinds),
+                        "topics": [sorted({topic for _, topic in self.specs})],
+                        "fromBlock": hex(start),
+                        "toBlock": hex(stop),
+                    }
+                ],
+            )
+            transfers = self._payout_transfers(logs, start, stop)
+            with self.db:
+                added += self._store(logs, transfers)
+                tip = self._block(stop)
+                self._put_block(stop, tip["hash"], as_int(tip["timestamp"]))
+                self.db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('synced_to', ?)", (stop,)
+                )
+            start = stop + 1
+        return added
+
+    def _unwind_reorg(self):
+        """Drop everything above the newest stored block that is still canonical."""
+        stored = self.db.execute(
+            "SELECT number, hash FROM blocks ORDER BY number DESC"
+        ).fetchall()
+        for number, block_hash in stored:
+            if as_hex(self._block(number)["hash"]) == block_hash:
+                break
+        else:
+            number = self.start_block - 1
+        if stored and number == stored[0][0]:
+            return
+        with self.db:
+            self.db.execute("DELETE FROM events WHERE block > ?", (number,))
+            self.db.execute("DELETE FROM blocks WHERE number > ?", (number,))
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('synced_to', ?)", (number,)
+            )
+
+    def _payout_transfers(self, logs, start, stop) -> dict:
+        """Reward token transfers out of the splitter, if the chunk has splits."""
+        splitters = [a for a, kind in self.kinds.items() if kind == "splitter"]
+        split_topic = _amounts("VoteIncentiveSplit").topic
+        if not any(as_hex(log["topics"][0]) == split_topic for log in logs):
+            return {}
+        logs = self.rpc(
+            "eth_getLogs",
+            [
+                {
+                    "address": self.reward_token,
+                    "topics": [
+                        TRANSFER,
+                        [as_hex(encode(["address"], [a])) for a in splitters],
+                    ],
+                    "fromBlock": hex(start),
+                    "toBlock": hex(stop),
+                }
+            ],
+        )
+        transfers = {}
+        for log in logs:
+            key = (as_hex(log["transactionHash"]), as_int(log["logIndex"]))
+            sender, receiver = (
+                to_checksum_address(decode(["address"], as_bytes(t))[0])
+                for t in log["topics"][1:3]
+            )
+            (value,) = decode(["uint256"], as_bytes(log["data"]))
+            transfers[key] = Transfer(self.reward_token, sender, receiver, value, *key)
+        return transfers
+
+    def _store(self, logs, transfers) -> int:
+        rows = []
+        for log in logs:
+            address = to_checksum_address(log["address"])
+            spec = self.specs.get((address, as_hex(log["topics"][0])))
+            if spec is None:
+                continue
+            block = as_int(log["blockNumber"])
+            timestamp = self._timestamp(block, as_hex(log["blockHash"]))
+            args = spec.decode(log["topics"], log["data"])
+            common = (
+                block,
+                as_int(log["logIndex"]),
+                as_hex(log["transactionHash"]),
+                self.kinds[address],
+                address,
+                spec.name,
+                timestamp // WEEK * WEEK,
+            )
+            entries = self._entries(spec, args, common[2], common[1], transfers)
+            for part, (recipient, token, amount) in enumerate(entries):
+                rows.append(
+                    (
+                        *common[:2],
+                        part,
+                        *common[2:],
+                        recipient,
+                        token,
+                        None if amount is None else str(amount),
+                        json.dumps(args, default=str),
+                    )
+                )
+        self.db.executemany(
+            "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def _entries(self, spec, args, tx_hash, log_index, transfers):
+        """``(recipient, token, amount)`` rows for one event."""
+        if spec.name in ("AdminFeeSplit", "VoteIncentiveSplit"):
+            split = SplitEvent(
+                spec.name, *(args[r] for r in SPLIT_RECIPIENTS), tx_hash, log_index
+            )
+            split = paid_split(split, transfers)
+            return [(r, self.reward_token, getattr(split, r)) for r in SPLIT_RECIPIENTS]
+        if spec.name == "RewardDeposited":
+            return [(args["depositor"], self.reward_token, args["rewardAmount"])]
+        return [(next(iter(args.values())), None, None)]
+
+    def _timestamp(self, number, block_hash) -> int:
+        row = self.db.execute(
+            "SELECT timestamp FROM blocks WHERE number = ?", (number,)
+        ).fetchone()
+        if row is None:
+            timestamp = as_int(self._block(number)["timestamp"])
+            self._put_block(number, block_hash, timestamp)
+            return timestamp
+        return row[0]
+
+    def _put_block(self, number, block_hash, timestamp):
+        self.db.execute(
+            "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?)",
+            (number, as_hex(block_hash), timestamp),
+        )
+
+    def _block(self, number) -> dict:
+        return self.rpc("eth_getBlockByNumber", [hex(number), False])
+
+    # Queries
+
+    def latest_epoch(self) -> int | None:
+        row = self.db.execute(
+            "SELECT timestamp FROM blocks ORDER BY number DESC LIMIT 1"
+        ).fetchone()
+        return None if row is None else row[0] // WEEK * WEEK
+
+    def events(self, event=None, recipient=None, since_epoch=None) -> list[dict]:
+        """Indexed rows, oldest first, optionally filtered."""
+        clauses, params = [], []
+        for column, value in (("event", event), ("recipient", recipient)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since_epoch is not None:
+            clauses.append("epoch >= ?")
+            params.append(since_epoch)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.db.execute(
+            f"SELECT * FROM events {where} ORDER BY block, log_index, part", params
+        )
+        columns = [c[0] for c in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor]
+        for row in rows:
+            row["amount"] = None if row["amount"] is None else int(row["amount"])
+            row["args"] = json.loads(row["args"])
+        return rows
+
+    def payouts_by_epoch(self, weeks=None, event=None) -> dict[int, dict[str, int]]:
+        """epoch => split recipient => amount paid, over the last ``weeks`` epochs."""
+        since = self._since(weeks)
+        result: dict[int, dict[str, int]] = {}
+        events = [event] if event else ["AdminFeeSplit", "VoteIncentiveSplit"]
+        for name in events:
+            for row in self.events(event=name, since_epoch=since):
+                paid = result.setdefault(
+                    row["epoch"], dict.fromkeys(SPLIT_RECIPIENTS, 0)
+                )
+                paid[row["recipient"]] += row["amount"]
+        return dict(sorted(result.items()))
+
+    def share(self, recipient: str, weeks=None, event=None) -> float:
+        """Fraction of split payouts paid to ybs, treasury or remainder."""
+        totals = dict.fromkeys(SPLIT_RECIPIENTS, 0)
+        for paid in self.payouts_by_epoch(weeks, event).values():
+            for name, amount in paid.items():
+                totals[name] += amount
+        total = sum(totals.values())
+        return totals[recipient] / total if total else 0.0
+
+    def _since(self, weeks):
+        latest = self.latest_epoch()
+        if weeks is None or latest is None:
+            return None
+        return latest - (weeks - 1) * WEEK
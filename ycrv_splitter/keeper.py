@@ -0,0 +1,183 @@
+"""
+Weekly keeper: checkpoint the fee distributor, split fees, deposit rewards.
+
+Each step reads everything it needs concurrently, picks the next action that
+is due with ``next_action``, simulates it with ``eth_call`` and only then
+sends it. State is re-read after every transaction, so the sequence
+checkpoint -> executeSplit -> depositRewards runs back to back as soon as a
+new epoch opens, and a step someone else already took is simply skipped.
+
+The chain is reached through a backend with ``read_state``, ``simulate`` and
+``send`` coroutines; ``ApeBackend`` is the one used against a node.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+PRECISION = 10**18
+TOKEN_CHECKPOINT_DEADLINE = DAY  # Curve fee distributor
+MIN_DEPOSIT = PRECISION  # receiver rewards worth a depositRewards transaction
+
+CHECKPOINT_TOKEN = "checkpoint_token"
+EXECUTE_SPLIT = "execute_split"
+DEPOSIT_REWARDS = "deposit_rewards"
+
+log = logging.getLogger(__name__)
+
+
+class KeeperError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class KeeperState:
+    timestamp: int
+    can_claim: bool
+    last_token_time: int
+    can_checkpoint_token: bool
+    admin_fees: int  # crvUSD already held by the voter
+    vote_incentives: int  # crvUSD held by the fee burner
+    receiver_rewards: int
+    receiver_paused: bool
+
+    @property
+    def week_start(self) -> int:
+        return self.timestamp // WEEK * WEEK
+
+    @property
+    def next_epoch(self) -> int:
+        return self.week_start + WEEK
+
+
+def next_action(state: KeeperState, min_deposit: int = MIN_DEPOSIT) -> str | None:
+    """The next transaction due in ``state``, or None when there is nothing to do.
+
+    Receiver rewards below ``min_deposit`` are left for a later deposit.
+    """
+    # Same condition as the fee distributor's own checkpoint_token guard.
+    if (
+        state.last_token_time <= state.week_start
+        and state.can_checkpoint_token
+        and state.timestamp > state.last_token_time + TOKEN_CHECKPOINT_DEADLINE
+    ):
+        return CHECKPOINT_TOKEN
+    # Mirrors the thresholds in StrategyProxy._claimAdminFees and
+    # YCRVSplitter._splitDepositAndSend.
+    if (
+        state.can_claim
+        or state.admin_fees > PRECISION
+        or state.vote_incentives > PRECISION
+    ):
+        return EXECUTE_SPLIT
+    if state.receiver_rewards >= min_deposit and not state.receiver_paused:
+        return DEPOSIT_REWARDS
+    return None
+
+
+class Keeper:
+    def __init__(
+        self,
+        backend,
+        poll_interval: float = 60,
+        retries: int = 3,
+        retry_delay: float = 5,
+        max_actions: int = 5,
+        min_deposit: int = MIN_DEPOSIT,
+    ):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_actions = max_actions
+        self.min_deposit = min_deposit
+
+    async def run_once(self) -> list[str]:
+        """Send every action that is due now and return their names in order.
+
+        A failed simulation or send is retried with a fresh read of state, so
+        an action that is no longer due is dropped instead of resent. The
+        retry budget and backoff apply per action and start over after a send.
+        """
+        sent: list[str] = []
+        failures = 0
+        while len(sent) < self.max_actions:
+            try:
+                state = await self.backend.read_state()
+                action = next_action(state, self.min_deposit)
+                if action is None:
+                    break
+                await self.backend.simulate(action)
+                await self.backend.send(action)
+            except Exception as exc:
+                failures += 1
+                if failures > self.retries:
+                    raise KeeperError(f"giving up after {failures} failures") from exc
+                log.warning("keeper step failed (%s), retrying: %s", failures, exc)
+                await asyncio.sleep(self.retry_delay * 2 ** (failures - 1))
+                continue
+            log.info("sent %s", action)
+            sent.append(action)
+            failures = 0
+        return sent
+
+    async def delay(self) -> float:
+        """Seconds until the next poll, waking exactly at the epoch boundary."""
+        state = await self.backend.read_state()
+        return min(self.poll_interval, max(1, state.next_epoch - state.timestamp))
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+                delay = await self.delay()
+            except Exception:
+                log.exception("keeper cycle failed")
+                delay = self.poll_interval
+            await asyncio.sleep(delay)
+
+
+class ApeBackend:
+    """Reads and sends through ape contract instances, one thread per call."""
+
+    def __init__(
+        self, splitter, proxy, fee_distributor, receiver, crvusd, reward_token, sender
+    ):
+        self.splitter = splitter
+        self.proxy = proxy
+        self.fee_distributor = fee_distributor
+        self.receiver = receiver
+        self.crvusd = crvusd
+        self.reward_token = reward_token
+        self.sender = sender
+        self.voter = splitter.VOTER()
+        self.fee_burner = splitter.FEE_BURNER()
+        self.transactions = {
+            CHECKPOINT_TOKEN: fee_distributor.checkpoint_token,
+            EXECUTE_SPLIT: splitter.executeSplit,
+            DEPOSIT_REWARDS: receiver.depositRewards,
+        }
+
+    async def read_state(self) -> KeeperState:
+        from ape import chain
+
+        reads = (
+            lambda: chain.blocks.head.timestamp,
+            self.proxy.canClaim,
+            self.fee_distributor.last_token_time,
+            self.fee_distributor.can_checkpoint_token,
+            lambda: self.crvusd.balanceOf(self.voter),
+            lambda: self.crvusd.balanceOf(self.fee_burner),
+            lambda: self.reward_token.balanceOf(self.receiver),
+            self.receiver.paused,
+        )
+        values = await asyncio.gather(*(asyncio.to_thread(read) for read in reads))
+        return KeeperState(*values)
+
+    async def simulate(self, action: str):
+        """eth_call the action; raises if it would revert."""
+        await asyncio.to_thread(self.transactions[action].call, sender=self.sender)
+
+    async def send(self, action: str):
+        return await asyncio.to_thread(self.transactions[action], sender=self.sender)
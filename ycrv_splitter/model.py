@@ -0,0 +1,247 @@
+"""
+Vectorized reference implementation of ``YCRVSplitter.getSplits``.
+
+Every function mirrors its Solidity counterpart, including integer floor
+division and the places where the contract reverts, but operates on arrays
+so thousands of what-if scenarios can be evaluated in a single call. Values
+are kept as Python ints (``dtype=object``) so results match the contract
+bit-for-bit instead of drifting through float64 rounding.
+
+Shapes: scalar inputs broadcast to ``(n,)`` and gauge inputs are ``(n, g)``,
+where ``n`` is the number of scenarios and ``g`` the length of a gauge list.
+"""
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+PRECISION = 10**18
+WEEK = 7 * 24 * 60 * 60
+
+
+def _ints(value, ndim=1):
+    arr = np.array(value, dtype=object)
+    while arr.ndim < ndim:
+        arr = arr[np.newaxis]
+    return arr
+
+
+@dataclass(frozen=True)
+class SplitterState:
+    """Everything ``getSplits`` reads from chain, one row per scenario."""
+
+    timestamp: np.ndarray
+    ve_total: np.ndarray
+    ybs: np.ndarray
+    lp: np.ndarray
+    ycrv_supply: np.ndarray
+    unmigrated: np.ndarray
+    ycrv_slopes: np.ndarray
+    ycrv_ends: np.ndarray
+    partner_slopes: np.ndarray
+    partner_ends: np.ndarray
+    discretionary_slopes: np.ndarray
+    discretionary_ends: np.ndarray
+    ybs_vote_incentive_ratio: np.ndarray
+    only_tokenized: np.ndarray
+
+    @classmethod
+    def build(cls, **values) -> "SplitterState":
+        """Coerce plain ints/lists into correctly shaped object arrays."""
+        gauge_fields = {f.name for f in fields(cls) if f.name.endswith(("_slopes", "_ends"))}
+        return cls(
+            **{
+                name: _ints(value, 2 if name in gauge_fields else 1)
+                for name, value in values.items()
+            }
+        )
+
+    def __len__(self) -> int:
+        return max(len(getattr(self, f.name)) for f in fields(self))
+
+    def tile(self, n: int) -> "SplitterState":
+        """Repeat a single-scenario state ``n`` times so rows can be edited independently."""
+        return replace(
+            self,
+            **{
+                f.name: np.repeat(getattr(self, f.name)[:1], n, axis=0)
+                for f in fields(self)
+            },
+        )
+
+
+@dataclass(frozen=True)
+class Splits:
+    """Result of :func:`get_splits`; ratio columns are ``(ybs, treasury, remainder)``."""
+
+    admin_fee: np.ndarray
+    vote_incentive: np.ndarray
+    reverted: np.ndarray
+
+
+def get_current_week_start_time(timestamp):
+    return (_ints(timestamp) // WEEK) * WEEK
+
+
+def sum_gauge_bias(slopes, ends, timestamp):
+    """Mirror of ``sumGaugeBias``: locks ending within a week are ignored."""
+    slopes, ends = _ints(slopes, 2), _ints(ends, 2)
+    week = get_current_week_start_time(timestamp)[:, np.newaxis]
+    active = week + WEEK < ends
+    bias = np.where(active, slopes * (ends - week), 0)
+    return bias.sum(axis=1)
+
+
+def get_votes(state: SplitterState):
+    """Return ``(ycrv, partner, discretionary)`` bias totals."""
+    return (
+        sum_gauge_bias(state.ycrv_slopes, state.ycrv_ends, state.timestamp),
+        sum_gauge_bias(state.partner_slopes, state.partner_ends, state.timestamp),
+        sum_gauge_bias(
+            state.discretionary_slopes, state.discretionary_ends, state.timestamp
+        ),
+    )
+
+
+def get_base_balances(state: SplitterState, partners=None):
+    """Mirror of ``getBaseBalances``; returns ``(base, reverted)``."""
+    if partners is None:
+        partners = get_votes(state)[1]
+    recognized = state.ybs + state.lp + partners
+    reverted = ~(recognized < state.ycrv_supply)
+    untokenized = state.ve_total - state.ycrv_supply - state.unmigrated
+    reverted |= untokenized < 0
+    base = {
+        "ybs": state.ybs,
+        "lp": state.lp,
+        "loose": state.ycrv_supply - recognized,
+        "unmigrated": state.unmigrated,
+        "partners": partners,
+        "untokenized": untokenized,
+        "veTotal": state.ve_total,
+    }
+    return base, np.asarray(reverted, dtype=bool)
+
+
+def get_admin_fee_split_ratios(base, only_tokenized):
+    """Mirror of ``getAdminFeeSplitRatios``; returns ``(ratios, reverted)``."""
+    denominator = np.where(
+        np.asarray(only_tokenized, dtype=bool),
+        base["veTotal"] - base["untokenized"],
+        base["veTotal"],
+    )
+    reverted = denominator == 0
+    ybs = (PRECISION * base["ybs"]) // np.where(reverted, 1, denominator)
+    remainder = PRECISION - ybs
+    reverted |= remainder < 0
+    zero = ybs * 0
+    return np.stack([ybs, zero, remainder], axis=1), np.asarray(reverted, dtype=bool)
+
+
+def get_vote_incentive_split_ratios(base, votes, ybs_vote_incentive_ratio):
+    """Mirror of ``getVoteIncentiveSplitRatios``; returns ``(ratios, reverted)``."""
+    ycrv, partner, discretionary = votes
+    total = base["veTotal"] - (discretionary + ycrv + partner)
+    reverted = total < 0
+    empty = total == 0
+    safe_total = np.where(empty | reverted, 1, total)
+    ybs = (base["ybs"] * ybs_vote_incentive_ratio) // safe_total
+    treasury_votes = base["untokenized"] - discretionary
+    reverted |= ~empty & (treasury_votes < 0)
+    treasury = (PRECISION * treasury_votes) // safe_total
+    remainder = PRECISION - ybs - treasury
+    reverted |= ~empty & (remainder < 0)
+    ratios = np.stack(
+        [
+            np.where(empty, 0, ybs),
+            np.where(empty, 0, treasury),
+            np.where(empty, PRECISION, remainder),
+        ],
+        axis=1,
+    )
+    return ratios, np.asarray(reverted, dtype=bool)
+
+
+def get_splits(state: SplitterState) -> Splits:
+    """Mirror of ``getSplits`` for every scenario in ``state``.
+
+    Rows where the contract would revert are flagged in ``Splits.reverted``;
+    their ratio values are meaningless.
+    """
+    votes = get_votes(state)
+    base, reverted = get_base_balances(state, partners=votes[1])
+    admin, admin_reverted = get_admin_fee_split_ratios(base, state.only_tokenized)
+    vote, vote_reverted = get_vote_incentive_split_ratios(
+        base, votes, state.ybs_vote_incentive_ratio
+    )
+    return Splits(
+        admin_fee=admin,
+        vote_incentive=vote,
+        reverted=reverted | admin_reverted | vote_reverted,
+    )
+
+
+def load_state(splitter, gauge_controller, ycrv, block_id=None) -> SplitterState:
+    """Read a single-scenario :class:`SplitterState` from a deployed splitter."""
+    from ape import chain
+
+    kw = {} if block_id is None else {"block_id": block_id}
+    voter = splitter.VOTER(**kw)
+
+    def gauges(addresses):
+        slopes, ends = [], []
+        for gauge in addresses:
+            data = gauge_controller.vote_user_slopes(voter, gauge, **kw)
+            slopes.append(data.slope)
+            ends.append(data.end)
+        return [slopes], [ends]
+
+    ycrv, partners, discretionary = splitter.getGauges(**kw)
+    ycrv_slopes, ycrv_ends = gauges(ycrv)
+    partner_slopes, partner_ends = gauges(partners)
+    discretionary_slopes, discretionary_ends = gauges(discretionary)
+    block = chain.blocks[block_id if block_id is not None else -1]
+    return SplitterState.build(
+        timestamp=block.timestamp,
+        ve_total=splitter.yearnVeBalance(**kw),
+        ybs=splitter.ybsBalance(**kw),
+        lp=ycrv.balanceOf(splitter.POOL(**kw), **kw),
+        ycrv_supply=ycrv.totalSupply(**kw),
+        unmigrated=splitter.unmigrated(**kw),
+        ycrv_slopes=ycrv_slopes,
+        ycrv_ends=ycrv_ends,
+        partner_slopes=partner_slopes,
+        partner_ends=partner_ends,
+        discretionary_slopes=discretionary_slopes,
+        discretionary_ends=discretionary_ends,
+        ybs_vote_incentive_ratio=splitter.ybsVoteIncentiveRatio(**kw),
+        only_tokenized=splitter.onlyTokenized(**kw),
+    )
+
+
+def load_state_from_lens(lens, block_id=None) -> SplitterState:
+    """Same as :func:`load_state`, but from a single ``SplitterLens.getState`` call."""
+    kw = {} if block_id is None else {"block_id": block_id}
+    s = lens.getState(**kw)
+
+    def gauges(votes):
+        return [[v.slope for v in votes]], [[v.end for v in votes]]
+
+    ycrv_slopes, ycrv_ends = gauges(s.ycrvGauges)
+    partner_slopes, partner_ends = gauges(s.partnerGauges)
+    discretionary_slopes, discretionary_ends = gauges(s.discretionaryGauges)
+    return SplitterState.build(
+        timestamp=s.timestamp,
+        ve_total=s.veTotal,
+        ybs=s.ybs,
+        lp=s.lp,
+        ycrv_supply=s.ycrvSupply,
+        unmigrated=s.unmigrated,
+        ycrv_slopes=ycrv_slopes,
+        ycrv_ends=ycrv_ends,
+        partner_slopes=partner_slopes,
+        partner_ends=partner_ends,
+        discretionary_slopes=discretionary_slopes,
+        discretionary_ends=discretionary_ends,
+        ybs_vote_incentive_ratio=s.ybsVoteIncentiveRatio,
+        only_tokenized=s.onlyTokenized,
+    )
@@ -0,0 +1,318 @@
+"""
+Gas attribution for a transaction's call tree.
+
+``profile_transaction`` replays a mined transaction on the node with two
+``debug_traceTransaction`` calls: ``callTracer`` gives the call tree with
+inclusive gas per frame, and the opcode trace splits each frame's own gas
+between its loops and everything else. The result prints as a summary table
+or writes a folded-stack file for flamegraph.pl / speedscope::
+
+    YCRVSplitter.executeSplit;loop@Splitter.sol:674;Vyper_contract.vote_user_slopes 2900
+
+Loops are found from backward jumps that the compiler's source map marks as
+plain jumps, so internal function calls and returns are not mistaken for loop
+edges. Gas spent in internal functions called from a loop body counts towards
+that loop. Contracts without a source map (most mainnet dependencies) are
+labelled but not split into loops.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from eth_utils import to_checksum_address
+
+from .rpc import ape_rpc, as_hex, as_int
+
+CALLS = {"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2"}
+JUMPS = {"JUMP", "JUMPI"}
+
+
+@dataclass(frozen=True)
+class ContractInfo:
+    name: str
+    functions: dict = field(default_factory=dict)  # selector => function name
+    jumps: dict = field(default_factory=dict)  # pc => source map jump code
+    lines: dict = field(default_factory=dict)  # pc => "File.sol:line"
+
+
+@dataclass(eq=False)
+class Frame:
+    address: str
+    contract: str
+    function: str
+    gas: int
+    children: list = field(default_factory=list)
+    loop: str | None = None  # loop in the parent frame this call was made from
+    loops: Counter = field(default_factory=Counter)
+    iterations: Counter = field(default_factory=Counter)
+
+    @property
+    def label(self) -> str:
+        return f"{self.contract}.{self.function}"
+
+    @property
+    def self_gas(self) -> int:
+        return max(self.gas - sum(child.gas for child in self.children), 0)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class GasProfile:
+    def __init__(self, root: Frame, tx_hash: str | None = None):
+        self.root = root
+        self.tx_hash = tx_hash
+
+    def folded(self) -> Counter:
+        """``"a;b;c" => gas`` for each stack, as flame graph tools expect."""
+        stacks = Counter()
+
+        def visit(frame, path):
+            path = [*path, frame.label]
+            stacks[";".join(path)] += max(frame.self_gas - sum(frame.loops.values()), 0)
+            for loop, gas in frame.loops.items():
+                stacks[";".join([*path, loop])] += gas
+            for child in frame.children:
+                visit(child, [*path, child.loop] if child.loop else path)
+
+        visit(self.root, [])
+        return Counter({stack: gas for stack, gas in stacks.items() if gas})
+
+    def write_folded(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {gas}" for stack, gas in sorted(self.folded().items())]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def functions(self) -> dict[str, tuple[int, int, int]]:
+        """``label => (calls, inclusive gas, self gas)``, most self gas first."""
+        totals = defaultdict(lambda: [0, 0, 0])
+        for frame in self.root.walk():
+            row = totals[frame.label]
+            row[0] += 1
+            row[1] += frame.gas
+            row[2] += frame.self_gas
+        return dict(sorted(((k, tuple(v)) for k, v in totals.items()), key=_by_gas))
+
+    def loops(self) -> dict[str, tuple[int, int]]:
+        """``"label/loop" => (iterations, gas)``, most gas first."""
+        totals = defaultdict(lambda: [0, 0])
+        for frame in self.root.walk():
+            for loop, gas in frame.loops.items():
+                row = totals[f"{frame.label}/{loop}"]
+                row[0] += frame.iterations[loop]
+                row[1] += gas
+        return dict(sorted(((k, tuple(v)) for k, v in totals.items()), key=_by_gas))
+
+    def summary(self) -> str:
+        title = f"Gas profile {self.tx_hash}" if self.tx_hash else "Gas profile"
+        lines = [
+            f"{title}: {self.root.gas:,} gas",
+            f"  {'function':<56} {'calls':>6} {'inclusive':>11} {'self':>11}",
+        ]
+        for label, (calls, inclusive, own) in self.functions().items():
+            lines.append(f"  {label:<56} {calls:>6} {inclusive:>11,} {own:>11,}")
+        if loops := self.loops():
+            lines.append(f"  {'loop':<56} {'iters':>6} {'':>11} {'gas':>11}")
+            for label, (iterations, gas) in loops.items():
+                lines.append(f"  {label:<56} {iterations:>6} {'':>11} {gas:>11,}")
+        return "\n".join(lines)
+
+
+def _by_gas(item):
+    return -item[1][-1], item[0]
+
+
+def build_profile(call_trace: dict, struct_logs: list, labels=None) -> GasProfile:
+    """Attribute gas from a ``callTracer`` result and the matching opcode trace.
+
+    ``labels`` is called with an address and returns its :class:`ContractInfo`
+    or None; ``dict.get`` works.
+    """
+    labels = labels or (lambda address: None)
+    base = struct_logs[0]["depth"] - 1 if struct_logs else 0
+    root = _frame(call_trace, labels)
+    edges = defaultdict(set)  # code address => {(loop head pc, back jump pc)}
+    visits = defaultdict(list)  # frame => [(pc, gas, internal call sites, child)]
+    back_jumps = defaultdict(Counter)  # frame => {(head, back jump): count}
+    next_same = _next_same_depth(struct_logs)
+    stack = [root]
+    cursors = Counter()
+    call_sites = defaultdict(list)
+
+    for i, step in enumerate(struct_logs):
+        depth = step["depth"] - base
+        del stack[depth:]
+        frame = stack[-1]
+        info = labels(frame.address)
+        pc, op = step["pc"], step["op"]
+        sites = tuple(call_sites[frame])  # internal calls this step is inside of
+        following = struct_logs[i + 1] if i + 1 < len(struct_logs) else None
+        # Gas until the next opcode in this frame, so a call includes its child.
+        j = next_same[i]
+        if j is None:
+            cost = step.get("gasCost", 0)
+        else:
+            cost = step["gas"] - struct_logs[j]["gas"]
+        child = None
+
+        if op in CALLS:
+            entered = following is not None and following["depth"] - base > depth
+            child = _next_child(frame, cursors, entered, _call_target(step, op))
+            if child is not None:
+                cost -= child.gas
+            if entered:
+                stack.append(child or Frame(frame.address, "?", "?", 0))
+        elif op in JUMPS and info and following and following["depth"] - base == depth:
+            jump = info.jumps.get(pc, "-")
+            if jump == "i":
+                call_sites[frame].append(pc)
+            elif jump == "o" and call_sites[frame]:
+                call_sites[frame].pop()
+            elif following["pc"] < pc:
+                edges[frame.address].add((following["pc"], pc))
+                back_jumps[frame][(following["pc"], pc)] += 1
+        visits[frame].append((pc, max(cost, 0), sites, child))
+
+    for frame, steps in visits.items():
+        regions = sorted(edges[frame.address], key=lambda r: r[1] - r[0])
+        if not regions:
+            continue
+        info = labels(frame.address)
+        names = {region: _loop_name(info, region) for region in regions}
+        for region, count in back_jumps[frame].items():
+            frame.iterations[names[region]] += count
+        for pc, cost, sites, child in steps:
+            region = _innermost(regions, (pc, *reversed(sites)))
+            if region is None:
+                continue
+            frame.loops[names[region]] += cost
+            if child is not None:
+                child.loop = names[region]
+    return GasProfile(root)
+
+
+def _frame(node: dict, labels) -> Frame:
+    address = to_checksum_address(node.get("to") or "0x" + "00" * 20)
+    info = labels(address)
+    data = as_hex(node.get("input") or "0x")
+    if node.get("type", "CALL").startswith("CREATE"):
+        function = "constructor"
+    elif len(data) < 10:
+        function = "fallback"
+    else:
+        selector = data[:10].lower()
+        function = info.functions.get(selector, selector) if info else selector
+    return Frame(
+        address,
+        info.name if info else address[:10],
+        function,
+        as_int(node.get("gasUsed", 0)),
+        [_frame(child, labels) for child in node.get("calls") or []],
+    )
+
+
+def _next_same_depth(steps) -> list:
+    """For each step, the index of the next step in the same frame, if any."""
+    result = [None] * len(steps)
+    latest = {}
+    for i in range(len(steps) - 1, -1, -1):
+        depth = steps[i]["depth"]
+        for deeper in [d for d in latest if d > depth]:
+            del latest[deeper]
+        result[i] = latest.get(depth)
+        latest[depth] = i
+    return result
+
+
+def _call_target(step, op) -> str | None:
+    stack = step.get("stack") or []
+    if op.startswith("CREATE") or len(stack) < 2:
+        return None
+    return to_checksum_address(as_int(stack[-2]).to_bytes(32, "big")[-20:])
+
+
+def _next_child(frame, cursors, entered, target):
+    """Match a call opcode with the next frame ``callTracer`` reported."""
+    if cursors[frame] >= len(frame.children):
+        return None
+    child = frame.children[cursors[frame]]
+    if entered or target is None or child.address == target:
+        cursors[frame] += 1
+        return child
+    return None  # e.g. a precompile the tracer left out
+
+
+def _innermost(regions, pcs):
+    for pc in pcs:
+        for head, tail in regions:
+            if head <= pc <= tail:
+                return head, tail
+    return None
+
+
+def _loop_name(info, region) -> str:
+    head, tail = region
+    line = (info.lines.get(head) or info.lines.get(tail)) if info else None
+    return f"loop@{line or head}"
+
+
+def profile_transaction(tx_hash, rpc=ape_rpc, labels=None) -> GasProfile:
+    """Trace a mined transaction, labelled from ape's contract types by default."""
+    tx_hash = as_hex(tx_hash)
+    call_trace = rpc("debug_traceTransaction", [tx_hash, {"tracer": "callTracer"}])
+    struct_logs = rpc(
+        "debug_traceTransaction",
+        [tx_hash, {"disableStorage": True, "disableMemory": True}],
+    )["structLogs"]
+    profile = build_profile(call_trace, struct_logs, labels or ApeLabels())
+    profile.tx_hash = tx_hash
+    return profile
+
+
+class ApeLabels:
+    """Looks up names and source maps from ape's contract type cache."""
+
+    def __init__(self):
+        self._cache = {}
+
+    def __call__(self, address):
+        if address not in self._cache:
+            from ape import chain
+
+            contract_type = chain.contracts.get(address, fetch_from_explorer=False)
+            info = contract_info(contract_type) if contract_type else None
+            self._cache[address] = info
+        return self._cache[address]
+
+
+def contract_info(contract_type) -> ContractInfo:
+    functions = {
+        selector: signature.split("(")[0]
+        for signature, selector in contract_type.method_identifiers.items()
+    }
+    jumps, lines = {}, {}
+    bytecode = contract_type.get_runtime_bytecode()
+    if bytecode and contract_type.sourcemap:
+        items = contract_type.sourcemap.parse()
+        jumps = {pc: item.jump_code for pc, item in zip(_instructions(bytecode), items)}
+    if contract_type.pcmap and contract_type.source_id:
+        source = Path(contract_type.source_id).name
+        lines = {
+            pc: f"{source}:{item.line_start}"
+            for pc, item in contract_type.pcmap.parse().items()
+            if item.line_start is not None
+        }
+    return ContractInfo(contract_type.name or "?", functions, jumps, lines)
+
+
+def _instructions(bytecode: bytes):
+    """The pc of each instruction, skipping PUSH immediates."""
+    pc = 0
+    while pc < len(bytecode):
+        yield pc
+        op = bytecode[pc]
+        pc += 1 + (op - 0x5F if 0x60 <= op <= 0x7F else 0)
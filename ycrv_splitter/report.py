@@ -0,0 +1,145 @@
+"""
+Append-only, columnar collection of scenario results.
+
+Without a stream path, rows are stored column by column in memory. With
+``stream_to``, each row is written to that CSV file as it arrives and nothing
+is kept in memory; exports and frames read the file back. Either way
+collecting ``n`` scenarios stays linear in time. The text table needs nothing
+beyond the standard library; pandas and pyarrow are optional and only
+imported when a frame or Parquet file is actually requested.
+"""
+import csv
+import logging
+import shutil
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioCollector:
+    def __init__(self, columns, stream_to=None):
+        self.columns = list(columns)
+        if not self.columns:
+            raise ValueError("No columns")
+        if len(set(self.columns)) != len(self.columns):
+            raise ValueError(f"Duplicate columns: {self.columns}")
+        self.path = None if stream_to is None else Path(stream_to)
+        self.data = None if self.path else {column: [] for column in self.columns}
+        self._length = 0
+        self._file = None
+        self._writer = None
+        if self.path is not None:
+            self._file = _open_csv(self.path)
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+            self._file.flush()
+
+    def __len__(self):
+        return self._length
+
+    def append(self, **row):
+        unknown = set(row) - set(self.columns)
+        if unknown:
+            raise KeyError(f"Unknown columns: {sorted(unknown)}")
+        values = [row.get(column) for column in self.columns]
+        if self._writer is not None:
+            self._writer.writerow(values)
+            self._file.flush()
+        elif self.path is not None:
+            raise ValueError(f"{self.path} is closed")
+        else:
+            for column, value in zip(self.columns, values):
+                self.data[column].append(value)
+        self._length += 1
+
+    def rows(self):
+        """Rows in column order; streamed rows come back as CSV strings."""
+        if self.path is None:
+            return zip(*(self.data[column] for column in self.columns))
+        with open(self.path, newline="") as f:
+            reader = csv.reader(f)
+            next(reader)
+            return [tuple(row) for row in reader]
+
+    def export_csv(self, path):
+        path = Path(path)
+        if self.path is not None:
+            if path.resolve() != self.path.resolve():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.path, path)
+            return path
+        with _open_csv(path) as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            writer.writerows(self.rows())
+        return path
+
+    def export_parquet(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.csv
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow") from e
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path is None:
+            table = pa.table(self.data)
+        else:
+            table = pyarrow.csv.read_csv(self.path)
+        pq.write_table(table, path)
+        return path
+
+    def export_text(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.render() + "\n")
+        return path
+
+    def export(self, stem):
+        """Write ``<stem>.csv``, the ``<stem>.txt`` table and, if pyarrow is
+        installed, ``<stem>.parquet``."""
+        stem = Path(stem)
+        written = [
+            self.export_csv(stem.with_suffix(".csv")),
+            self.export_text(stem.with_suffix(".txt")),
+        ]
+        try:
+            written.append(self.export_parquet(stem.with_suffix(".parquet")))
+        except ImportError:
+            logger.warning("pyarrow is not installed; skipped %s.parquet", stem)
+        return written
+
+    def to_frame(self):
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("DataFrame export needs pandas") from e
+
+        if self.path is not None:
+            return pd.read_csv(self.path)
+        return pd.DataFrame(self.data, columns=self.columns)
+
+    def render(self):
+        """Right-aligned text table with a header row; missing values are blank."""
+        table = [self.columns] + [
+            ["" if value is None else str(value) for value in row]
+            for row in self.rows()
+        ]
+        widths = [max(len(row[i]) for row in table) for i in range(len(self.columns))]
+        return "\n".join(
+            "  ".join(value.rjust(width) for value, width in zip(row, widths))
+            for row in table
+        )
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+
+def _open_csv(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "w", newline="")
@@ -0,0 +1,28 @@
+"""
+JSON-RPC access shared by the backfill, indexer, profiler and state cache.
+
+Each of them takes an ``rpc(method, params)`` callable so tests can serve
+canned responses; :func:`ape_rpc` sends the request through the active ape
+provider. Nodes return quantities and data as hex strings while ape hands
+back ints and bytes, so the coercions below accept either.
+"""
+
+
+def ape_rpc(method, params):
+    from ape import chain
+
+    return chain.provider.make_request(method, params)
+
+
+def as_hex(value) -> str:
+    if isinstance(value, str):
+        return value
+    return "0x" + bytes(value).hex()
+
+
+def as_bytes(value) -> bytes:
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+
+
+def as_int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
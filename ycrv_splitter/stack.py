@@ -0,0 +1,167 @@
+"""
+Hermetic stand-ins for the mainnet contracts the splitter depends on.
+
+``YCRVSplitter`` and ``StrategyProxy`` read the voter, veCRV, gauge controller,
+fee distributor, CRV minter, vault and tokens from hardcoded ``constant``
+addresses. Rather than changing the production contracts,
+:func:`deploy_mock_stack` deploys a mock for each one and copies its runtime
+code to the mainnet address with ``set_code``. The real contracts then deploy
+unchanged on a plain local anvil node (``--network ethereum:local:foundry``),
+no RPC or fork required.
+
+Mocks keep their ``immutable`` values when etched, but not their storage, so
+all mock state is written after etching.
+"""
+from dataclasses import dataclass
+from typing import Any
+
+from ape import accounts, chain, project
+
+WEEK = 7 * 24 * 60 * 60
+YEAR = 365 * 24 * 60 * 60
+
+GOV = "0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52"
+VOTER = "0xF147b8125d2ef93FB6965Db97D6746952a133934"
+VE = "0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2"
+GAUGE_CONTROLLER = "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
+FEE_DISTRIBUTOR = "0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914"
+CRVUSD = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
+CRV = "0xD533a949740bb3306d119CC777fa900bA034cd52"
+MINTR = "0xd061D61a4d941c39E5453435B6345Dc261C2fcE0"
+SPELL = "0x090185f2135308BaD17527004364eBcC2D37e5F6"
+YCRV = "0xFCc5c47bE19d06BF83eB04298b026F81069ff65b"
+YVECRV = "0xc5bDdf9843308380375a611c18B50Fb9341f502A"
+REWARD_TOKEN = "0xBF319dDC2Edc1Eb6FDf9910E39b37Be221C8805F"
+YBS = "0xE9A115b77A1057C918F997c32663FdcE24FB873f"
+YCRV_VAULT = "0x27B5739e22ad9033bcBf192059122d163b60349D"
+POOL = "0x99f5aCc8EC2Da2BC0771c32814EFF52b712de1E5"
+
+# Balances loosely shaped like mainnet so every split category is non-trivial.
+VE_BALANCE = 60_000_000 * 10**18
+VE_TOTAL_SUPPLY = 10 * VE_BALANCE
+YCRV_BALANCES = {
+    YBS: 10_000_000 * 10**18,
+    YCRV_VAULT: 3_000_000 * 10**18,
+    POOL: 5_000_000 * 10**18,
+    GOV: 22_000_000 * 10**18,
+}
+YVECRV_BALANCES = {
+    YCRV: 7_000_000 * 10**18,  # migrated
+    GOV: 1_000_000 * 10**18,  # unmigrated
+}
+
+# Gauge => vote weight (bps) cast by the voter. Mirrors the gauges used by
+# test_allocation_scenarios so scenario tests behave the same on both networks.
+VOTES = {
+    "0xEEBC06d495c96E57542A6d829184A907A02ef602": 3_000,  # CRV/yCRV
+    "0x6070fBD4E608ee5391189E7205d70cc4A274c017": 1_000,  # Threshold
+    "0x05255C5BD33672b9FEA4129C13274D1E6193312d": 500,  # YFI/ETH
+    "0x138cC21D15b7A06F929Fc6CFC88d2b830796F4f1": 500,  # ETH/yETH
+    **{
+        gauge: 277
+        for gauge in (
+            "0x60d3d7eBBC44Dc810A743703184f062d00e6dB7e",
+            "0x85D44861D024CB7603Ba906F2Dc9569fC02083F6",
+            "0xF29FfF074f5cF755b55FbB3eb10A29203ac91EA2",
+            "0x79F21BC30632cd40d2aF8134B469a0EB4C9574AA",
+            "0x40371aad2a24ed841316EF30938881440FD4426c",
+            "0x79edc58C471Acf2244B8f93d6f425fD06A439407",
+            "0x053df3e4D0CeD9a3Bf0494F97E83CE1f13BdC0E2",
+            "0x8D867BEf70C6733ff25Cc0D1caa8aA6c38B24817",
+            "0xd03BE91b1932715709e18021734fcB91BB431715",
+            "0x95f00391cB5EebCd190EB58728B4CE23DbFa6ac1",
+            "0x4e6bB6B7447B7B2Aa268C16AB87F4Bb48BF57939",
+            "0x4Fc86cd0F9b650280Fa783e3116258e0E0496A2c",
+            "0xd8b712d29381748dB89c36BCa0138d7c75866ddF",
+            "0x41eBf0bEC45642A675e8b7536A2cE9c078A814B4",
+            "0x222D910ef37C06774E1eDB9DC9459664f73776f0",
+            "0x1Cfabd1937e75E40Fa06B650CB0C8CD233D65C20",
+            "0x6A7b02338A0A7152e08f768c46D9Dd837c35C2df",
+            "0xf9CB3854A922655004022A84Ba1618B1100CBEEf",
+        )
+    },
+}
+# Approved by the controller but not voted for.
+UNVOTED_GAUGES = ["0x36152AA234fcF97b5C14Fc6d4893fC0dA5328BD2"]
+
+
+@dataclass
+class MockStack:
+    crvusd: Any
+    crv: Any
+    spell: Any
+    ycrv: Any
+    yvecrv: Any
+    ve: Any
+    gauge_controller: Any
+    fee_distributor: Any
+    minter: Any
+    reward_token: Any
+    reward_distributor: Any
+    voter: Any
+
+
+def etch(deployer, container, address, *args):
+    """Deploy ``container`` and copy its runtime code to ``address``."""
+    deployed = deployer.deploy(container, *args)
+    chain.provider.set_code(address, chain.provider.get_code(deployed.address))
+    return container.at(address)
+
+
+def deploy_mock_stack(deployer) -> MockStack:
+    """Etch and seed every external contract the splitter system reads."""
+    crvusd = etch(deployer, project.MockERC20, CRVUSD, "crvUSD", "crvUSD")
+    etch(deployer, project.MockERC20, CRV, "Curve DAO Token", "CRV")
+    etch(deployer, project.MockERC20, SPELL, "Spell Token", "SPELL")
+    ycrv = etch(deployer, project.MockERC20, YCRV, "Yearn CRV", "yCRV")
+    yvecrv = etch(deployer, project.MockERC20, YVECRV, "veCRV-DAO yVault", "yveCRV")
+    ve = etch(deployer, project.MockVotingEscrow, VE)
+    gauge_controller = etch(
+        deployer, project.MockGaugeController, GAUGE_CONTROLLER, VE
+    )
+    fee_distributor = etch(
+        deployer, project.MockFeeDistributor, FEE_DISTRIBUTOR, CRVUSD, VE
+    )
+    etch(deployer, project.MockMinter, MINTR, CRV)
+    etch(deployer, project.MockVault, REWARD_TOKEN, CRVUSD)
+    etch(deployer, project.MockVoter, VOTER, GOV)
+    reward_distributor = deployer.deploy(project.MockRewardDistributor, REWARD_TOKEN)
+
+    for holder, amount in YCRV_BALANCES.items():
+        ycrv.mint(holder, amount, sender=deployer)
+    for holder, amount in YVECRV_BALANCES.items():
+        yvecrv.mint(holder, amount, sender=deployer)
+
+    now = chain.pending_timestamp
+    lock_end = (now + 4 * YEAR) // WEEK * WEEK
+    ve.setLock(VOTER, VE_BALANCE // (lock_end - now), lock_end, sender=deployer)
+    ve.setTotalSupply(VE_TOTAL_SUPPLY, sender=deployer)
+    # The voter has claimed up to the current week, as on mainnet.
+    fee_distributor.setTimeCursorOf(VOTER, now, sender=deployer)
+
+    for gauge in [*VOTES, *UNVOTED_GAUGES]:
+        gauge_controller.add_gauge(gauge, 0, sender=deployer)
+    voter_account = accounts[VOTER]
+    voter_account.balance += 10**18
+    for gauge, weight in VOTES.items():
+        gauge_controller.vote_for_gauge_weights(gauge, weight, sender=voter_account)
+
+    return mock_stack_at(reward_distributor.address)
+
+
+def mock_stack_at(reward_distributor) -> MockStack:
+    """The stack as deployed by :func:`deploy_mock_stack`, e.g. after a state load."""
+    return MockStack(
+        crvusd=project.MockERC20.at(CRVUSD),
+        crv=project.MockERC20.at(CRV),
+        spell=project.MockERC20.at(SPELL),
+        ycrv=project.MockERC20.at(YCRV),
+        yvecrv=project.MockERC20.at(YVECRV),
+        ve=project.MockVotingEscrow.at(VE),
+        gauge_controller=project.MockGaugeController.at(GAUGE_CONTROLLER),
+        fee_distributor=project.MockFeeDistributor.at(FEE_DISTRIBUTOR),
+        minter=project.MockMinter.at(MINTR),
+        reward_token=project.MockVault.at(REWARD_TOKEN),
+        reward_distributor=project.MockRewardDistributor.at(reward_distributor),
+        voter=project.MockVoter.at(VOTER),
+    )
@@ -0,0 +1,71 @@
+"""
+Cached chain state for the local test deployment.
+
+Deploying the mock stack and configuring the splitter system takes well over
+a hundred transactions. :class:`StateCache` stores the ``anvil_dumpState``
+blob taken right after that setup, together with the addresses it produced, so
+later sessions restore everything with a single ``anvil_loadState``.
+
+Entries are keyed by :func:`state_key`: a hash of every contract's bytecode and
+of the setup code. Changing a contract or the setup therefore rebuilds the
+cache. Writing an entry removes the ones not written for ``ttl`` seconds;
+younger entries with other keys may belong to a parallel worker or a session
+that started in another week, so they are left alone.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from .rpc import ape_rpc
+
+TTL = 14 * 24 * 60 * 60  # keys are salted with the week
+
+
+def state_key(contract_types: dict, *sources, salt="") -> str:
+    """Hash of the contracts' bytecode, the setup ``sources`` and ``salt``."""
+    digest = hashlib.sha256(str(salt).encode())
+    for name, contract_type in sorted(contract_types.items()):
+        digest.update(name.encode())
+        digest.update(bytes(contract_type.get_deployment_bytecode() or b""))
+    for source in sources:
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class StateCache:
+    def __init__(self, directory, key: str, rpc=ape_rpc, ttl: float = TTL):
+        self.directory = Path(directory)
+        self.path = self.directory / f"{key}.json"
+        self.rpc = rpc
+        self.ttl = ttl
+
+    def load(self) -> dict | None:
+        """Restore the cached state into the node and return its addresses."""
+        if not self.path.exists():
+            return None
+        cached = json.loads(self.path.read_text())
+        self.rpc("anvil_loadState", [cached["state"]])
+        return cached["addresses"]
+
+    def save(self, addresses: dict):
+        """Dump the node's current state under this key."""
+        state = self.rpc("anvil_dumpState", [])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Parallel workers may build the same entry; each writes a private file
+        # and renames it into place, so readers never see a partial file.
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"addresses": addresses, "state": state}))
+        os.replace(tmp, self.path)
+        self.prune()
+
+    def prune(self):
+        """Remove entries and leftover temp files older than ``ttl``."""
+        cutoff = time.time() - self.ttl
+        for stale in [*self.directory.glob("*.json"), *self.directory.glob("*.tmp")]:
+            try:
+                if stale != self.path and stale.stat().st_mtime < cutoff:
+                    stale.unlink()
+            except FileNotFoundError:
+                pass  # pruned by another worker